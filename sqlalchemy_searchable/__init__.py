@@ -1,6 +1,18 @@
 import dataclasses
 import os
-from collections.abc import Sequence
+import re
+import time
+from collections.abc import (
+    AsyncGenerator,
+    Callable,
+    Generator,
+    Iterator,
+    Mapping,
+    Sequence,
+)
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
 from functools import reduce
 from typing import Any, cast, Literal, TypeVar
 
@@ -12,13 +24,17 @@ from sqlalchemy import (
     Connection,
     event,
     FromClause,
+    Row,
     Select,
 )
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 from sqlalchemy.ext.compiler import compiles
-from sqlalchemy.orm import Mapper
+from sqlalchemy.orm import Mapper, Session
 from sqlalchemy.schema import DDL, DDLElement
 from sqlalchemy.sql.compiler import SQLCompiler
 from sqlalchemy.sql.expression import Executable
+from sqlalchemy.sql.util import ClauseAdapter
 from sqlalchemy_utils import TSVectorType
 
 from .vectorizers import Vectorizer
@@ -26,6 +42,24 @@ from .vectorizers import Vectorizer
 __version__ = "3.0.0"
 
 
+@dataclasses.dataclass(frozen=True)
+class QueryLimit:
+    """
+    Limit of the complexity of search queries, given as one of the search query
+    limit options of :class:`SearchOptions`, and the action taken when a search
+    query exceeds it.
+    """
+
+    #: The limit.
+    value: int
+
+    #: Action taken when a search query exceeds the limit. ``"reject"`` raises
+    #: :exc:`SearchQueryRejected`, ``"truncate"`` removes the part of the search
+    #: query exceeding the limit and ``"degrade"`` searches the whole search query
+    #: in a cheaper way, as described by each limit option.
+    action: Literal["reject", "truncate", "degrade"] = "reject"
+
+
 @dataclasses.dataclass(frozen=True)
 class SearchOptions:
     """
@@ -47,6 +81,14 @@ class SearchOptions:
     #: rules for stemming and stop words.
     regconfig: str = "pg_catalog.english"
 
+    #: Name of a column of the searched table that holds the regconfig of each row,
+    #: such as ``"pg_catalog.finnish"``, or None for vectorizing every row using
+    #: :attr:`regconfig`. This allows tables with rows in many languages to use a
+    #: single search vector and index. The rows whose regconfig column is null are
+    #: vectorized using :attr:`regconfig`. Pass the regconfigs of the searched
+    #: languages to :func:`search` for parsing the search query accordingly.
+    regconfig_column: str | None = None
+
     #: Dictionary mapping column names to their search weights (A, B, C, or D), where
     #: A is the highest weight and D is the lowest. This affects relevance ranking in
     #: search results.
@@ -54,9 +96,168 @@ class SearchOptions:
         default_factory=dict
     )
 
+    #: Dictionary mapping column names to the maximum number of characters of their
+    #: values that are indexed. Longer values are truncated using ``left()`` before
+    #: they are vectorized, which bounds the time it takes to compute the search
+    #: vector and its size. Use :func:`search_vector_truncation` to find out how many
+    #: rows are truncated.
+    max_characters: dict[str, int] = dataclasses.field(default_factory=dict)
+
+    #: Dictionary mapping column names to the maximum number of whitespace separated
+    #: words of their values that are indexed. As every lexeme comes from a word,
+    #: this also bounds the number of lexemes in the search vector.
+    max_words: dict[str, int] = dataclasses.field(default_factory=dict)
+
+    #: Dictionary mapping the names of related tables to the names of their columns
+    #: that are indexed in the search vector. The relationship between the searched
+    #: table and each related table is inferred from their foreign keys, and may be
+    #: many-to-one, one-to-many or many-to-many through an association table. The
+    #: search vector is kept up to date by triggers of the related and association
+    #: tables. The weights of related columns are given using ``table.column``
+    #: keys in :attr:`weights`. Only supported with synchronous row level search
+    #: triggers that store the search vector in the searched table.
+    related: dict[str, list[str]] = dataclasses.field(default_factory=dict)
+
+    #: Name of the column the searched table is partitioned by. This is used by the
+    #: ``partition_range`` parameter of :func:`search`.
+    partition_key: str | None = None
+
+    #: Name of the timestamp column of the searched table used by
+    #: :func:`tiered_search` for searching recent rows first.
+    recency_column: str | None = None
+
     #: Whether to automatically create a GIN index on the search vector column.
     auto_index: bool = True
 
+    #: Whether the search vector of each indexed column is cached in a hidden column
+    #: of the table. When enabled, the search trigger only recomputes the search
+    #: vectors of the indexed columns that have changed, and concatenates them with
+    #: the cached search vectors of the other columns. This makes updating short
+    #: columns of rows that also have long indexed columns much cheaper. The hidden
+    #: columns are not part of the mapped model. Only supported with row level
+    #: search triggers.
+    cache_column_vectors: bool = False
+
+    #: Template string for the names of the hidden columns used when
+    #: :attr:`cache_column_vectors` is enabled. Available placeholders are
+    #: ``{table}``, ``{column}`` and ``{indexed_column}``.
+    column_vector_cache_name: str = "{column}_{indexed_column}_cache"
+
+    #: Whether the search vector is stored in a separate search table instead of the
+    #: searched table. The search table has a one-to-one relationship with the
+    #: searched table, and its rows are inserted and updated by an ``AFTER`` trigger
+    #: of the searched table. This option is set by :func:`search_table`, which
+    #: should be used for defining search tables. Only supported with synchronous
+    #: row level search triggers.
+    search_table: bool = False
+
+    #: Template string for the name of the search table used when
+    #: :attr:`search_table` is enabled. Available placeholders are ``{table}`` and
+    #: ``{column}``. The search table is created in the schema of the searched table.
+    search_table_name: str = "{table}_search"
+
+    #: Whether the search vectors are updated asynchronously. Instead of computing
+    #: the search vector, the search trigger only adds the primary key of the
+    #: inserted or updated row to a queue table, which is processed by a worker. See
+    #: :mod:`sqlalchemy_searchable.worker`. Requires the table to have a primary key.
+    queue_updates: bool = False
+
+    #: Template string for the name of the queue table used when
+    #: :attr:`queue_updates` is enabled. Available placeholders are ``{table}`` and
+    #: ``{column}``. The queue table is created in the schema of the table.
+    search_queue_table_name: str = "{table}_{column}_queue"
+
+    #: Whether a version counter of the searched table is kept in a version table.
+    #: The version is incremented by a statement level trigger on every
+    #: ``INSERT``, ``UPDATE``, ``DELETE`` and ``TRUNCATE`` of the searched table,
+    #: which allows :class:`~sqlalchemy_searchable.cache.SearchCache` to tell when
+    #: its cached search results are stale. As every writing transaction updates
+    #: the same row of the version table, concurrent writes to the searched table
+    #: wait for each other to commit.
+    track_versions: bool = False
+
+    #: Template string for the name of the version table used when
+    #: :attr:`track_versions` is enabled. Available placeholders are ``{table}`` and
+    #: ``{column}``. The version table is created in the schema of the table.
+    search_version_table_name: str = "{table}_{column}_version"
+
+    #: Name of the channel a notification is sent to using ``pg_notify`` whenever
+    #: the search vector of a row is computed, or None for not sending
+    #: notifications. The payload of each notification is a JSON object with the
+    #: ``schema`` and ``table`` of the searched table and the primary ``key`` of the
+    #: row. Requires the table to have a primary key. See
+    #: :mod:`sqlalchemy_searchable.notifications`.
+    notify_channel: str | None = None
+
+    #: Whether the lexemes of the lexeme dictionary are indexed with a trigram
+    #: index, for typo tolerant searching using the ``fuzzy`` parameter of
+    #: :func:`search`. This implies :attr:`lexeme_dictionary`. Requires the
+    #: ``pg_trgm`` extension, which is created if it does not exist.
+    search_words: bool = False
+
+    #: Whether a dictionary of the lexemes of the search vectors and the number of
+    #: rows each lexeme occurs in is kept in a lexeme dictionary table, for
+    #: autocompleting prefixes using :func:`suggest`. The dictionary is kept up to
+    #: date by statement level triggers of the table the search vector is stored
+    #: in, which add and remove the lexemes of the inserted, updated and deleted
+    #: rows. As every writing statement updates the rows of the dictionary of its
+    #: lexemes, concurrent writes of rows sharing lexemes wait for each other to
+    #: commit.
+    lexeme_dictionary: bool = False
+
+    #: Template string for the name of the lexeme dictionary table used when
+    #: :attr:`lexeme_dictionary` is enabled. Available placeholders are ``{table}``
+    #: and ``{column}``. The table is created in the schema of the table.
+    lexeme_dictionary_table_name: str = "{table}_{column}_lexemes"
+
+    #: Fraction of the rows, between 0 and 1, that a lexeme has to occur in to be
+    #: a common term. When given, the common terms of the search vector are stored
+    #: in a term stats table by :func:`refresh_term_stats`, and :func:`search` can
+    #: drop them from search queries using its ``common_terms`` parameter.
+    common_term_threshold: float | None = None
+
+    #: Template string for the name of the term stats table used when
+    #: :attr:`common_term_threshold` is given. Available placeholders are
+    #: ``{table}`` and ``{column}``. The table is created in the schema of the
+    #: table.
+    term_stats_table_name: str = "{table}_{column}_term_stats"
+
+    #: Number of seconds the common terms loaded by :func:`refresh_term_stats` or
+    #: :func:`load_term_stats` are cached in the process. Afterwards, and in
+    #: processes that have not loaded them, :func:`search` reads the common terms
+    #: from the term stats table in a subquery.
+    term_stats_max_age: float = 300
+
+    #: Maximum number of characters of search queries. Degrading matches all the
+    #: terms exactly instead of as prefixes. Truncating keeps the whole words that
+    #: fit in the limit.
+    max_query_length: QueryLimit | None = None
+
+    #: Maximum number of terms of search queries. Degrading matches all the terms
+    #: exactly instead of as prefixes. Truncating keeps the first terms.
+    max_query_terms: QueryLimit | None = None
+
+    #: Maximum number of alternatives of search queries separated by ``or``.
+    #: Degrading ignores the ``or`` operators, so that the rows have to match all
+    #: the terms. Truncating keeps the first alternatives.
+    max_query_or_branches: QueryLimit | None = None
+
+    #: Minimum length of the terms of search queries, which are matched as
+    #: prefixes of lexemes. Degrading matches the shorter terms exactly instead of
+    #: as prefixes. Truncating removes the shorter terms, so that a search query
+    #: of only shorter terms matches no rows.
+    min_prefix_length: QueryLimit | None = None
+
+    #: Whether accents are removed from the indexed values and the search queries
+    #: using the ``unaccent`` extension, which is created if it does not exist, so
+    #: that searching for "cafe" finds "café" and vice versa. The values are
+    #: unaccented using ``immutable_unaccent``, an ``IMMUTABLE`` wrapper of
+    #: ``unaccent()`` that can also be used in index expressions and generated
+    #: columns. Both :func:`search` and :func:`batch_search` unaccent the search
+    #: queries of search vectors that have this option, so that the queries keep
+    #: using the GIN index of the search vector.
+    unaccent: bool = False
+
 
 vectorizer = Vectorizer()
 """
@@ -76,44 +277,1074 @@ def inspect_search_vectors(entity: Any) -> list[Any]:
 _T = TypeVar("_T", bound=tuple[Any, ...])
 
 
+@dataclasses.dataclass(frozen=True)
+class AppliedLimit:
+    """
+    Search query limit exceeded by a search query, as reported by
+    :class:`LimitedSearchQuery` and :exc:`SearchQueryRejected`.
+    """
+
+    #: Name of the search option of the limit, such as ``"max_query_terms"``.
+    name: str
+
+    #: The exceeded limit.
+    limit: QueryLimit
+
+    #: Value of the search query that exceeded the limit, such as its number of
+    #: terms, or the length of its shortest term for ``min_prefix_length``.
+    value: int
+
+
+class SearchQueryRejected(ValueError):
+    """
+    Raised when a search query exceeds a search query limit whose action is
+    ``"reject"``.
+    """
+
+    def __init__(self, applied_limit: AppliedLimit):
+        self.applied_limit = applied_limit
+        super().__init__(
+            f"Search query exceeds the {applied_limit.name} limit of "
+            f"{applied_limit.limit.value} with {applied_limit.value}."
+        )
+
+
+@dataclasses.dataclass(frozen=True)
+class LimitedSearchQuery:
+    """
+    Search query with the search query limits applied, returned by
+    :func:`limit_search_query` and accepted by :func:`search`.
+    """
+
+    #: The search query with the truncating limits applied.
+    search_query: str
+
+    #: Whether the terms are matched as prefixes of lexemes.
+    prefix_matching: bool = True
+
+    #: Minimum length of the terms that are matched as prefixes of lexemes.
+    min_prefix_length: int = 0
+
+    #: The limits exceeded by the original search query, in the order they were
+    #: applied.
+    applied_limits: tuple[AppliedLimit, ...] = ()
+
+
+_search_query_token = re.compile(r'"[^"]*"?|[^\s"]+')
+
+
+def _is_or_token(token: str) -> bool:
+    return token.lower() == "or"
+
+
+def _token_terms(token: str) -> list[str]:
+    return [] if _is_or_token(token) else re.findall(r"\w+", token)
+
+
+def _join_tokens(tokens: list[str]) -> str:
+    """
+    Join given search query tokens, leaving out the ``or`` operators that do not
+    separate terms.
+    """
+    joined: list[str] = []
+    for token in tokens:
+        if _is_or_token(token) and (not joined or _is_or_token(joined[-1])):
+            continue
+        joined.append(token)
+    if joined and _is_or_token(joined[-1]):
+        joined.pop()
+    return " ".join(joined)
+
+
+def _limit_search_query(
+    search_query: str, options: SearchOptions
+) -> LimitedSearchQuery:
+    """
+    Apply the search query limits of given search options to given search query.
+    The terms and operators are recognized approximately like
+    ``websearch_to_tsquery`` does, as the limits are applied before parsing.
+    """
+    limits = [
+        options.max_query_length,
+        options.max_query_terms,
+        options.max_query_or_branches,
+        options.min_prefix_length,
+    ]
+    if all(limit is None for limit in limits):
+        return LimitedSearchQuery(search_query)
+
+    applied_limits: list[AppliedLimit] = []
+    prefix_matching = True
+    min_prefix_length = 0
+
+    def apply(name: str, limit: QueryLimit, value: int) -> None:
+        applied_limit = AppliedLimit(name, limit, value)
+        if limit.action == "reject":
+            raise SearchQueryRejected(applied_limit)
+        applied_limits.append(applied_limit)
+
+    limit = options.max_query_length
+    if limit is not None and len(search_query) > limit.value:
+        apply("max_query_length", limit, len(search_query))
+        if limit.action == "truncate":
+            truncated = search_query[: limit.value]
+            if not search_query[limit.value].isspace() and len(truncated.split()) > 1:
+                # Leave out the word that was cut in the middle.
+                truncated = truncated.rsplit(None, 1)[0]
+            search_query = truncated
+        else:
+            prefix_matching = False
+
+    tokens = _search_query_token.findall(search_query)
+    tokens_changed = False
+
+    limit = options.max_query_or_branches
+    if limit is not None:
+        branches: list[list[str]] = [[]]
+        for token in tokens:
+            if _is_or_token(token):
+                branches.append([])
+            else:
+                branches[-1].append(token)
+        branches = [branch for branch in branches if branch]
+        if len(branches) > limit.value:
+            apply("max_query_or_branches", limit, len(branches))
+            tokens_changed = True
+            if limit.action == "truncate":
+                tokens = []
+                for branch in branches[: limit.value]:
+                    tokens.extend([*branch, "or"])
+            else:
+                tokens = [token for token in tokens if not _is_or_token(token)]
+
+    limit = options.max_query_terms
+    if limit is not None:
+        term_count = sum(len(_token_terms(token)) for token in tokens)
+        if term_count > limit.value:
+            apply("max_query_terms", limit, term_count)
+            if limit.action == "truncate":
+                kept: list[str] = []
+                term_count = 0
+                for token in tokens:
+                    terms = _token_terms(token)
+                    if term_count + len(terms) > limit.value:
+                        remaining = limit.value - term_count
+                        if token.startswith('"') and remaining:
+                            kept.append('"' + " ".join(terms[:remaining]) + '"')
+                        break
+                    term_count += len(terms)
+                    kept.append(token)
+                tokens = kept
+                tokens_changed = True
+            else:
+                prefix_matching = False
+
+    limit = options.min_prefix_length
+    if limit is not None:
+        term_lengths = [len(term) for token in tokens for term in _token_terms(token)]
+        if term_lengths and min(term_lengths) < limit.value:
+            apply("min_prefix_length", limit, min(term_lengths))
+            if limit.action == "truncate":
+                tokens = [
+                    token
+                    for token in tokens
+                    if all(len(term) >= limit.value for term in _token_terms(token))
+                ]
+                tokens_changed = True
+            else:
+                min_prefix_length = limit.value
+
+    if tokens_changed:
+        search_query = _join_tokens(tokens)
+    return LimitedSearchQuery(
+        search_query,
+        prefix_matching=prefix_matching,
+        min_prefix_length=min_prefix_length,
+        applied_limits=tuple(applied_limits),
+    )
+
+
 def search(
     query: Select[_T],
-    search_query: str,
+    search_query: str | LimitedSearchQuery,
     vector: Column[TSVectorType] | None = None,
-    regconfig: str | None = None,
+    regconfig: str | Sequence[str] | None = None,
     sort: bool = False,
+    partition_range: tuple[Any, Any] | None = None,
+    fuzzy: bool = False,
+    common_terms: Literal["drop", "demote"] | None = None,
+    static_score: ColumnElement[Any] | None = None,
+    blend: Callable[[ColumnElement[Any], ColumnElement[Any]], ColumnElement[Any]]
+    | None = None,
+    static_order: bool = False,
+    manager: "SearchManager | None" = None,
 ) -> Select[_T]:
     """
     Search given query with full text search.
 
-    :param search_query: the search query
+    :param search_query:
+        the search query, to which the search query limits of the search vector
+        are applied, or a :class:`LimitedSearchQuery` returned by
+        :func:`limit_search_query`, for finding out which limits were applied
     :param vector: search vector to use
-    :param regconfig: postgresql regconfig to be used
+    :param regconfig:
+        postgresql regconfig to be used, or a list of regconfigs for searching rows
+        in any of their languages. With many regconfigs, the search query is parsed
+        with each of them, and the rows that match any of the parsed queries are
+        found using a single condition on the search vector.
     :param sort: Order the results by relevance. This uses `cover density`_ ranking
         algorithm (``ts_rank_cd``) for sorting.
+    :param partition_range:
+        Tuple of the inclusive lower bound and the exclusive upper bound of the
+        partition key of the searched table, which is given using the
+        ``partition_key`` search option. Either bound may be None. The bounds are
+        added as predicates of the query, so that PostgreSQL can skip scanning the
+        partitions outside of them.
+    :param fuzzy:
+        Replace the terms of the search query that do not occur in any search
+        vector with the most similar lexemes that do, according to the trigram
+        ``similarity()`` of the ``pg_trgm`` extension. Requires the
+        ``search_words`` search option.
+    :param common_terms:
+        Drop the common terms of the search vector, which occur in more rows than
+        the ``common_term_threshold`` search option allows, from the search query
+        when it has other terms. Matching a common term hardly narrows the results
+        down but makes the GIN index scan read most of the rows. With ``"drop"``,
+        the common terms are also dropped from the ranking of ``sort``, whereas
+        with ``"demote"`` they only affect the ranking. Negated common terms are
+        kept. The common terms are computed by :func:`refresh_term_stats`.
+    :param static_score:
+        Column or expression of the searched rows that holds a query independent
+        score, such as the popularity of each row, which is blended with the
+        relevance when ``sort`` is True, or used for ordering the results when
+        ``static_order`` is True.
+    :param blend:
+        Function returning the expression the results are ordered by when both
+        ``sort`` and ``static_score`` are given. It is called with the
+        ``ts_rank_cd`` relevance and the static score. Defaults to
+        ``rank * (1 + ln(1 + greatest(static_score, 0)))``, where null static
+        scores count as 0.
+    :param static_order:
+        Order the results by the static score only, in descending order with nulls
+        last, instead of by relevance. Combined with a limit and a btree index on
+        the static score with the same order, PostgreSQL can walk the index in
+        static score order and stop once enough rows have matched the search
+        query, instead of ranking and sorting all the matching rows. Cannot be
+        combined with ``sort``.
+    :param manager:
+        :class:`SearchManager` the search vector is registered in. This is used
+        for determining the search options and the common terms of the search
+        vector. Defaults to the global search manager.
 
     .. _cover density: https://www.postgresql.org/docs/devel/textsearch-controls.html#TEXTSEARCH-RANKING
     """
-    if not search_query.strip():
+    if static_score is None and (blend is not None or static_order):
+        raise ValueError("The blend and static_order parameters require static_score.")
+    if sort and static_order:
+        raise ValueError("The sort and static_order parameters are mutually exclusive.")
+    if common_terms not in (None, "drop", "demote"):
+        raise ValueError('The common_terms parameter must be "drop" or "demote".')
+
+    if isinstance(search_query, str) and not search_query.strip():
         return query
 
+    if manager is None:
+        manager = search_manager
     if vector is None:
-        entity = query.column_descriptions[0]["entity"]
-        search_vectors = inspect_search_vectors(entity)
-        vector = search_vectors[0]
+        vector = _default_search_vector(query, manager)
+
+    if isinstance(search_query, str):
+        search_query = _limit_search_query(
+            search_query, _search_options(vector, manager)
+        )
+    limited_query = search_query
+    if not limited_query.search_query.strip():
+        # A search query that was truncated to nothing matches nothing.
+        return query.filter(sa.false()) if limited_query.applied_limits else query
+
+    if isinstance(vector.type, TSVectorType) and vector.type.options.get(
+        "search_table"
+    ):
+        query = query.join(vector.table)
+
+    if partition_range is not None:
+        query = query.filter(
+            *_partition_key_predicates(vector, partition_range, manager)
+        )
+
+    search_text = _search_query_text(vector, limited_query.search_query, manager)
+
+    if fuzzy:
+        # The corrected search query is computed only once, in an InitPlan.
+        tsquery: ColumnElement[Any] = sa.select(
+            _websearch_tsquery(
+                regconfig, search_text, manager, _search_words_table(vector, manager)
+            )
+        ).scalar_subquery()
+        rank_tsquery = tsquery
+    else:
+        tsquery = _websearch_tsquery(regconfig, search_text, manager)
+        rank_tsquery = sa.func.parse_websearch(search_text)
+
+    if not limited_query.prefix_matching:
+        tsquery = sa.func.remove_prefixes(tsquery, sa.null())
+    elif limited_query.min_prefix_length > 1:
+        tsquery = sa.func.remove_prefixes(tsquery, limited_query.min_prefix_length)
+
+    if common_terms is not None:
+        # Demoted common terms still count in the ranking.
+        rank_tsquery = tsquery
+        tsquery = sa.func.drop_lexemes(tsquery, _common_lexemes(vector, manager))
+        if common_terms == "drop":
+            rank_tsquery = tsquery
+
+    query = query.filter(vector.op("@@")(tsquery))
+    if sort:
+        rank: ColumnElement[Any] = sa.func.ts_rank_cd(vector, rank_tsquery)
+        if static_score is not None:
+            rank = (blend or _default_blend)(rank, static_score)
+        query = query.order_by(sa.desc(rank))
+    elif static_order and static_score is not None:
+        query = query.order_by(static_score.desc().nulls_last())
+
+    return query.params(term=limited_query.search_query)
+
 
+def _default_blend(
+    rank: ColumnElement[Any], static_score: ColumnElement[Any]
+) -> ColumnElement[Any]:
+    return rank * (
+        1 + sa.func.ln(1 + sa.func.greatest(sa.func.coalesce(static_score, 0), 0))
+    )
+
+
+def _default_search_vector(
+    query: Select[Any], manager: "SearchManager"
+) -> Column[TSVectorType]:
+    entity = query.column_descriptions[0]["entity"]
+    search_vectors = inspect_search_vectors(entity)
+    if not search_vectors:
+        search_vectors = manager.search_table_vectors(
+            sa.inspect(entity).persist_selectable
+        )
+    return cast(Column[TSVectorType], search_vectors[0])
+
+
+def _websearch_tsquery(
+    regconfig: str | Sequence[str] | None,
+    search_text: Any,
+    manager: "SearchManager",
+    words: ColumnElement[Any] | None = None,
+) -> ColumnElement[Any]:
+    """
+    Return the tsquery of given search query parsed with given regconfig, or the
+    disjunction of the tsqueries parsed with each of given regconfigs.
+
+    :param words:
+        lexeme dictionary table of the searched vector as a ``regclass``, for
+        correcting the misspelled terms of the search query
+    """
     if regconfig is None:
-        regconfig = search_manager.options.regconfig
+        regconfig = manager.options.regconfig
+    regconfigs = [regconfig] if isinstance(regconfig, str) else list(regconfig)
+    if not regconfigs:
+        raise ValueError("At least one regconfig has to be given.")
+    if words is None:
+        tsqueries = [
+            sa.func.parse_websearch(config, search_text) for config in regconfigs
+        ]
+    else:
+        tsqueries = [
+            sa.func.fuzzy_websearch(config, search_text, words) for config in regconfigs
+        ]
+    return reduce(lambda x, y: x.op("||")(y), tsqueries)
+
+
+def _search_options(
+    vector: Column[TSVectorType], manager: "SearchManager"
+) -> SearchOptions:
+    """
+    Return the search options of given search vector, or the global search options
+    of given manager if it is an expression.
+    """
+    if isinstance(vector, Column) and isinstance(vector.type, TSVectorType):
+        return manager.column_options(vector)
+    return manager.options
+
+
+def _search_query_text(
+    vector: Column[TSVectorType], search_query: Any, manager: "SearchManager"
+) -> Any:
+    """
+    Return given search query unaccented if given search vector has the
+    ``unaccent`` option, so that it matches the unaccented lexemes of the vector.
+    """
+    if (
+        isinstance(vector, Column)
+        and isinstance(vector.type, TSVectorType)
+        and manager.column_options(vector).unaccent
+    ):
+        return sa.func.immutable_unaccent(search_query)
+    return search_query
+
+
+def _searched_table_column(
+    vector: Column[TSVectorType], option: str, manager: "SearchManager"
+) -> Column[Any]:
+    """
+    Return the column of the searched table of given search vector that is named by
+    given search option.
+    """
+    if not isinstance(vector, Column) or not isinstance(vector.type, TSVectorType):
+        raise ValueError(
+            f"The {option} option can only be used with search vector columns."
+        )
+    options = manager.column_options(vector)
+    name = getattr(options, option)
+    if name is None:
+        raise ValueError(
+            f"Search vector {vector.table.name}.{vector.name} does not have the "
+            f"{option} option."
+        )
+    return cast(Column[Any], SQLConstruct(vector, options=options).table.c[name])
+
+
+def _search_words_table(
+    vector: Column[TSVectorType], manager: "SearchManager"
+) -> ColumnElement[Any]:
+    """
+    Return the lexeme dictionary table of given search vector as a ``regclass``.
+    """
+    if not isinstance(vector, Column) or not isinstance(vector.type, TSVectorType):
+        raise ValueError("Fuzzy search can only be used with search vector columns.")
+    options = manager.column_options(vector)
+    if not options.search_words:
+        raise ValueError(
+            f"Search vector {vector.table.name}.{vector.name} does not have the "
+            "search_words option."
+        )
+    construct = SQLConstruct(vector, options=options)
+    name = f'"{construct.lexeme_dictionary_table_name}"'
+    if construct.table.schema:
+        name = f'"{construct.table.schema}".{name}'
+    return sa.cast(name, postgresql.REGCLASS)
+
+
+def _common_lexemes(
+    vector: Column[TSVectorType], manager: "SearchManager"
+) -> ColumnElement[Any]:
+    """
+    Return the common lexemes of given search vector as a text array, from the
+    in-process cache of given manager if it is fresh or else from the term stats
+    table.
+    """
+    options = manager.column_options(vector)
+    if options.common_term_threshold is None:
+        raise ValueError(
+            f"Search vector {vector.table.name}.{vector.name} does not have the "
+            "common_term_threshold option."
+        )
+    cached = manager.common_terms.get(vector)
+    if cached is not None and time.monotonic() - cached[0] < options.term_stats_max_age:
+        return sa.cast(sorted(cached[1]), postgresql.ARRAY(sa.Text))
+    stats = _term_stats_table(SQLConstruct(vector, options=options))
+    return sa.select(sa.func.array_agg(stats.c.lexeme)).scalar_subquery()
+
+
+def _term_stats_table(construct: "SQLConstruct") -> sa.TableClause:
+    return sa.table(
+        construct.term_stats_table_name,
+        sa.column("lexeme", sa.Text),
+        sa.column("ndoc", sa.BigInteger),
+        schema=construct.table.schema,
+    )
+
+
+def _partition_key_predicates(
+    vector: Column[TSVectorType],
+    partition_range: tuple[Any, Any],
+    manager: "SearchManager",
+) -> list[ColumnElement[bool]]:
+    partition_key = _searched_table_column(vector, "partition_key", manager)
+    start, end = partition_range
+    predicates = []
+    if start is not None:
+        predicates.append(partition_key >= start)
+    if end is not None:
+        predicates.append(partition_key < end)
+    return predicates
+
+
+def tiered_search(
+    conn: Connection | Session,
+    query: Select[_T],
+    search_query: str,
+    limit: int,
+    tiers: Sequence[timedelta | None] = (timedelta(days=7), timedelta(days=90), None),
+    vector: Column[TSVectorType] | None = None,
+    regconfig: str | Sequence[str] | None = None,
+    sort: bool = False,
+    now: datetime | None = None,
+) -> list[Row[_T]]:
+    """
+    Search given query with full text search, searching recent rows first. The
+    search is executed over progressively older time windows of the timestamp column
+    given using the ``recency_column`` search option, until ``limit`` rows have been
+    found. Each window only contains the rows that are not in the previous windows,
+    so no row is searched twice.
+
+    Example::
+
+        from datetime import timedelta
+
+        from sqlalchemy_searchable import tiered_search
+
+
+        rows = tiered_search(
+            session,
+            sa.select(Article),
+            "first article",
+            limit=20,
+            tiers=[timedelta(days=7), timedelta(days=90), None],
+        )
+
+    The rows are returned newest window first, and within each window in the order
+    of given query.
+
+    :param conn: SQLAlchemy Connection or Session object
+    :param query: the query to search, which should not have a limit
+    :param search_query: the search query
+    :param limit: maximum number of rows to return
+    :param tiers:
+        The ages of the oldest rows of each time window, in ascending order. None
+        means that the window contains all the remaining rows, including the rows
+        whose timestamp is null, and should be the last tier.
+    :param vector: search vector to use
+    :param regconfig: postgresql regconfig or list of regconfigs to be used
+    :param sort: Order the results of each window by relevance.
+    :param now: the time the ages are relative to. Defaults to the current time.
+    """
+    if vector is None:
+        vector = _default_search_vector(query, search_manager)
+    recency_column = _searched_table_column(vector, "recency_column", search_manager)
+    if now is None:
+        now = datetime.now(timezone.utc)
+    query = search(query, search_query, vector=vector, regconfig=regconfig, sort=sort)
+
+    rows: list[Row[_T]] = []
+    newer_than = None
+    for tier in tiers:
+        window = query
+        if tier is not None:
+            window = window.where(recency_column >= now - tier)
+        if newer_than is not None:
+            older = recency_column < newer_than
+            if tier is None:
+                older = sa.or_(older, recency_column.is_(None))
+            window = window.where(older)
+        rows.extend(conn.execute(window.limit(limit - len(rows))).all())
+        if len(rows) >= limit or tier is None:
+            break
+        newer_than = now - tier
+    return rows
+
+
+def batch_search(
+    conn: Connection | Session,
+    query: Select[_T],
+    search_queries: Sequence[str | LimitedSearchQuery],
+    limit: int,
+    vector: Column[TSVectorType] | None = None,
+    regconfig: str | Sequence[str] | None = None,
+    sort: bool = False,
+) -> list[list[tuple[Any, ...]]]:
+    """
+    Search given query with many search queries at once. All the searches are
+    executed using a single statement, which joins the search queries ``LATERAL``
+    with given query, so that the searches only take one round trip to the
+    database.
 
-    query = query.filter(
-        vector.op("@@")(sa.func.parse_websearch(regconfig, search_query))
+    Example::
+
+        from sqlalchemy_searchable import batch_search
+
+
+        results = batch_search(
+            session,
+            sa.select(Article),
+            ["first article", "second article"],
+            limit=5,
+        )
+        for (article,) in results[0]:
+            print(article.name)
+
+    :param conn: SQLAlchemy Connection or Session object
+    :param query: the query to search, which should not have a limit
+    :param search_queries:
+        the search queries, to which the query limits of the search vector are
+        applied as in :func:`search`. A search query exceeding a rejecting limit
+        raises :class:`SearchQueryRejected`.
+    :param limit: maximum number of rows to return for each search query
+    :param vector: search vector to use
+    :param regconfig: postgresql regconfig or list of regconfigs to be used
+    :param sort: Order the results of each search query by relevance.
+    :return:
+        list containing the results of each search query, in the order of
+        ``search_queries``. The results are lists of tuples of the selected
+        columns or entities, in the order of given query.
+    """
+    if not search_queries:
+        return []
+    if vector is None:
+        vector = _default_search_vector(query, search_manager)
+    if isinstance(vector.type, TSVectorType) and vector.type.options.get(
+        "search_table"
+    ):
+        query = query.join(vector.table)
+
+    options = _search_options(vector, search_manager)
+    limited_queries = [
+        (
+            _limit_search_query(search_query, options)
+            if isinstance(search_query, str)
+            else search_query
+        )
+        for search_query in search_queries
+    ]
+    # The search queries are passed as a single array parameter, along with the
+    # minimum prefix lengths of their terms, where NULL disables prefix matching.
+    search_query_rows = (
+        sa.func.unnest(
+            sa.bindparam(
+                "search_queries",
+                [limited_query.search_query for limited_query in limited_queries],
+                type_=postgresql.ARRAY(sa.Text),
+            ),
+            sa.bindparam(
+                "min_prefix_lengths",
+                [
+                    (
+                        limited_query.min_prefix_length
+                        if limited_query.prefix_matching
+                        else None
+                    )
+                    for limited_query in limited_queries
+                ],
+                type_=postgresql.ARRAY(sa.Integer),
+            ),
+        )
+        .table_valued("search_query", "min_prefix_length", with_ordinality="ordinal")
+        .render_derived()
+        .alias("search_query_rows")
+    )
+    tsquery = _websearch_tsquery(
+        regconfig,
+        _search_query_text(vector, search_query_rows.c.search_query, search_manager),
+        search_manager,
+    )
+    if any(
+        not limited_query.prefix_matching or limited_query.min_prefix_length > 1
+        for limited_query in limited_queries
+    ):
+        tsquery = sa.func.remove_prefixes(
+            tsquery, search_query_rows.c.min_prefix_length
+        )
+    # The search queries are parsed in a materialized CTE, so that each search query
+    # is parsed once instead of once for every row scanned by its search.
+    queries = (
+        sa.select(search_query_rows.c.ordinal, tsquery.label("tsquery"))
+        .cte("search_queries")
+        .prefix_with("MATERIALIZED")
     )
+    tsquery = queries.c.tsquery
+    matches = query.where(vector.op("@@")(tsquery))
     if sort:
-        query = query.order_by(
-            sa.desc(sa.func.ts_rank_cd(vector, sa.func.parse_websearch(search_query)))
+        matches = matches.order_by(sa.desc(sa.func.ts_rank_cd(vector, tsquery)))
+    order_by = matches._order_by_clauses
+    if order_by:
+        # The order of the lateral subquery is not kept by the statement selecting
+        # from it, so the matches are numbered in their order, including the rank.
+        matches = matches.add_columns(
+            sa.func.row_number().over(order_by=order_by).label("position")
+        )
+    results = matches.limit(limit).lateral("results")
+
+    statement = (
+        sa.select(queries.c.ordinal, *_subquery_columns(query, results))
+        .join_from(queries, results, sa.true())
+        .order_by(queries.c.ordinal, *([results.c.position] if order_by else []))
+    )
+
+    grouped_results: list[list[tuple[Any, ...]]] = [[] for _ in search_queries]
+    for row in conn.execute(statement):
+        grouped_results[row[0] - 1].append(tuple(row[1:]))
+    return grouped_results
+
+
+def stream_search(
+    conn: Connection | Session,
+    query: Select[_T],
+    search_query: str,
+    batch_size: int = 1000,
+    keyset: bool = False,
+    vector: Column[TSVectorType] | None = None,
+    regconfig: str | Sequence[str] | None = None,
+    sort: bool = False,
+) -> Generator[tuple[Any, ...], None, None]:
+    """
+    Search given query with full text search, and yield the results one at a time
+    without loading them all in memory, for exporting very large numbers of rows.
+
+    The results are fetched from a server-side cursor in batches of
+    ``batch_size`` rows, so the client only holds one batch at a time. The cursor
+    is closed when the iterator is exhausted or closed::
+
+        from sqlalchemy_searchable import stream_search
+
+
+        with engine.connect() as conn:
+            for (article_id, name) in stream_search(
+                conn, sa.select(Article.id, Article.name), "first article"
+            ):
+                writer.writerow([article_id, name])
+
+    As the server-side cursor keeps its transaction open for as long as the
+    results are being consumed, slow consumers should use ``keyset`` chunking
+    instead. Each batch is then fetched with a separate statement that continues
+    after the primary key of the last row of the previous batch, so no cursor is
+    held open between the batches, and the iteration can span many transactions.
+
+    When iterating over ORM entities using a Session, the entities of the
+    previous batches are only kept in memory if they are referenced elsewhere.
+
+    :param conn: SQLAlchemy Connection or Session object
+    :param query: the query to search, which should not have a limit
+    :param search_query: the search query
+    :param batch_size: number of rows to fetch at a time
+    :param keyset:
+        Fetch each batch using a separate statement instead of a server-side
+        cursor. The results are ordered by the primary key of the searched table,
+        which has to have one.
+    :param vector: search vector to use
+    :param regconfig: postgresql regconfig or list of regconfigs to be used
+    :param sort: Order the results by relevance. Cannot be combined with
+        ``keyset``.
+    :return:
+        generator of tuples of the selected columns or entities, in the order of
+        given query
+    """
+    statement, primary_key = _stream_search_statement(
+        query, search_query, keyset, vector, regconfig, sort
+    )
+    if not primary_key:
+        result = conn.execute(statement, execution_options={"yield_per": batch_size})
+        try:
+            for row in result:
+                yield tuple(row)
+        finally:
+            result.close()
+        return
+
+    last_key = None
+    while True:
+        rows = conn.execute(
+            _keyset_batch(statement, primary_key, last_key, batch_size)
+        ).all()
+        for row in rows:
+            yield tuple(row[: -len(primary_key)])
+        if len(rows) < batch_size:
+            return
+        last_key = tuple(rows[-1][-len(primary_key) :])
+
+
+async def stream_search_async(
+    conn: AsyncConnection | AsyncSession,
+    query: Select[_T],
+    search_query: str,
+    batch_size: int = 1000,
+    keyset: bool = False,
+    vector: Column[TSVectorType] | None = None,
+    regconfig: str | Sequence[str] | None = None,
+    sort: bool = False,
+) -> AsyncGenerator[tuple[Any, ...], None]:
+    """
+    Asynchronous variant of :func:`stream_search`, for use with an
+    ``AsyncConnection`` or ``AsyncSession``::
+
+        async with engine.connect() as conn:
+            async for (article_id, name) in stream_search_async(
+                conn, sa.select(Article.id, Article.name), "first article"
+            ):
+                writer.writerow([article_id, name])
+
+    The parameters are the same as the parameters of :func:`stream_search`.
+    """
+    statement, primary_key = _stream_search_statement(
+        query, search_query, keyset, vector, regconfig, sort
+    )
+    if not primary_key:
+        result = await conn.stream(
+            statement, execution_options={"yield_per": batch_size}
+        )
+        try:
+            async for row in result:
+                yield tuple(row)
+        finally:
+            await result.close()
+        return
+
+    last_key = None
+    while True:
+        rows = (
+            await conn.execute(
+                _keyset_batch(statement, primary_key, last_key, batch_size)
+            )
+        ).all()
+        for row in rows:
+            yield tuple(row[: -len(primary_key)])
+        if len(rows) < batch_size:
+            return
+        last_key = tuple(rows[-1][-len(primary_key) :])
+
+
+def _stream_search_statement(
+    query: Select[Any],
+    search_query: str,
+    keyset: bool,
+    vector: Column[TSVectorType] | None,
+    regconfig: str | Sequence[str] | None,
+    sort: bool,
+) -> tuple[Select[Any], list[Column[Any]]]:
+    """
+    Return the search statement of :func:`stream_search`, and the primary key
+    columns appended to the statement for keyset chunking.
+    """
+    if keyset and sort:
+        raise ValueError(
+            "Keyset chunking orders the results by primary key, and cannot be "
+            "combined with sort."
+        )
+    if vector is None:
+        vector = _default_search_vector(query, search_manager)
+    statement = search(
+        query, search_query, vector=vector, regconfig=regconfig, sort=sort
+    )
+    if not keyset:
+        return statement, []
+    if not isinstance(vector, Column) or not isinstance(vector.type, TSVectorType):
+        raise ValueError("Keyset chunking can only be used with search vector columns.")
+    table = SQLConstruct(vector, options=search_manager.column_options(vector)).table
+    primary_key = list(table.primary_key.columns)
+    if not primary_key:
+        raise ValueError(
+            f"Keyset chunking requires table {table.name} to have a primary key."
+        )
+    return statement.add_columns(*primary_key), primary_key
+
+
+def _keyset_batch(
+    statement: Select[Any],
+    primary_key: list[Column[Any]],
+    last_key: tuple[Any, ...] | None,
+    batch_size: int,
+) -> Select[Any]:
+    """
+    Return the statement fetching the batch of rows that follows given primary key.
+    """
+    if last_key is not None:
+        statement = statement.where(sa.tuple_(*primary_key) > sa.tuple_(*last_key))
+    return statement.order_by(None).order_by(*primary_key).limit(batch_size)
+
+
+def search_facets(
+    conn: Connection | Session,
+    query: Select[Any],
+    search_query: str,
+    facets: Mapping[str, ColumnElement[Any]],
+    limit: int | None = None,
+    sample_percent: float | None = None,
+    vector: Column[TSVectorType] | None = None,
+    regconfig: str | Sequence[str] | None = None,
+) -> dict[str, list[tuple[Any, int]]]:
+    """
+    Count the rows of given query that match given search query by the values of
+    each of given facets. All the facets are counted using a single statement,
+    which groups the matching rows by ``GROUPING SETS`` of the facets, so that the
+    matching rows are only searched once::
+
+        from sqlalchemy_searchable import search_facets
+
+
+        facets = search_facets(
+            session,
+            sa.select(Article),
+            "first article",
+            {
+                "category": Article.category_id,
+                "year": sa.extract("year", Article.created_at),
+            },
+            limit=10,
+        )
+        for category_id, count in facets["category"]:
+            print(category_id, count)
+
+    For very large numbers of matching rows, the counts can be approximated by
+    only searching a random sample of the pages of the searched table using
+    ``TABLESAMPLE SYSTEM``, and scaling the counts accordingly. As the sample is
+    read with a sequential scan, sampling is only faster when the search query
+    matches a large part of the table.
+
+    :param conn: SQLAlchemy Connection or Session object
+    :param query: the query to search, which should not have a limit
+    :param search_query: the search query
+    :param facets:
+        dictionary mapping the names of the facets to the columns or expressions
+        whose values are counted
+    :param limit: maximum number of values to return for each facet
+    :param sample_percent:
+        Percentage of the pages of the searched table to sample for approximate
+        counts, or None for exact counts.
+    :param vector: search vector to use
+    :param regconfig: postgresql regconfig or list of regconfigs to be used
+    :return:
+        dictionary mapping the names of the facets to lists of tuples of values and
+        their counts, ordered by descending count. Null values are counted as well.
+    """
+    if not facets:
+        return {}
+    if vector is None:
+        vector = _default_search_vector(query, search_manager)
+    labels = [f"facet_{index}" for index in range(len(facets))]
+    statement = (
+        search(query, search_query, vector=vector, regconfig=regconfig)
+        .with_only_columns(
+            *(
+                expression.label(label)
+                for label, expression in zip(labels, facets.values())
+            ),
+            maintain_column_froms=True,
+        )
+        .order_by(None)
+    )
+    if sample_percent is not None:
+        if not isinstance(vector, Column):
+            raise ValueError("Sampling can only be used with search vector columns.")
+        sample = sa.tablesample(
+            vector.table, sa.func.system(sample_percent), name="sample"
         )
+        statement = ClauseAdapter(sample).traverse(statement)
+
+    matches = statement.subquery("matches")
+    columns = [matches.c[label] for label in labels]
+    grouping = sa.func.grouping(*columns)
+    count = sa.func.count()
+    counts = (
+        sa.select(
+            grouping.label("grouping"),
+            *columns,
+            count.label("frequency"),
+            sa.func.row_number()
+            .over(partition_by=grouping, order_by=[count.desc(), *columns])
+            .label("position"),
+        )
+        .select_from(matches)
+        .group_by(sa.func.grouping_sets(*columns))
+        .subquery("counts")
+    )
+    counts_query = sa.select(counts).order_by(counts.c.grouping, counts.c.position)
+    if limit is not None:
+        counts_query = counts_query.where(counts.c.position <= limit)
+
+    # GROUPING() returns a bit mask with the bits of the facets that a row of the
+    # counts is not grouped by set, the first facet being the most significant bit.
+    names = list(facets)
+    all_bits = (1 << len(names)) - 1
+    facet_indexes = {
+        all_bits ^ (1 << (len(names) - 1 - index)): index for index in range(len(names))
+    }
+    results: dict[str, list[tuple[Any, int]]] = {name: [] for name in names}
+    for row in conn.execute(counts_query):
+        index = facet_indexes[row.grouping]
+        frequency = row.frequency
+        if sample_percent is not None:
+            frequency = round(frequency * 100 / sample_percent)
+        results[names[index]].append((row[1 + index], frequency))
+    return results
+
+
+def _subquery_columns(query: Select[Any], subquery: FromClause) -> list[Any]:
+    """
+    Return the columns or entities selected by given query, selected from given
+    subquery of the query.
+    """
+    descriptions = query.column_descriptions
+    if len(descriptions) == 1 and descriptions[0]["expr"] is descriptions[0].get(
+        "entity"
+    ):
+        # Queries of a single mapped entity return instances of the entity.
+        return [sa.orm.aliased(descriptions[0]["entity"], subquery)]
+    return list(subquery.c)[: len(query.selected_columns)]
+
+
+@dataclasses.dataclass(frozen=True)
+class _Relation:
+    #: The related table.
+    table: sa.Table
 
-    return query.params(term=search_query)
+    #: The association table of a many-to-many relationship.
+    association: sa.Table | None
+
+    #: Pairs of joined columns of the searched table and the association table, or
+    #: the related table if there is no association table.
+    parent_pairs: list[tuple[Column[Any], Column[Any]]]
+
+    #: Pairs of joined columns of the related table and the association table.
+    association_pairs: list[tuple[Column[Any], Column[Any]]]
+
+    @property
+    def link_table(self) -> sa.Table:
+        return self.table if self.association is None else self.association
+
+
+def _foreign_key_pairs(
+    table: sa.Table, referred_table: sa.Table
+) -> list[tuple[Column[Any], Column[Any]]] | None:
+    for constraint in table.foreign_key_constraints:
+        if constraint.referred_table is referred_table:
+            return [(element.parent, element.column) for element in constraint.elements]
+    return None
+
+
+def _find_relation(table: sa.Table, name: str) -> _Relation:
+    key = name if "." in name or not table.schema else f"{table.schema}.{name}"
+    try:
+        related = table.metadata.tables[key]
+    except KeyError:
+        raise sa.exc.CompileError(
+            f"Related table {name} of table {table.name} does not exist in metadata."
+        ) from None
+    pairs = _foreign_key_pairs(table, related)
+    if pairs is not None:
+        return _Relation(related, None, pairs, [])
+    pairs = _foreign_key_pairs(related, table)
+    if pairs is not None:
+        return _Relation(related, None, [(b, a) for a, b in pairs], [])
+    for association in table.metadata.sorted_tables:
+        if association is table or association is related:
+            continue
+        pairs = _foreign_key_pairs(association, table)
+        association_pairs = _foreign_key_pairs(association, related)
+        if pairs is not None and association_pairs is not None:
+            return _Relation(
+                related,
+                association,
+                [(b, a) for a, b in pairs],
+                [(b, a) for a, b in association_pairs],
+            )
+    raise sa.exc.CompileError(
+        f"Could not find a foreign key relationship between tables {table.name} and "
+        f"{name}."
+    )
 
 
 class SQLConstruct:
@@ -123,9 +1354,15 @@ class SQLConstruct:
         indexed_columns: Sequence[str] | None = None,
         options: SearchOptions | None = None,
     ):
-        self.table = tsvector_column.table
         self.tsvector_column = tsvector_column
         self.search_options = options or SearchOptions()
+        #: Table the search vector is stored in.
+        self.vector_table = tsvector_column.table
+        if self.search_options.search_table:
+            # A search table references the searched table with its primary key.
+            self.table = next(iter(self.vector_table.foreign_keys)).column.table
+        else:
+            self.table = self.vector_table
         if indexed_columns:
             self.indexed_columns = list(indexed_columns)
         elif hasattr(self.tsvector_column.type, "columns"):
@@ -140,46 +1377,453 @@ class SQLConstruct:
         else:
             return '"' + self.table.name + '"'
 
+    def format_table_name(self, compiler: SQLCompiler, name: str | None = None) -> str:
+        # Unlike table_name, this takes the schema_translate_map execution option
+        # into account.
+        if name is None:
+            name = self.table.name
+        schema = compiler.preparer.schema_for_object(self.table)
+        if schema:
+            return f'{compiler.preparer.quote_schema(schema)}."{name}"'
+        else:
+            return '"' + name + '"'
+
+    def column_vector_cache_name(self, column_name: str) -> str:
+        return self.search_options.column_vector_cache_name.format(
+            table=self.table.name,
+            column=self.tsvector_column.name,
+            indexed_column=column_name,
+        )
+
     @property
-    def search_function_name(self) -> str:
-        return self.search_options.search_trigger_function_name.format(
+    def search_queue_table_name(self) -> str:
+        return self.search_options.search_queue_table_name.format(
             table=self.table.name, column=self.tsvector_column.name
         )
 
     @property
-    def search_trigger_name(self) -> str:
-        return self.search_options.search_trigger_name.format(
+    def search_version_table_name(self) -> str:
+        return self.search_options.search_version_table_name.format(
             table=self.table.name, column=self.tsvector_column.name
         )
 
-    def column_vector(self, column: Column[Any]) -> ColumnElement[str]:
-        column_reference: ColumnClause[Any] = sa.literal_column(f"NEW.{column.name}")
-        try:
-            vectorizer_func = vectorizer[column]
-        except KeyError:
-            value: ColumnElement[Any] = column_reference
-        else:
-            value = vectorizer_func(column_reference)
-        tsvector = sa.func.to_tsvector(
-            sa.literal(self.search_options.regconfig),
-            sa.func.coalesce(value, sa.text("''")),
-        )
-        if column.name in self.search_options.weights:
-            weight = self.search_options.weights[column.name]
-            return sa.func.setweight(tsvector, weight)
-        return tsvector
+    @property
+    def search_version_trigger_name(self) -> str:
+        return self.search_trigger_name + "_version"
 
-    def search_vector(self, compiler: SQLCompiler) -> str:
-        vectors = (
-            self.column_vector(getattr(self.table.c, column_name))
-            for column_name in self.indexed_columns
+    @property
+    def lexeme_dictionary_table_name(self) -> str:
+        return self.search_options.lexeme_dictionary_table_name.format(
+            table=self.table.name, column=self.tsvector_column.name
         )
-        concatenated = reduce(lambda x, y: x.op("||")(y), vectors)
-        return compiler.sql_compiler.process(concatenated, literal_binds=True)
 
+    @property
+    def uses_lexeme_dictionary(self) -> bool:
+        return self.search_options.lexeme_dictionary or self.search_options.search_words
 
-class CreateSearchFunctionSQL(SQLConstruct, DDLElement, Executable):
-    pass
+    @property
+    def lexeme_dictionary_trigger_names(self) -> list[str]:
+        return [
+            self.search_trigger_name + "_lexemes_" + operation
+            for operation in ["insert", "update", "delete", "truncate"]
+        ]
+
+    @property
+    def term_stats_table_name(self) -> str:
+        return self.search_options.term_stats_table_name.format(
+            table=self.table.name, column=self.tsvector_column.name
+        )
+
+    @property
+    def primary_key(self) -> list[str]:
+        primary_key = [column.name for column in self.table.primary_key.columns]
+        if not primary_key:
+            raise sa.exc.CompileError(
+                f"Table {self.table.name} must have a primary key for queued "
+                "search vector updates, search tables and deferred search vectors."
+            )
+        return primary_key
+
+    @property
+    def search_function_name(self) -> str:
+        return self.search_options.search_trigger_function_name.format(
+            table=self.table.name, column=self.tsvector_column.name
+        )
+
+    @property
+    def search_trigger_name(self) -> str:
+        return self.search_options.search_trigger_name.format(
+            table=self.table.name, column=self.tsvector_column.name
+        )
+
+    @property
+    def uses_search_function(self) -> bool:
+        return bool(
+            self.search_options.weights
+            or self.search_options.queue_updates
+            or self.search_options.cache_column_vectors
+            or self.search_options.search_table
+            or self.search_options.related
+            or self.search_options.max_characters
+            or self.search_options.max_words
+            or self.search_options.notify_channel
+            or self.search_options.unaccent
+            or self.search_options.regconfig_column
+            or any(
+                getattr(self.table.c, column) in vectorizer
+                for column in self.indexed_columns
+            )
+        )
+
+    @property
+    def relations(self) -> dict[str, _Relation]:
+        if self.search_options.related and (
+            self.search_options.queue_updates
+            or self.search_options.cache_column_vectors
+            or self.search_options.search_table
+        ):
+            raise sa.exc.CompileError(
+                "Related columns are only supported with synchronous row level "
+                "search triggers that store the search vector in the searched table."
+            )
+        return {
+            name: _find_relation(self.table, name)
+            for name in self.search_options.related
+        }
+
+    def truncated_value(
+        self, value: ColumnElement[Any], key: str
+    ) -> ColumnElement[Any]:
+        """
+        Return given value truncated to the size limits of given column.
+
+        :param value: the value to truncate
+        :param key: name of the column, or ``table.column`` for related columns
+        """
+        if key in self.search_options.max_characters:
+            value = sa.func.left(value, self.search_options.max_characters[key])
+        if key in self.search_options.max_words:
+            words = sa.func.regexp_split_to_array(
+                sa.func.btrim(value), "[[:space:]]+", type_=postgresql.ARRAY(sa.Text)
+            )
+            value = sa.func.array_to_string(
+                words[1 : self.search_options.max_words[key]], " "
+            )
+        return value
+
+    def truncation_conditions(
+        self, value: ColumnElement[Any], key: str
+    ) -> list[ColumnElement[bool]]:
+        """
+        Return the conditions for given value being truncated by the size limits of
+        given column.
+
+        :param value: the value to check
+        :param key: name of the column, or ``table.column`` for related columns
+        """
+        conditions = []
+        if key in self.search_options.max_characters:
+            conditions.append(
+                sa.func.length(value) > self.search_options.max_characters[key]
+            )
+        if key in self.search_options.max_words:
+            words = sa.func.regexp_split_to_array(
+                sa.func.btrim(value), "[[:space:]]+", type_=postgresql.ARRAY(sa.Text)
+            )
+            conditions.append(
+                sa.func.array_length(words, 1) > self.search_options.max_words[key]
+            )
+        return conditions
+
+    @property
+    def trigger_columns(self) -> list[str]:
+        """
+        Names of the columns of the searched table whose changes require the search
+        vector to be recomputed.
+        """
+        columns = list(self.indexed_columns)
+        regconfig_column = self.search_options.regconfig_column
+        if regconfig_column is not None and regconfig_column not in columns:
+            columns.append(regconfig_column)
+        return columns
+
+    def regconfig_value(
+        self, from_clause: FromClause | None = None
+    ) -> ColumnElement[Any]:
+        """
+        Return the regconfig the indexed values are vectorized with.
+
+        :param from_clause:
+            Table or subquery the regconfig column is read from. If None is given,
+            the column is referenced through the ``NEW`` record of a trigger.
+        """
+        regconfig = sa.literal(self.search_options.regconfig)
+        column_name = self.search_options.regconfig_column
+        if column_name is None:
+            return regconfig
+        if from_clause is None:
+            column: ColumnElement[Any] = sa.literal_column(f"NEW.{column_name}")
+        else:
+            column = from_clause.c[column_name]
+        return sa.func.coalesce(sa.cast(column, postgresql.REGCONFIG), regconfig)
+
+    def _to_tsvector(
+        self,
+        value: ColumnElement[Any],
+        key: str,
+        regconfig: ColumnElement[Any] | None = None,
+    ) -> ColumnElement[str]:
+        value = self.truncated_value(value, key)
+        if self.search_options.unaccent:
+            value = sa.func.immutable_unaccent(sa.cast(value, sa.Text))
+        tsvector = sa.func.to_tsvector(
+            self.regconfig_value() if regconfig is None else regconfig,
+            sa.func.coalesce(value, sa.text("''")),
+        )
+        if key in self.search_options.weights:
+            weight = self.search_options.weights[key]
+            return sa.func.setweight(tsvector, weight)
+        return tsvector
+
+    def column_value(
+        self,
+        column: Column[Any],
+        column_reference: ColumnClause[Any] | None = None,
+    ) -> ColumnElement[Any]:
+        if column_reference is None:
+            column_reference = sa.literal_column(f"NEW.{column.name}")
+        try:
+            vectorizer_func = vectorizer[column]
+        except KeyError:
+            return column_reference
+        return vectorizer_func(column_reference)
+
+    def column_vector(
+        self,
+        column: Column[Any],
+        column_reference: ColumnClause[Any] | None = None,
+        regconfig: ColumnElement[Any] | None = None,
+    ) -> ColumnElement[str]:
+        return self._to_tsvector(
+            self.column_value(column, column_reference), column.name, regconfig
+        )
+
+    def related_column_vector(
+        self,
+        name: str,
+        relation: _Relation,
+        column: Column[Any],
+        parent_reference: Callable[[str], ColumnElement[Any]],
+        regconfig: ColumnElement[Any] | None = None,
+    ) -> ColumnElement[str]:
+        """
+        Return the search vector of the values of a column of a related table.
+
+        :param name: name of the related table as given in the options
+        :param relation: relationship to the related table
+        :param column: the related column
+        :param parent_reference:
+            Function returning a reference to the column of the searched table with
+            given name.
+        :param regconfig: the regconfig to vectorize the values with
+        """
+        related = relation.table.alias("related")
+        column_reference = cast(ColumnClause[Any], related.c[column.name])
+        try:
+            vectorizer_func = vectorizer[column]
+        except KeyError:
+            value: ColumnElement[Any] = column_reference
+        else:
+            value = vectorizer_func(column_reference)
+        values = sa.select(sa.func.string_agg(sa.cast(value, sa.Text), sa.literal(" ")))
+        if relation.association is None:
+            link: FromClause = related
+            values = values.select_from(related)
+        else:
+            link = relation.association.alias("association")
+            values = values.select_from(
+                related.join(
+                    link,
+                    sa.and_(
+                        *(
+                            link.c[association_column.name]
+                            == related.c[related_column.name]
+                            for related_column, association_column in (
+                                relation.association_pairs
+                            )
+                        )
+                    ),
+                )
+            )
+        values = values.where(
+            *(
+                link.c[link_column.name] == parent_reference(parent_column.name)
+                for parent_column, link_column in relation.parent_pairs
+            )
+        )
+        return self._to_tsvector(
+            values.scalar_subquery(), f"{name}.{column.name}", regconfig
+        )
+
+    def search_vector_expression(
+        self, from_clause: FromClause | None = None
+    ) -> ColumnElement[str]:
+        """
+        Return the search vector expression for the indexed columns.
+
+        :param from_clause:
+            Table or subquery the indexed columns are read from. If None is given,
+            the columns are referenced through the ``NEW`` record of a trigger.
+        """
+        regconfig = self.regconfig_value(from_clause)
+        vectors = [
+            self.column_vector(
+                getattr(self.table.c, column_name),
+                None
+                if from_clause is None
+                else cast(ColumnClause[Any], from_clause.c[column_name]),
+                regconfig,
+            )
+            for column_name in self.indexed_columns
+        ]
+
+        def parent_reference(name: str) -> ColumnElement[Any]:
+            if from_clause is None:
+                return sa.literal_column(f"NEW.{name}")
+            return from_clause.c[name]
+
+        for name, relation in self.relations.items():
+            vectors.extend(
+                self.related_column_vector(
+                    name,
+                    relation,
+                    relation.table.c[column_name],
+                    parent_reference,
+                    regconfig,
+                )
+                for column_name in self.search_options.related[name]
+            )
+        return reduce(lambda x, y: x.op("||")(y), vectors)
+
+    def search_vector(self, compiler: SQLCompiler) -> str:
+        return compiler.sql_compiler.process(
+            self.search_vector_expression(), literal_binds=True
+        )
+
+
+class CreateSearchFunctionSQL(SQLConstruct, DDLElement, Executable):
+    pass
+
+
+def _notify_statement(
+    element: CreateSearchFunctionSQL,
+    compiler: SQLCompiler,
+) -> str:
+    channel = element.search_options.notify_channel
+    if channel is None:
+        return ""
+    key = ", ".join(
+        f"'{name}', NEW.{compiler.preparer.quote(name)}" for name in element.primary_key
+    )
+    payload = (
+        "json_build_object('schema', TG_TABLE_SCHEMA, 'table', TG_TABLE_NAME, "
+        f"'key', json_build_object({key}))::text"
+    )
+    channel = channel.replace("'", "''")
+    return f"""
+            PERFORM pg_notify('{channel}', {payload});"""
+
+
+def _queue_search_function_body(
+    element: CreateSearchFunctionSQL,
+    compiler: SQLCompiler,
+) -> str:
+    row_key = ", ".join(
+        f"'{name}', NEW.{compiler.preparer.quote(name)}" for name in element.primary_key
+    )
+    # The queue table is looked up from the schema of the table that fired the
+    # trigger, so that the same function can be shared by tables in different
+    # schemas.
+    return f"""
+            EXECUTE 'INSERT INTO ' || quote_ident(TG_TABLE_SCHEMA)
+                || '.' || quote_ident('{element.search_queue_table_name}')
+                || ' (row_key) VALUES ($1)'
+                USING jsonb_build_object({row_key});
+            RETURN NULL;"""
+
+
+def _cached_search_function_body(
+    element: CreateSearchFunctionSQL,
+    compiler: SQLCompiler,
+) -> str:
+    if element.search_options.queue_updates:
+        raise sa.exc.CompileError(
+            "Column vector caching is only supported with synchronous row level "
+            "search triggers."
+        )
+    quote = compiler.preparer.quote
+    body = ""
+    for column_name in element.indexed_columns:
+        cache = quote(element.column_vector_cache_name(column_name))
+        vector = compiler.sql_compiler.process(
+            element.column_vector(getattr(element.table.c, column_name)),
+            literal_binds=True,
+        )
+        # The cached vector is also recomputed when the regconfig of the row
+        # changes.
+        changed_columns = [column_name]
+        regconfig_column = element.search_options.regconfig_column
+        if regconfig_column is not None and regconfig_column != column_name:
+            changed_columns.append(regconfig_column)
+        changed = " OR ".join(
+            f"NEW.{quote(name)} IS DISTINCT FROM OLD.{quote(name)}"
+            for name in changed_columns
+        )
+        body += f"""
+            IF TG_OP = 'INSERT' OR NEW.{cache} IS NULL
+                OR {changed} THEN
+                NEW.{cache} = {vector};
+            END IF;"""
+    concatenated = " || ".join(
+        f"NEW.{quote(element.column_vector_cache_name(column_name))}"
+        for column_name in element.indexed_columns
+    )
+    notify = _notify_statement(element, compiler)
+    return f"""{body}
+            NEW.{element.tsvector_column.name} = {concatenated};{notify}
+            RETURN NEW;"""
+
+
+def _search_table_function_body(
+    element: CreateSearchFunctionSQL,
+    compiler: SQLCompiler,
+) -> str:
+    options = element.search_options
+    if options.queue_updates or options.cache_column_vectors:
+        raise sa.exc.CompileError(
+            "Search tables are only supported with synchronous row level search "
+            "triggers without column vector caching."
+        )
+    quote = compiler.preparer.quote
+    primary_key = [quote(name) for name in element.primary_key]
+    vector_column = quote(element.tsvector_column.name)
+    columns = ", ".join(primary_key + [vector_column])
+    parameters = ", ".join(f"${index}" for index in range(1, len(primary_key) + 2))
+    values = ", ".join(
+        [f"NEW.{name}" for name in primary_key] + [element.search_vector(compiler)]
+    )
+    notify = _notify_statement(element, compiler)
+    # The search table is looked up from the schema of the table that fired the
+    # trigger, so that the same function can be shared by tables in different
+    # schemas.
+    return f"""
+            EXECUTE 'INSERT INTO ' || quote_ident(TG_TABLE_SCHEMA)
+                || '.' || quote_ident('{element.vector_table.name}')
+                || $sql$ ({columns}) VALUES ({parameters})
+                ON CONFLICT ({", ".join(primary_key)})
+                DO UPDATE SET {vector_column} = EXCLUDED.{vector_column} $sql$
+                USING {values};{notify}
+            RETURN NULL;"""
 
 
 @compiles(CreateSearchFunctionSQL)
@@ -187,11 +1831,24 @@ def compile_create_search_function_sql(
     element: CreateSearchFunctionSQL,
     compiler: SQLCompiler,
 ) -> str:
-    return f"""CREATE FUNCTION
+    if element.search_options.search_table:
+        body = _search_table_function_body(element, compiler)
+    elif element.search_options.cache_column_vectors:
+        body = _cached_search_function_body(element, compiler)
+    elif element.search_options.queue_updates:
+        body = _queue_search_function_body(element, compiler)
+    else:
+        vector = element.search_vector(compiler)
+        notify = _notify_statement(element, compiler)
+        body = f"""
+            NEW.{element.tsvector_column.name} = {vector};{notify}
+            RETURN NEW;"""
+    extension = ""
+    if element.search_options.unaccent:
+        extension = f"{create_unaccent_sql}; "
+    return f"""{extension}CREATE OR REPLACE FUNCTION
             {element.search_function_name}() RETURNS TRIGGER AS $$
-        BEGIN
-            NEW.{element.tsvector_column.name} = {element.search_vector(compiler)};
-            RETURN NEW;
+        BEGIN{body}
         END
         $$ LANGUAGE 'plpgsql';
         """
@@ -200,10 +1857,7 @@ def compile_create_search_function_sql(
 class CreateSearchTriggerSQL(SQLConstruct, DDLElement, Executable):
     @property
     def search_trigger_function_with_trigger_args(self) -> str:
-        if self.search_options.weights or any(
-            getattr(self.table.c, column) in vectorizer
-            for column in self.indexed_columns
-        ):
+        if self.uses_search_function:
             return self.search_function_name + "()"
         return "tsvector_update_trigger({arguments})".format(
             arguments=", ".join(
@@ -218,9 +1872,20 @@ def compile_create_search_trigger_sql(
     element: CreateSearchTriggerSQL,
     compiler: SQLCompiler,
 ) -> str:
+    table_name = element.format_table_name(compiler)
+    if element.search_options.queue_updates or element.search_options.search_table:
+        trigger_columns = ", ".join(
+            compiler.preparer.quote(column) for column in element.trigger_columns
+        )
+        return (
+            f"CREATE TRIGGER {element.search_trigger_name}"
+            f" AFTER INSERT OR UPDATE OF {trigger_columns} ON {table_name}"
+            " FOR EACH ROW EXECUTE PROCEDURE"
+            f" {element.search_trigger_function_with_trigger_args}"
+        )
     return (
         f"CREATE TRIGGER {element.search_trigger_name}"
-        f" BEFORE UPDATE OR INSERT ON {element.table_name}"
+        f" BEFORE UPDATE OR INSERT ON {table_name}"
         " FOR EACH ROW EXECUTE PROCEDURE"
         f" {element.search_trigger_function_with_trigger_args}"
     )
@@ -247,96 +1912,1204 @@ def compile_drop_search_trigger_sql(
     element: DropSearchTriggerSQL,
     compiler: SQLCompiler,
 ) -> str:
+    table_name = element.format_table_name(compiler)
+    return "; ".join(
+        f"DROP TRIGGER IF EXISTS {trigger_name} ON {table_name}"
+        for trigger_name in [
+            element.search_trigger_name,
+            element.search_version_trigger_name,
+        ]
+    )
+
+
+class CreateSearchQueueSQL(SQLConstruct, DDLElement, Executable):
+    pass
+
+
+@compiles(CreateSearchQueueSQL)
+def compile_create_search_queue_sql(
+    element: CreateSearchQueueSQL,
+    compiler: SQLCompiler,
+) -> str:
+    queue_table_name = element.format_table_name(
+        compiler, element.search_queue_table_name
+    )
+    return (
+        f"CREATE TABLE IF NOT EXISTS {queue_table_name} ("
+        "id BIGSERIAL PRIMARY KEY, "
+        "row_key JSONB NOT NULL, "
+        "created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(), "
+        "failed_at TIMESTAMP WITH TIME ZONE, "
+        "error TEXT"
+        ")"
+    )
+
+
+class CreateSearchVersionSQL(SQLConstruct, DDLElement, Executable):
+    pass
+
+
+@compiles(CreateSearchVersionSQL)
+def compile_create_search_version_sql(
+    element: CreateSearchVersionSQL,
+    compiler: SQLCompiler,
+) -> str:
+    version_table_name = element.format_table_name(
+        compiler, element.search_version_table_name
+    )
+    return (
+        f"CREATE TABLE IF NOT EXISTS {version_table_name} ("
+        "version BIGINT NOT NULL"
+        "); "
+        f"INSERT INTO {version_table_name} (version)"
+        f" SELECT 0 WHERE NOT EXISTS (SELECT FROM {version_table_name}); "
+        f"CREATE TRIGGER {element.search_version_trigger_name}"
+        " AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE"
+        f" ON {element.format_table_name(compiler)}"
+        " FOR EACH STATEMENT EXECUTE PROCEDURE"
+        f" search_version_update('{element.search_version_table_name}')"
+    )
+
+
+class DropSearchVersionSQL(SQLConstruct, DDLElement, Executable):
+    pass
+
+
+@compiles(DropSearchVersionSQL)
+def compile_drop_search_version_sql(
+    element: DropSearchVersionSQL,
+    compiler: SQLCompiler,
+) -> str:
+    version_table_name = element.format_table_name(
+        compiler, element.search_version_table_name
+    )
+    return f"DROP TABLE IF EXISTS {version_table_name}"
+
+
+class CreateLexemeDictionarySQL(SQLConstruct, DDLElement, Executable):
+    pass
+
+
+@compiles(CreateLexemeDictionarySQL)
+def compile_create_lexeme_dictionary_sql(
+    element: CreateLexemeDictionarySQL,
+    compiler: SQLCompiler,
+) -> str:
+    dictionary_name = element.format_table_name(
+        compiler, element.lexeme_dictionary_table_name
+    )
+    vector_table_name = element.format_table_name(compiler, element.vector_table.name)
+    vector = compiler.preparer.quote(element.tsvector_column.name)
+    trigger_args = (
+        f"'{element.lexeme_dictionary_table_name}', '{element.tsvector_column.name}'"
+    )
+    # The dictionary is recomputed from the existing rows using ts_stat.
+    vectors_query = f"SELECT {vector} FROM {vector_table_name}".replace("'", "''")
+    statements = [
+        # The C collation allows prefix searches to use the primary key index.
+        f"CREATE TABLE IF NOT EXISTS {dictionary_name}"
+        ' (lexeme TEXT COLLATE "C" PRIMARY KEY, ndoc BIGINT NOT NULL)',
+        f"DELETE FROM {dictionary_name}",
+        f"INSERT INTO {dictionary_name} (lexeme, ndoc)"
+        f" SELECT word, ndoc FROM ts_stat('{vectors_query}')",
+    ]
+    trigram_index_name = compiler.preparer.quote(
+        f"ix_{element.lexeme_dictionary_table_name}_trgm"
+    )
+    if element.search_options.search_words:
+        statements[:0] = ["CREATE EXTENSION IF NOT EXISTS pg_trgm"]
+        statements.append(
+            f"CREATE INDEX IF NOT EXISTS {trigram_index_name}"
+            f" ON {dictionary_name} USING gin (lexeme gin_trgm_ops)"
+        )
+    else:
+        schema = compiler.preparer.schema_for_object(element.table)
+        if schema:
+            trigram_index_name = (
+                f"{compiler.preparer.quote_schema(schema)}.{trigram_index_name}"
+            )
+        statements.append(f"DROP INDEX IF EXISTS {trigram_index_name}")
+    statements.extend(
+        f"DROP TRIGGER IF EXISTS {trigger_name} ON {vector_table_name}"
+        for trigger_name in element.lexeme_dictionary_trigger_names
+    )
+    insert_name, update_name, delete_name, truncate_name = (
+        element.lexeme_dictionary_trigger_names
+    )
+    for trigger_name, event_, referencing in [
+        (insert_name, "INSERT", " REFERENCING NEW TABLE AS new_table"),
+        (
+            update_name,
+            "UPDATE",
+            " REFERENCING OLD TABLE AS old_table NEW TABLE AS new_table",
+        ),
+        (delete_name, "DELETE", " REFERENCING OLD TABLE AS old_table"),
+        (truncate_name, "TRUNCATE", ""),
+    ]:
+        statements.append(
+            f"CREATE TRIGGER {trigger_name}"
+            f" AFTER {event_} ON {vector_table_name}{referencing}"
+            " FOR EACH STATEMENT EXECUTE PROCEDURE"
+            f" lexeme_dictionary_update({trigger_args})"
+        )
+    return "; ".join(statements)
+
+
+class DropLexemeDictionarySQL(SQLConstruct, DDLElement, Executable):
+    pass
+
+
+@compiles(DropLexemeDictionarySQL)
+def compile_drop_lexeme_dictionary_sql(
+    element: DropLexemeDictionarySQL,
+    compiler: SQLCompiler,
+) -> str:
+    vector_table_name = element.format_table_name(compiler, element.vector_table.name)
+    dictionary_name = element.format_table_name(
+        compiler, element.lexeme_dictionary_table_name
+    )
+    return "; ".join(
+        [
+            f"DROP TRIGGER IF EXISTS {trigger_name} ON {vector_table_name}"
+            for trigger_name in element.lexeme_dictionary_trigger_names
+        ]
+        + [f"DROP TABLE IF EXISTS {dictionary_name}"]
+    )
+
+
+class CreateTermStatsSQL(SQLConstruct, DDLElement, Executable):
+    pass
+
+
+@compiles(CreateTermStatsSQL)
+def compile_create_term_stats_sql(
+    element: CreateTermStatsSQL,
+    compiler: SQLCompiler,
+) -> str:
+    stats_name = element.format_table_name(compiler, element.term_stats_table_name)
     return (
-        f"DROP TRIGGER IF EXISTS {element.search_trigger_name} ON {element.table_name}"
+        f"CREATE TABLE IF NOT EXISTS {stats_name}"
+        " (lexeme TEXT PRIMARY KEY, ndoc BIGINT NOT NULL)"
+    )
+
+
+class DropTermStatsSQL(SQLConstruct, DDLElement, Executable):
+    pass
+
+
+@compiles(DropTermStatsSQL)
+def compile_drop_term_stats_sql(
+    element: DropTermStatsSQL,
+    compiler: SQLCompiler,
+) -> str:
+    stats_name = element.format_table_name(compiler, element.term_stats_table_name)
+    return f"DROP TABLE IF EXISTS {stats_name}"
+
+
+class CreateColumnVectorCachesSQL(SQLConstruct, DDLElement, Executable):
+    pass
+
+
+@compiles(CreateColumnVectorCachesSQL)
+def compile_create_column_vector_caches_sql(
+    element: CreateColumnVectorCachesSQL,
+    compiler: SQLCompiler,
+) -> str:
+    columns = ", ".join(
+        "ADD COLUMN IF NOT EXISTS"
+        f" {compiler.preparer.quote(element.column_vector_cache_name(name))} TSVECTOR"
+        for name in element.indexed_columns
+    )
+    return f"ALTER TABLE {element.format_table_name(compiler)} {columns}"
+
+
+class DropSearchQueueSQL(SQLConstruct, DDLElement, Executable):
+    pass
+
+
+@compiles(DropSearchQueueSQL)
+def compile_drop_search_queue_sql(
+    element: DropSearchQueueSQL,
+    compiler: SQLCompiler,
+) -> str:
+    queue_table_name = element.format_table_name(
+        compiler, element.search_queue_table_name
     )
+    return f"DROP TABLE IF EXISTS {queue_table_name}"
+
+
+class RelatedSearchTriggersSQL(SQLConstruct):
+    def watched_tables(
+        self,
+    ) -> list[tuple[sa.Table, Callable[[str], ColumnElement[bool]], list[str]]]:
+        """
+        Return the tables whose changes affect the search vector, along with a
+        function returning the condition for the searched rows affected by a row of
+        the table, and the names of the columns whose updates affect the search
+        vector. An empty list of columns means any update.
+        """
+
+        def reference(record: str, column: Column[Any]) -> ColumnElement[Any]:
+            return sa.literal_column(f"{record}.{column.name}")
+
+        watched_tables: list[
+            tuple[sa.Table, Callable[[str], ColumnElement[bool]], list[str]]
+        ] = []
+        for name, relation in self.relations.items():
+
+            def link_condition(
+                record: str, relation: _Relation = relation
+            ) -> ColumnElement[bool]:
+                return sa.and_(
+                    *(
+                        self.table.c[parent_column.name]
+                        == reference(record, link_column)
+                        for parent_column, link_column in relation.parent_pairs
+                    )
+                )
+
+            related_columns = list(self.search_options.related[name])
+            if relation.association is None:
+                related_columns += [
+                    column.name
+                    for _, column in relation.parent_pairs
+                    if column.name not in related_columns
+                ]
+                watched_tables.append((relation.table, link_condition, related_columns))
+                continue
+
+            def related_condition(
+                record: str, relation: _Relation = relation
+            ) -> ColumnElement[bool]:
+                association = cast(sa.Table, relation.association)
+                return sa.tuple_(
+                    *(
+                        self.table.c[parent_column.name]
+                        for parent_column, _ in relation.parent_pairs
+                    )
+                ).in_(
+                    sa.select(
+                        *(
+                            association.c[association_column.name]
+                            for _, association_column in relation.parent_pairs
+                        )
+                    ).where(
+                        *(
+                            association.c[association_column.name]
+                            == reference(record, related_column)
+                            for related_column, association_column in (
+                                relation.association_pairs
+                            )
+                        )
+                    )
+                )
+
+            related_columns += [
+                column.name
+                for column, _ in relation.association_pairs
+                if column.name not in related_columns
+            ]
+            watched_tables.append((relation.table, related_condition, related_columns))
+            watched_tables.append((relation.association, link_condition, []))
+        return watched_tables
+
+    def related_search_function_name(self, table: sa.Table) -> str:
+        return f"{self.search_function_name}_{table.name}"
+
+    def related_search_trigger_name(self, table: sa.Table) -> str:
+        return f"{self.search_trigger_name}_{table.name}"
+
+
+class CreateRelatedSearchTriggersSQL(RelatedSearchTriggersSQL, DDLElement, Executable):
+    pass
+
+
+@compiles(CreateRelatedSearchTriggersSQL)
+def compile_create_related_search_triggers_sql(
+    element: CreateRelatedSearchTriggersSQL,
+    compiler: SQLCompiler,
+) -> str:
+    statements = []
+    for table, condition, columns in element.watched_tables():
+        function_name = element.related_search_function_name(table)
+        trigger_name = element.related_search_trigger_name(table)
+        table_name = compiler.preparer.format_table(table)
+        # Clearing the search vector fires the search trigger of the searched
+        # table, which computes the search vector again.
+        touch = {
+            record: compiler.sql_compiler.process(
+                element.table.update()
+                .values({element.tsvector_column.name: sa.null()})
+                .where(condition(record)),
+                literal_binds=True,
+            )
+            for record in ["OLD", "NEW"]
+        }
+        events = "INSERT OR DELETE OR UPDATE"
+        if columns:
+            events += " OF " + ", ".join(
+                compiler.preparer.quote(column) for column in columns
+            )
+        statements += [
+            f"""CREATE OR REPLACE FUNCTION
+            {function_name}() RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP <> 'INSERT' THEN
+                {touch["OLD"]};
+            END IF;
+            IF TG_OP <> 'DELETE' THEN
+                {touch["NEW"]};
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE 'plpgsql'""",
+            f"DROP TRIGGER IF EXISTS {trigger_name} ON {table_name}",
+            f"CREATE TRIGGER {trigger_name} AFTER {events} ON {table_name}"
+            f" FOR EACH ROW EXECUTE PROCEDURE {function_name}()",
+        ]
+    return "; ".join(statements)
+
+
+class DropRelatedSearchTriggersSQL(RelatedSearchTriggersSQL, DDLElement, Executable):
+    pass
+
+
+@compiles(DropRelatedSearchTriggersSQL)
+def compile_drop_related_search_triggers_sql(
+    element: DropRelatedSearchTriggersSQL,
+    compiler: SQLCompiler,
+) -> str:
+    statements = []
+    for table, _, _ in element.watched_tables():
+        statements += [
+            f"DROP TRIGGER IF EXISTS {element.related_search_trigger_name(table)}"
+            f" ON {compiler.preparer.format_table(table)}",
+            f"DROP FUNCTION IF EXISTS {element.related_search_function_name(table)}()",
+        ]
+    return "; ".join(statements)
+
+
+class DisableSearchTriggerSQL(SQLConstruct, DDLElement, Executable):
+    pass
+
+
+@compiles(DisableSearchTriggerSQL)
+def compile_disable_search_trigger_sql(
+    element: DisableSearchTriggerSQL,
+    compiler: SQLCompiler,
+) -> str:
+    table_name = element.format_table_name(compiler)
+    return f"ALTER TABLE {table_name} DISABLE TRIGGER {element.search_trigger_name}"
+
+
+class EnableSearchTriggerSQL(SQLConstruct, DDLElement, Executable):
+    pass
+
+
+@compiles(EnableSearchTriggerSQL)
+def compile_enable_search_trigger_sql(
+    element: EnableSearchTriggerSQL,
+    compiler: SQLCompiler,
+) -> str:
+    table_name = element.format_table_name(compiler)
+    return f"ALTER TABLE {table_name} ENABLE TRIGGER {element.search_trigger_name}"
+
+
+class SearchManager:
+    def __init__(self, options: SearchOptions | None = None):
+        self.options = options or SearchOptions()
+        self.processed_columns: list[Column[TSVectorType]] = []
+        self.listeners: list[tuple[sa.Table | sa.MetaData, str, DDLElement]] = []
+        # The time each set of common terms was loaded at, by search vector.
+        self.common_terms: dict[Column[TSVectorType], tuple[float, frozenset[str]]] = {}
+
+    def inspect_columns(self, from_clause: FromClause) -> list[Column[TSVectorType]]:
+        """
+        Inspects all searchable columns for given class.
+
+        :param table: SQLAlchemy Table
+        """
+        return [
+            column
+            for column in from_clause.columns
+            if isinstance(column, Column) and isinstance(column.type, TSVectorType)
+        ]
+
+    def column_options(self, column: Column[TSVectorType]) -> SearchOptions:
+        """
+        Return the search options for given search vector column.
+
+        :param column: TSVectorType typed column
+        """
+        tsvector_type = cast(TSVectorType, column.type)
+        return dataclasses.replace(self.options, **tsvector_type.options)
+
+    def append_index(self, column: Column[Any]) -> None:
+        sa.Index(
+            "_".join(("ix", column.table.name, column.name)),
+            column,
+            postgresql_using="gin",
+        )
+
+    def search_table_vectors(self, table: FromClause) -> list[Column[TSVectorType]]:
+        """
+        Return the search vectors of given table that are stored in search tables.
+
+        :param table: SQLAlchemy Table
+        """
+        return [
+            column
+            for column in self.processed_columns
+            if self.column_options(column).search_table
+            and SQLConstruct(column, options=self.column_options(column)).table is table
+        ]
+
+    def process_mapper(self, mapper: Mapper[Any], cls: type[Any]) -> None:
+        self.process_table(mapper.persist_selectable)
+
+    def process_table(self, table: FromClause) -> None:
+        columns = self.inspect_columns(table)
+        for column in columns:
+            if column in self.processed_columns:
+                continue
+
+            options = self.column_options(column)
+            if options.auto_index:
+                self.append_index(column)
+
+            self.processed_columns.append(column)
+
+    def add_listener(
+        self, args: tuple[sa.Table | sa.MetaData, str, DDLElement]
+    ) -> None:
+        self.listeners.append(args)
+        event.listen(*args)
+
+    def remove_listeners(self) -> None:
+        for listener in self.listeners:
+            event.remove(*listener)
+        self.listeners = []
+
+    def attach_ddl_listeners(self) -> None:
+        # Remove all previously added listeners, so that same listener don't
+        # get added twice in situations where class configuration happens in
+        # multiple phases (issue #31).
+        self.remove_listeners()
+
+        for column in self.processed_columns:
+            # This sets up the trigger that keeps the tsvector column up to
+            # date.
+            tsvector_type = cast(TSVectorType, column.type)
+            if tsvector_type.columns:
+                table = column.table
+                options = self.column_options(column)
+                if options.queue_updates:
+                    self.add_listener(
+                        (
+                            table,
+                            "after_create",
+                            CreateSearchQueueSQL(column, options=options),
+                        )
+                    )
+                    self.add_listener(
+                        (
+                            table,
+                            "after_drop",
+                            DropSearchQueueSQL(column, options=options),
+                        )
+                    )
+                if options.cache_column_vectors:
+                    self.add_listener(
+                        (
+                            table,
+                            "after_create",
+                            CreateColumnVectorCachesSQL(column, options=options),
+                        )
+                    )
+                if SQLConstruct(column, options=options).uses_lexeme_dictionary:
+                    self.add_listener(
+                        (
+                            table,
+                            "before_drop",
+                            DropLexemeDictionarySQL(column, options=options),
+                        )
+                    )
+                if options.common_term_threshold is not None:
+                    self.add_listener(
+                        (
+                            table,
+                            "before_drop",
+                            DropTermStatsSQL(column, options=options),
+                        )
+                    )
+                if options.track_versions:
+                    construct = SQLConstruct(column, options=options)
+                    self.add_listener(
+                        (
+                            construct.table,
+                            "after_create",
+                            CreateSearchVersionSQL(column, options=options),
+                        )
+                    )
+                    self.add_listener(
+                        (
+                            construct.table,
+                            "after_drop",
+                            DropSearchVersionSQL(column, options=options),
+                        )
+                    )
+                if options.search_table:
+                    # The search trigger of the searched table has to be dropped
+                    # before the search function.
+                    self.add_listener(
+                        (
+                            table,
+                            "before_drop",
+                            DropSearchTriggerSQL(column, options=options),
+                        )
+                    )
+                if SQLConstruct(column, options=options).uses_search_function:
+                    self.add_listener(
+                        (
+                            table,
+                            "after_create",
+                            CreateSearchFunctionSQL(column, options=options),
+                        )
+                    )
+                    self.add_listener(
+                        (
+                            table,
+                            "after_drop",
+                            DropSearchFunctionSQL(column, options=options),
+                        )
+                    )
+                self.add_listener(
+                    (
+                        table,
+                        "after_create",
+                        CreateSearchTriggerSQL(column, options=options),
+                    )
+                )
+                if SQLConstruct(column, options=options).uses_lexeme_dictionary:
+                    self.add_listener(
+                        (
+                            table,
+                            "after_create",
+                            CreateLexemeDictionarySQL(column, options=options),
+                        )
+                    )
+                if options.common_term_threshold is not None:
+                    self.add_listener(
+                        (
+                            table,
+                            "after_create",
+                            CreateTermStatsSQL(column, options=options),
+                        )
+                    )
+                if options.related:
+                    # The related tables may be created after the searched table,
+                    # so their triggers are created once all tables exist.
+                    self.add_listener(
+                        (
+                            table.metadata,
+                            "after_create",
+                            CreateRelatedSearchTriggersSQL(column, options=options),
+                        )
+                    )
+                    self.add_listener(
+                        (
+                            table.metadata,
+                            "before_drop",
+                            DropRelatedSearchTriggersSQL(column, options=options),
+                        )
+                    )
+
+
+search_manager = SearchManager()
+
+
+def search_table(
+    entity: Any,
+    *indexed_columns: str,
+    name: str = "search_vector",
+    manager: SearchManager = search_manager,
+    **options: Any,
+) -> sa.Table:
+    """
+    Define a search table that stores the search vector of given model or table.
+
+    The search table has the primary key columns of the searched table, which
+    reference the searched table with ``ON DELETE CASCADE``, and a search vector
+    column with a GIN index. Its rows are inserted and updated by a trigger of the
+    searched table. Keeping the search vector out of the searched table keeps the
+    rows of the searched table narrow, and allows updates that do not change the
+    indexed columns to be HOT updates.
+
+    The search table is defined in the metadata of the searched table, and has to
+    be defined before the mappers are configured. :func:`search` joins the search
+    table automatically::
+
+        from sqlalchemy_searchable import search, search_table
+
+
+        class Article(Base):
+            __tablename__ = 'article'
+
+            id: Mapped[int] = mapped_column(primary_key=True)
+            name: Mapped[str]
+            content: Mapped[str]
+
+
+        article_search = search_table(Article, 'name', 'content')
+
+        query = search(sa.select(Article), 'first article')
+
+    :param entity: mapped class or SQLAlchemy Table to search
+    :param indexed_columns: names of the full text indexed columns
+    :param name: name of the search vector column
+    :param manager: :class:`SearchManager` to register the search vector in
+    :param options:
+        Search options of the search vector, as keyword arguments for
+        :class:`SearchOptions`
+    """
+    table = entity if isinstance(entity, sa.Table) else sa.inspect(entity).local_table
+    options["search_table"] = True
+    search_options = dataclasses.replace(manager.options, **options)
+    vector_table = sa.Table(
+        search_options.search_table_name.format(table=table.name, column=name),
+        table.metadata,
+        *(
+            sa.Column(
+                column.name,
+                column.type,
+                sa.ForeignKey(column, ondelete="CASCADE"),
+                primary_key=True,
+                autoincrement=False,
+            )
+            for column in table.primary_key.columns
+        ),
+        sa.Column(name, TSVectorType(*indexed_columns, **options), nullable=False),
+        schema=table.schema,
+    )
+    manager.process_table(vector_table)
+    return vector_table
+
+
+def stored_queries_table(
+    name: str,
+    metadata: sa.MetaData,
+    *columns: sa.Column[Any],
+    regconfig: str | None = None,
+    schema: str | None = None,
+    unaccent: bool = False,
+) -> sa.Table:
+    """
+    Define a table of stored search queries, for finding the stored search queries
+    that match new rows using :func:`percolate`.
+
+    The search queries are stored in the ``search_query`` column. The table has two
+    generated columns: ``tsquery``, the search query parsed with
+    ``parse_websearch``, and ``terms``, the lexemes that a matching document has to
+    start with at least one of. The ``terms`` column has a GIN index, so that
+    :func:`percolate` only tests the stored search queries that share a term with
+    the new rows. Search queries without such terms, such as queries that only
+    exclude words, are tested against every row::
+
+        from sqlalchemy_searchable import stored_queries_table
+
+
+        saved_search = stored_queries_table(
+            'saved_search',
+            Base.metadata,
+            sa.Column('user_id', sa.ForeignKey('user.id'), nullable=False),
+        )
+
+    :param name: name of the table
+    :param metadata: SQLAlchemy metadata object to define the table in
+    :param columns: additional columns of the table
+    :param regconfig:
+        postgresql regconfig used for parsing the search queries, which should be
+        the regconfig of the search vectors the queries are matched against.
+        Defaults to the regconfig of the global search manager.
+    :param schema: schema of the table
+    :param unaccent:
+        Remove accents from the search queries, which should be enabled when the
+        search vectors the queries are matched against have the ``unaccent``
+        search option.
+    """
+    if regconfig is None:
+        regconfig = search_manager.options.regconfig
+    search_query = sa.Column("search_query", sa.Text, nullable=False)
+    search_text: ColumnElement[Any] = search_query
+    if unaccent:
+        search_text = sa.func.immutable_unaccent(search_query)
+    tsquery = sa.func.parse_websearch(regconfig, search_text)
+    table = sa.Table(
+        name,
+        metadata,
+        sa.Column("id", sa.BigInteger, primary_key=True),
+        search_query,
+        sa.Column("tsquery", postgresql.TSQUERY, sa.Computed(tsquery)),
+        sa.Column(
+            "terms",
+            postgresql.ARRAY(sa.Text),
+            sa.Computed(sa.func.tsquery_terms(tsquery)),
+        ),
+        *columns,
+        schema=schema,
+    )
+    if unaccent:
+        event.listen(
+            table,
+            "before_create",
+            DDL(create_unaccent_sql),  # type: ignore[no-untyped-call]
+        )
+    sa.Index(f"ix_{name}_terms", table.c.terms, postgresql_using="gin")
+    sa.Index(
+        f"ix_{name}_without_terms",
+        table.c.id,
+        postgresql_where=sa.func.cardinality(table.c.terms) == 0,
+    )
+    return table
+
+
+def percolate(
+    conn: Connection | Session,
+    stored_queries: sa.Table,
+    query: Select[_T],
+    vector: Column[TSVectorType] | None = None,
+) -> list[tuple[Any, tuple[Any, ...]]]:
+    """
+    Find the stored search queries that match the rows of given query, such as
+    newly inserted rows. This is the reverse of :func:`search`: instead of finding
+    the rows that match a search query, it finds the search queries that match the
+    rows. All the rows are matched using a single statement.
+
+    Example::
+
+        from sqlalchemy_searchable import percolate
+
+
+        matches = percolate(
+            session,
+            saved_search,
+            sa.select(Article).where(Article.id.in_(new_article_ids)),
+        )
+        for saved_search_id, (article,) in matches:
+            ...
+
+    :param conn: SQLAlchemy Connection or Session object
+    :param stored_queries:
+        table of stored search queries, defined with :func:`stored_queries_table`
+    :param query: query of the rows to match
+    :param vector: search vector to use
+    :return:
+        list of ``(stored_query_id, row)`` tuples for each matching pair of a
+        stored search query and a row, where ``row`` is a tuple of the selected
+        columns or entities of given query
+    """
+    if vector is None:
+        vector = _default_search_vector(query, search_manager)
+    if isinstance(vector.type, TSVectorType) and vector.type.options.get(
+        "search_table"
+    ):
+        query = query.join(vector.table)
+    documents = query.add_columns(vector.label("percolated_vector")).subquery(
+        "documents"
+    )
+    document_vector = documents.c.percolated_vector
+    stored = stored_queries.alias("stored_query")
+    # Only the stored search queries without terms, or with a term that is a
+    # prefix of a lexeme of the document, can match the document.
+    candidates = sa.or_(
+        stored.c.terms.op("&&")(sa.func.tsvector_prefixes(document_vector)),
+        sa.func.cardinality(stored.c.terms) == 0,
+    )
+    statement = sa.select(stored.c.id, *_subquery_columns(query, documents)).join_from(
+        documents,
+        stored,
+        sa.and_(candidates, document_vector.op("@@")(stored.c.tsquery)),
+    )
+    return [(row[0], tuple(row[1:])) for row in conn.execute(statement)]
+
+
+@dataclasses.dataclass(frozen=True)
+class SyncTriggerEstimate:
+    """
+    Cost estimate returned by :func:`sync_trigger` when called with
+    ``dry_run=True``.
+    """
+
+    #: SQL statements that would be executed by :func:`sync_trigger`.
+    statements: list[str]
+
+    #: Number of rows that would be rewritten when updating the search vectors. This
+    #: is the planner estimate from ``pg_class.reltuples``, or an exact count if the
+    #: table has never been analyzed.
+    row_count: int
+
+    #: Size of the main relation of the table in bytes.
+    table_size: int
+
+    #: Size of the table in bytes, including TOAST data and indexes.
+    total_size: int
+
+    #: Rough estimate of the WAL volume in bytes generated by updating the rows.
+    #: Every row is rewritten, so this is approximated by the total size of the table.
+    estimated_wal_bytes: int
+
+    #: Number of rows the search vector expression was timed on.
+    sample_size: int
+
+    #: Time in seconds it took to compute the search vectors for the sample rows.
+    sample_duration: float
+
+    #: Approximate time in seconds it takes to update the search vectors of all rows,
+    #: extrapolated from :attr:`sample_duration`.
+    estimated_duration: float
+
+
+def suggest(
+    conn: Connection | Session,
+    column: Column[TSVectorType],
+    prefix: str,
+    limit: int = 10,
+    manager: SearchManager = search_manager,
+) -> list[tuple[str, int]]:
+    """
+    Return the lexemes of given search vector that start with given prefix, most
+    common first, for autocompleting search queries. The lexemes are read from the
+    lexeme dictionary of the search vector, so that short prefixes do not have to
+    be expanded using the GIN index of the search vector::
+
+        from sqlalchemy_searchable import suggest
+
+
+        suggest(session, Article.__table__.c.search_vector, "pyt", limit=5)
+
+    As the lexemes have been normalized by the regconfig of the search vector,
+    they may be stems of words rather than words, such as ``"postgr"``. Each of
+    them can be used as a search query that matches the rows it occurs in.
+
+    :param conn: SQLAlchemy Connection or Session object
+    :param column: TSVectorType typed column with the ``lexeme_dictionary`` option
+    :param prefix: the prefix of the lexemes
+    :param limit: maximum number of lexemes to return
+    :param manager: :class:`SearchManager` the search vector is registered in
+    :return:
+        list of tuples of the lexemes and the numbers of rows they occur in,
+        ordered by descending number of rows
+    """
+    options = manager.column_options(column)
+    construct = SQLConstruct(column, options=options)
+    if not construct.uses_lexeme_dictionary:
+        raise ValueError(
+            f"Search vector {column.table.name}.{column.name} does not have the "
+            "lexeme_dictionary option."
+        )
+    dictionary = sa.table(
+        construct.lexeme_dictionary_table_name,
+        sa.column("lexeme", sa.Text),
+        sa.column("ndoc", sa.BigInteger),
+        schema=construct.table.schema,
+    )
+    prefix = prefix.strip().lower()
+    if options.unaccent:
+        prefix = conn.execute(
+            sa.select(sa.func.immutable_unaccent(prefix))
+        ).scalar_one()
+    query = (
+        sa.select(dictionary.c.lexeme, dictionary.c.ndoc)
+        .where(dictionary.c.lexeme.startswith(prefix, autoescape=True))
+        .order_by(dictionary.c.ndoc.desc(), dictionary.c.lexeme)
+        .limit(limit)
+    )
+    return [(lexeme, ndoc) for lexeme, ndoc in conn.execute(query)]
+
+
+def limit_search_query(
+    search_query: str,
+    vector: Column[TSVectorType] | None = None,
+    manager: SearchManager = search_manager,
+) -> LimitedSearchQuery:
+    """
+    Apply the search query limits of given search vector, or the global search
+    query limits if no search vector is given, to given search query. The result
+    reports the exceeded limits, and can be passed to :func:`search`::
+
+        from sqlalchemy_searchable import limit_search_query, search
+
+
+        limited_query = limit_search_query(
+            user_input, Article.__table__.c.search_vector
+        )
+        query = search(sa.select(Article), limited_query)
+        if limited_query.applied_limits:
+            ...
+
+    :param search_query: the search query
+    :param vector: TSVectorType typed column whose search options have the limits
+    :param manager: :class:`SearchManager` the search vector is registered in
+    :raises SearchQueryRejected:
+        if the search query exceeds a limit whose action is ``"reject"``
+    """
+    options = manager.options if vector is None else manager.column_options(vector)
+    return _limit_search_query(search_query, options)
+
 
+def refresh_term_stats(
+    conn: Connection | Session,
+    column: Column[TSVectorType],
+    manager: SearchManager = search_manager,
+) -> frozenset[str]:
+    """
+    Recompute the common terms of given search vector from the statistics of its
+    lexemes given by ``ts_stat``, store them in the term stats table and cache
+    them in the process. This reads the search vectors of all the rows, so it is
+    meant to be run periodically, such as nightly, rather than for every write::
 
-class SearchManager:
-    def __init__(self, options: SearchOptions | None = None):
-        self.options = options or SearchOptions()
-        self.processed_columns: list[Column[TSVectorType]] = []
-        self.listeners: list[tuple[sa.Table, str, DDLElement]] = []
+        from sqlalchemy_searchable import refresh_term_stats
 
-    def inspect_columns(self, from_clause: FromClause) -> list[Column[TSVectorType]]:
-        """
-        Inspects all searchable columns for given class.
 
-        :param table: SQLAlchemy Table
-        """
-        return [
-            column
-            for column in from_clause.columns
-            if isinstance(column, Column) and isinstance(column.type, TSVectorType)
-        ]
+        with engine.begin() as conn:
+            refresh_term_stats(conn, Article.__table__.c.search_vector)
 
-    def append_index(self, column: Column[Any]) -> None:
-        sa.Index(
-            "_".join(("ix", column.table.name, column.name)),
-            column,
-            postgresql_using="gin",
+    :param conn: SQLAlchemy Connection or Session object
+    :param column:
+        TSVectorType typed column with the ``common_term_threshold`` search option
+    :param manager: :class:`SearchManager` the search vector is registered in
+    :return: the common lexemes
+    """
+    options = manager.column_options(column)
+    if options.common_term_threshold is None:
+        raise ValueError(
+            f"Search vector {column.table.name}.{column.name} does not have the "
+            "common_term_threshold option."
+        )
+    stats = _term_stats_table(SQLConstruct(column, options=options))
+    bind = conn.get_bind() if isinstance(conn, Session) else conn
+    vectors_query = str(sa.select(column).compile(dialect=bind.dialect))
+    lexemes = sa.func.ts_stat(vectors_query).table_valued("word", "ndoc")
+    row_count = (
+        sa.select(sa.func.count())
+        .select_from(column.table)
+        .where(column.is_not(None))
+        .scalar_subquery()
+    )
+    conn.execute(sa.delete(stats))
+    conn.execute(
+        sa.insert(stats).from_select(
+            ["lexeme", "ndoc"],
+            sa.select(lexemes.c.word, lexemes.c.ndoc).where(
+                lexemes.c.ndoc >= row_count * options.common_term_threshold
+            ),
         )
+    )
+    return load_term_stats(conn, column, manager)
 
-    def process_mapper(self, mapper: Mapper[Any], cls: type[Any]) -> None:
-        columns = self.inspect_columns(mapper.persist_selectable)
-        for column in columns:
-            if column in self.processed_columns:
-                continue
 
-            tsvector_type = cast(TSVectorType, column.type)
-            options = dataclasses.replace(self.options, **tsvector_type.options)
-            if options.auto_index:
-                self.append_index(column)
+def load_term_stats(
+    conn: Connection | Session,
+    column: Column[TSVectorType],
+    manager: SearchManager = search_manager,
+) -> frozenset[str]:
+    """
+    Load the common terms of given search vector from its term stats table into
+    the in-process cache used by :func:`search`, such as in the processes that do
+    not run :func:`refresh_term_stats` themselves.
+
+    :param conn: SQLAlchemy Connection or Session object
+    :param column:
+        TSVectorType typed column with the ``common_term_threshold`` search option
+    :param manager: :class:`SearchManager` the search vector is registered in
+    :return: the common lexemes
+    """
+    options = manager.column_options(column)
+    stats = _term_stats_table(SQLConstruct(column, options=options))
+    lexemes = frozenset(conn.execute(sa.select(stats.c.lexeme)).scalars())
+    manager.common_terms[column] = (time.monotonic(), lexemes)
+    return lexemes
+
+
+def _search_table_rows_sql(
+    construct: SQLConstruct,
+    *whereclause: ColumnElement[bool] | sa.TextClause,
+    table: sa.TableClause | None = None,
+) -> sa.Insert:
+    if table is None:
+        table = construct.table
+    primary_key = construct.primary_key
+    rows = sa.select(
+        *(table.c[name] for name in primary_key),
+        construct.search_vector_expression(table),
+    ).where(*whereclause)
+    insert = postgresql.insert(construct.vector_table).from_select(
+        primary_key + [construct.tsvector_column.name], rows
+    )
+    return insert.on_conflict_do_update(
+        index_elements=primary_key,
+        set_={
+            construct.tsvector_column.name: insert.excluded[
+                construct.tsvector_column.name
+            ]
+        },
+    )
 
-            self.processed_columns.append(column)
 
-    def add_listener(self, args: tuple[sa.Table, str, DDLElement]) -> None:
-        self.listeners.append(args)
-        event.listen(*args)
+def _sync_rows_sql(
+    constructs: Sequence[SQLConstruct],
+    table: sa.TableClause | None = None,
+) -> list[sa.Update | sa.Insert]:
+    """
+    Return the statements that update the search vectors of given constructs, which
+    share the same searched table, in every row of given table. The table defaults
+    to the searched table, and may be one of its partitions.
+    """
+    if table is None:
+        table = constructs[0].table
+    statements: list[sa.Update | sa.Insert] = []
+    values: dict[str, Any] = {}
+    for construct in constructs:
+        options = construct.search_options
+        if options.search_table:
+            # The rows of search tables are upserted directly.
+            statements.append(_search_table_rows_sql(construct, table=table))
+        elif options.cache_column_vectors:
+            # Clearing the cached column vectors forces them to be recomputed.
+            for name in construct.indexed_columns:
+                values[construct.column_vector_cache_name(name)] = None
+        else:
+            # A column=column update fires the search triggers of every row, as
+            # long as one indexed column of each search vector is included.
+            name = construct.indexed_columns[0]
+            values.setdefault(name, table.c[name])
+    if values:
+        statements.append(table.update().values(values))
+    return statements
 
-    def remove_listeners(self) -> None:
-        for listener in self.listeners:
-            event.remove(*listener)
-        self.listeners = []
 
-    def attach_ddl_listeners(self) -> None:
-        # Remove all previously added listeners, so that same listener don't
-        # get added twice in situations where class configuration happens in
-        # multiple phases (issue #31).
-        self.remove_listeners()
+def _partitions(conn: Connection, table: sa.Table) -> list[sa.TableClause]:
+    """
+    Return the leaf partitions of given table, or an empty list if the table is not
+    partitioned.
+    """
+    rows = conn.execute(
+        sa.text(
+            """SELECT namespace.nspname, class.relname
+            FROM pg_partition_tree(CAST(:table_name AS regclass)) AS tree
+            JOIN pg_class AS class ON class.oid = tree.relid
+            JOIN pg_namespace AS namespace ON namespace.oid = class.relnamespace
+            WHERE tree.isleaf AND tree.level > 0
+            ORDER BY namespace.nspname, class.relname"""
+        ),
+        {"table_name": conn.dialect.identifier_preparer.format_table(table)},
+    )
+    return [
+        sa.table(
+            name,
+            *(sa.column(column.name, column.type) for column in table.columns),
+            schema=schema,
+        )
+        for schema, name in rows
+    ]
 
-        for column in self.processed_columns:
-            # This sets up the trigger that keeps the tsvector column up to
-            # date.
-            tsvector_type = cast(TSVectorType, column.type)
-            if tsvector_type.columns:
-                table = column.table
-                options = dataclasses.replace(self.options, **tsvector_type.options)
-                if options.weights or vectorizer.contains_tsvector(column):
-                    self.add_listener(
-                        (
-                            table,
-                            "after_create",
-                            CreateSearchFunctionSQL(column, options=options),
-                        )
-                    )
-                    self.add_listener(
-                        (
-                            table,
-                            "after_drop",
-                            DropSearchFunctionSQL(column, options=options),
-                        )
-                    )
-                self.add_listener(
-                    (
-                        table,
-                        "after_create",
-                        CreateSearchTriggerSQL(column, options=options),
-                    )
-                )
 
+def _sync_partition_rows_sql(
+    conn: Connection, constructs: Sequence[SQLConstruct]
+) -> list[sa.Update | sa.Insert]:
+    # The rows of partitioned tables are updated one partition at a time.
+    partitions = _partitions(conn, constructs[0].table)
+    if not partitions:
+        return _sync_rows_sql(constructs)
+    return [
+        statement
+        for partition in partitions
+        for statement in _sync_rows_sql(constructs, partition)
+    ]
 
-search_manager = SearchManager()
+
+def _reflect_search_vector(
+    conn: Connection,
+    metadata: sa.MetaData,
+    table_name: str,
+    tsvector_column: str,
+    options: SearchOptions | None,
+    schema: str | None,
+) -> tuple[sa.Table, Column[Any]]:
+    if options is not None and options.related:
+        # The relationships to the related tables are inferred from the foreign keys
+        # of all the tables of the schema.
+        metadata.reflect(conn, schema=schema)
+    table = sa.Table(table_name, metadata, autoload_with=conn, schema=schema)
+    vector_table = table
+    if options is not None and options.search_table:
+        vector_table = sa.Table(
+            options.search_table_name.format(table=table_name, column=tsvector_column),
+            metadata,
+            autoload_with=conn,
+            schema=schema,
+        )
+    return table, getattr(vector_table.c, tsvector_column)
+
+
+def _estimate_sync_trigger(
+    conn: Connection,
+    table: sa.Table,
+    construct: SQLConstruct,
+    statements: list[DDLElement | sa.Update | sa.Insert],
+    update_rows: bool,
+    sample_size: int,
+) -> SyncTriggerEstimate:
+    # The sizes of partitioned tables are the sums of the sizes of their leaf
+    # partitions.
+    analyzed, reltuples, table_size, total_size = conn.execute(
+        sa.text(
+            """SELECT
+                coalesce(bool_and(reltuples >= 0), true),
+                coalesce(sum(reltuples), 0),
+                CAST(coalesce(sum(pg_relation_size(oid)), 0) AS BIGINT),
+                CAST(coalesce(sum(pg_total_relation_size(oid)), 0) AS BIGINT)
+            FROM pg_class
+            WHERE relkind <> 'p' AND oid IN (
+                SELECT relid
+                FROM pg_partition_tree(CAST(:table_name AS regclass))
+                WHERE isleaf
+                UNION
+                SELECT CAST(:table_name AS regclass)
+            )"""
+        ),
+        {"table_name": conn.dialect.identifier_preparer.format_table(table)},
+    ).one()
+    if analyzed:
+        row_count = int(reltuples)
+    else:
+        row_count = conn.execute(
+            sa.select(sa.func.count()).select_from(table)
+        ).scalar_one()
+
+    sample = sa.select(table).limit(sample_size).subquery()
+    started = time.perf_counter()
+    sampled_rows = len(
+        conn.execute(sa.select(construct.search_vector_expression(sample))).fetchall()
+    )
+    sample_duration = time.perf_counter() - started
+
+    if not update_rows:
+        row_count = 0
+    return SyncTriggerEstimate(
+        statements=[
+            str(statement.compile(dialect=conn.dialect)) for statement in statements
+        ],
+        row_count=row_count,
+        table_size=table_size,
+        total_size=total_size,
+        estimated_wal_bytes=total_size if row_count else 0,
+        sample_size=sampled_rows,
+        sample_duration=sample_duration,
+        estimated_duration=(
+            sample_duration / sampled_rows * row_count if sampled_rows else 0.0
+        ),
+    )
 
 
 def sync_trigger(
@@ -348,7 +3121,9 @@ def sync_trigger(
     options: SearchOptions | None = None,
     schema: str | None = None,
     update_rows: bool = True,
-) -> None:
+    dry_run: bool = False,
+    sample_size: int = 1000,
+) -> SyncTriggerEstimate | None:
     """Synchronize the search trigger and trigger function for the given table and
     search vector column. Internally, this function executes the following SQL
     queries:
@@ -427,6 +3202,21 @@ def sync_trigger(
 
         # ... same for downgrade
 
+    To see what a migration would do before running it, pass ``dry_run=True``. No
+    changes are made to the database; instead, a :class:`SyncTriggerEstimate` is
+    returned that contains the SQL statements that would be executed, the number of
+    rows that would be rewritten, the size of the table and the estimated WAL volume
+    and runtime::
+
+        estimate = sync_trigger(
+            conn,
+            'article',
+            'search_vector',
+            ['name', 'content'],
+            dry_run=True,
+        )
+        print(estimate.row_count, estimate.estimated_duration)
+
     :param conn: SQLAlchemy Connection object
     :param table_name: name of the table to apply search trigger syncing
     :param tsvector_column:
@@ -442,34 +3232,60 @@ def sync_trigger(
     :param update_rows:
         If set to False, the values in the vector column will remain unchanged
         until one of the indexed columns is updated.
+    :param dry_run:
+        If set to True, nothing is executed and a :class:`SyncTriggerEstimate` is
+        returned instead.
+    :param sample_size:
+        Number of rows the search vector expression is timed on when estimating the
+        runtime of a dry run.
     """
     if metadata is None:
         metadata = sa.MetaData()
-    table = sa.Table(
-        table_name,
-        metadata,
-        autoload_with=conn,
-        schema=schema,
+    table, column = _reflect_search_vector(
+        conn, metadata, table_name, tsvector_column, options, schema
     )
-    params = dict(
-        tsvector_column=getattr(table.c, tsvector_column),
+    params: dict[str, Any] = dict(
+        tsvector_column=column,
         indexed_columns=indexed_columns,
         options=options,
     )
-    classes = [
+    classes: list[type[DDLElement]] = [
         DropSearchTriggerSQL,
         DropSearchFunctionSQL,
         CreateSearchFunctionSQL,
         CreateSearchTriggerSQL,
     ]
-    for class_ in classes:
-        conn.execute(class_(**params))
-
+    if options is not None and options.queue_updates:
+        classes.insert(2, CreateSearchQueueSQL)
+    if options is not None and options.cache_column_vectors:
+        classes.insert(2, CreateColumnVectorCachesSQL)
+    if options is not None and options.related:
+        classes.append(CreateRelatedSearchTriggersSQL)
+    if options is not None and options.track_versions:
+        classes.append(CreateSearchVersionSQL)
+    if options is not None and (options.lexeme_dictionary or options.search_words):
+        classes.append(CreateLexemeDictionarySQL)
+    if options is not None and options.common_term_threshold is not None:
+        classes.append(CreateTermStatsSQL)
+    statements: list[DDLElement | sa.Update | sa.Insert] = [
+        class_(**params) for class_ in classes
+    ]
     if update_rows:
-        update_sql = table.update().values(
-            {indexed_columns[0]: sa.text(indexed_columns[0])}
+        statements.extend(_sync_partition_rows_sql(conn, [SQLConstruct(**params)]))
+
+    if dry_run:
+        return _estimate_sync_trigger(
+            conn,
+            table,
+            CreateSearchFunctionSQL(**params),
+            statements,
+            update_rows,
+            sample_size,
         )
-        conn.execute(update_sql)
+
+    for statement in statements:
+        conn.execute(statement)
+    return None
 
 
 def drop_trigger(
@@ -514,27 +3330,496 @@ def drop_trigger(
     """
     if metadata is None:
         metadata = sa.MetaData()
-    table = sa.Table(
-        table_name,
-        metadata,
-        autoload_with=conn,
-        schema=schema,
+    _, column = _reflect_search_vector(
+        conn, metadata, table_name, tsvector_column, options, schema
     )
-    params = dict(tsvector_column=getattr(table.c, tsvector_column), options=options)
-    classes = [
+    params = dict(tsvector_column=column, options=options)
+    classes: list[type[DDLElement]] = [
         DropSearchTriggerSQL,
         DropSearchFunctionSQL,
     ]
+    if options is not None and options.queue_updates:
+        classes.append(DropSearchQueueSQL)
+    if options is not None and options.related:
+        classes.append(DropRelatedSearchTriggersSQL)
+    if options is not None and options.track_versions:
+        classes.append(DropSearchVersionSQL)
+    if options is not None and (options.lexeme_dictionary or options.search_words):
+        classes.append(DropLexemeDictionarySQL)
+    if options is not None and options.common_term_threshold is not None:
+        classes.append(DropTermStatsSQL)
     for class_ in classes:
         conn.execute(class_(**params))
 
 
+def sync_all_triggers(
+    conn: Connection,
+    metadata: sa.MetaData,
+    manager: SearchManager = search_manager,
+    update_rows: bool = True,
+) -> list[Column[TSVectorType]]:
+    """
+    Synchronize the search triggers and trigger functions of all search vectors
+    defined in the tables of given metadata. This is the bulk version of
+    :func:`sync_trigger`: instead of reflecting each table separately, the existence
+    of all tables is checked with a single :meth:`sqlalchemy.MetaData.reflect` call
+    per schema, and the indexed columns and options of each search vector are taken
+    from the ``TSVectorType`` definitions registered in the :class:`SearchManager`.
+
+    All statements are executed using the given connection, and thus within its
+    transaction.
+
+    Example::
+
+        from alembic import op
+        from sqlalchemy_searchable import sync_all_triggers
+
+        from myapp.models import Base
+
+
+        def upgrade() -> None:
+            conn = op.get_bind()
+            sync_all_triggers(conn, Base.metadata)
+
+    Updating the search vectors of big tables can take a long time. The rows can
+    instead be updated after the transaction has been committed, one table per
+    connection in parallel, using :func:`update_search_vectors`::
+
+        with engine.begin() as conn:
+            columns = sync_all_triggers(conn, Base.metadata, update_rows=False)
+        update_search_vectors(engine, columns, max_workers=4)
+
+    :param conn: SQLAlchemy Connection object
+    :param metadata: SQLAlchemy metadata object of the searchable models
+    :param manager: :class:`SearchManager` the search vectors are registered in
+    :param update_rows:
+        If set to False, the values in the vector columns will remain unchanged
+        until one of the indexed columns is updated.
+    :return: the synchronized search vector columns
+    """
+    columns = [
+        column
+        for column in manager.processed_columns
+        if column.table.metadata is metadata and cast(TSVectorType, column.type).columns
+    ]
+    table_names: dict[str | None, list[str]] = {}
+    for column in columns:
+        names = table_names.setdefault(column.table.schema, [])
+        if column.table.name not in names:
+            names.append(column.table.name)
+    for schema, names in table_names.items():
+        metadata.reflect(conn, schema=schema, only=names)
+
+    for column in columns:
+        options = manager.column_options(column)
+        conn.execute(DropSearchTriggerSQL(column, options=options))
+        conn.execute(DropSearchFunctionSQL(column, options=options))
+        if options.queue_updates:
+            conn.execute(CreateSearchQueueSQL(column, options=options))
+        if options.cache_column_vectors:
+            conn.execute(CreateColumnVectorCachesSQL(column, options=options))
+        if SQLConstruct(column, options=options).uses_search_function:
+            conn.execute(CreateSearchFunctionSQL(column, options=options))
+        conn.execute(CreateSearchTriggerSQL(column, options=options))
+        if options.related:
+            conn.execute(CreateRelatedSearchTriggersSQL(column, options=options))
+        if options.track_versions:
+            conn.execute(CreateSearchVersionSQL(column, options=options))
+        if options.lexeme_dictionary or options.search_words:
+            conn.execute(CreateLexemeDictionarySQL(column, options=options))
+        if options.common_term_threshold is not None:
+            conn.execute(CreateTermStatsSQL(column, options=options))
+
+    if update_rows:
+        for update_sql in _update_rows_sql_by_table(conn, columns, manager):
+            conn.execute(update_sql)
+    return columns
+
+
+def _update_rows_sql_by_table(
+    conn: Connection,
+    columns: Sequence[Column[TSVectorType]],
+    manager: SearchManager,
+) -> list[sa.Update | sa.Insert]:
+    # The search vectors of each table are updated together, so that every row is
+    # rewritten only once.
+    tables: dict[sa.Table, list[SQLConstruct]] = {}
+    for column in columns:
+        construct = SQLConstruct(column, options=manager.column_options(column))
+        tables.setdefault(construct.table, []).append(construct)
+    return [
+        statement
+        for constructs in tables.values()
+        for statement in _sync_partition_rows_sql(conn, constructs)
+    ]
+
+
+def update_search_vectors(
+    engine: sa.Engine,
+    columns: Sequence[Column[TSVectorType]],
+    max_workers: int = 1,
+    manager: SearchManager = search_manager,
+) -> None:
+    """
+    Update the values of given search vector columns by rewriting every row of
+    their tables, firing the search triggers. Each table is updated in its own
+    transaction using its own connection. Partitioned tables are updated one
+    partition at a time, each in its own transaction. With ``max_workers`` greater
+    than one, the tables and partitions are updated in parallel.
+
+    :param engine: SQLAlchemy Engine object
+    :param columns: TSVectorType typed columns to update
+    :param max_workers:
+        maximum number of tables and partitions to update at the same time
+    :param manager: :class:`SearchManager` the search vectors are registered in
+    """
+
+    def update(update_sql: sa.Update | sa.Insert) -> None:
+        with engine.begin() as conn:
+            conn.execute(update_sql)
+
+    with engine.connect() as conn:
+        update_sqls = _update_rows_sql_by_table(conn, columns, manager)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for future in [
+            executor.submit(update, update_sql) for update_sql in update_sqls
+        ]:
+            future.result()
+
+
+@dataclasses.dataclass(frozen=True)
+class SchemaSyncResult:
+    """
+    Result of :func:`sync_trigger_in_schemas`.
+    """
+
+    #: Names of the schemas whose search trigger was synchronized successfully.
+    succeeded: list[str] = dataclasses.field(default_factory=list)
+
+    #: Dictionary mapping the names of the schemas whose search trigger could not be
+    #: synchronized to the raised exception.
+    failed: dict[str, Exception] = dataclasses.field(default_factory=dict)
+
+
+def sync_trigger_in_schemas(
+    engine: sa.Engine,
+    schemas: Sequence[str],
+    table_name: str,
+    tsvector_column: str,
+    indexed_columns: list[str],
+    metadata: sa.MetaData | None = None,
+    options: SearchOptions | None = None,
+    template_schema: str | None = None,
+    update_rows: bool = True,
+    max_workers: int = 4,
+) -> SchemaSyncResult:
+    """
+    Synchronize the search trigger of a table that exists with the same shape in
+    many schemas, such as in schema-per-tenant setups. This is equivalent to calling
+    :func:`sync_trigger` for each schema, except that:
+
+    - The table is reflected only once, from ``template_schema``.
+    - The search function is created once and shared by the triggers of all the
+      schemas.
+    - The schemas are synchronized concurrently, each in its own transaction, using
+      at most ``max_workers`` connections at a time. The DDL is applied to each
+      schema with the ``schema_translate_map`` execution option.
+    - A failure in one schema does not stop the others from being synchronized.
+
+    Example::
+
+        from sqlalchemy_searchable import sync_trigger_in_schemas
+
+
+        result = sync_trigger_in_schemas(
+            engine,
+            ['tenant_1', 'tenant_2', 'tenant_3'],
+            'article',
+            'search_vector',
+            ['name', 'content'],
+        )
+        for schema, error in result.failed.items():
+            print(f'Could not sync {schema}: {error}')
+
+    :param engine: SQLAlchemy Engine object
+    :param schemas: names of the schemas to synchronize the search trigger in
+    :param table_name: name of the table to apply search trigger syncing
+    :param tsvector_column:
+        TSVector typed column which is used as the search index column
+    :param indexed_columns:
+        Full text indexed column names as a list
+    :param metadata:
+        Optional SQLAlchemy metadata object that is being used for autoloaded
+        Table. If None is given, then a new MetaData object is initialized within
+        this function.
+    :param options: :class:`SearchOptions` instance for configuration
+    :param template_schema:
+        The schema the table is reflected from. Defaults to the first schema of
+        ``schemas``.
+    :param update_rows:
+        If set to False, the values in the vector column will remain unchanged
+        until one of the indexed columns is updated.
+    :param max_workers: maximum number of schemas to synchronize at the same time
+    """
+    if options is not None and options.related:
+        raise ValueError(
+            "Related columns are not supported by sync_trigger_in_schemas, as the "
+            "search function refers to the related tables of a single schema."
+        )
+    result = SchemaSyncResult()
+    if not schemas:
+        return result
+    if template_schema is None:
+        template_schema = schemas[0]
+    if metadata is None:
+        metadata = sa.MetaData()
+
+    with engine.begin() as conn:
+        _, column = _reflect_search_vector(
+            conn, metadata, table_name, tsvector_column, options, template_schema
+        )
+        params: dict[str, Any] = dict(
+            tsvector_column=column,
+            indexed_columns=indexed_columns,
+            options=options,
+        )
+        conn.execute(CreateSearchFunctionSQL(**params))
+        if options is not None and options.search_words:
+            # Creating the extension concurrently in the schemas could fail.
+            conn.execute(sa.text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
+    statements: list[DDLElement | sa.Update | sa.Insert] = [
+        DropSearchTriggerSQL(**params),
+        CreateSearchTriggerSQL(**params),
+    ]
+    if options is not None and options.queue_updates:
+        statements.insert(1, CreateSearchQueueSQL(**params))
+    if options is not None and options.cache_column_vectors:
+        statements.insert(1, CreateColumnVectorCachesSQL(**params))
+    if options is not None and options.track_versions:
+        statements.append(CreateSearchVersionSQL(**params))
+    if options is not None and (options.lexeme_dictionary or options.search_words):
+        statements.append(CreateLexemeDictionarySQL(**params))
+    if options is not None and options.common_term_threshold is not None:
+        statements.append(CreateTermStatsSQL(**params))
+    if update_rows:
+        statements.extend(_sync_rows_sql([SQLConstruct(**params)]))
+
+    def sync(schema: str) -> None:
+        with engine.connect() as conn:
+            conn = conn.execution_options(
+                schema_translate_map={template_schema: schema}
+            )
+            with conn.begin():
+                for statement in statements:
+                    conn.execute(statement)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {schema: executor.submit(sync, schema) for schema in schemas}
+        for schema, future in futures.items():
+            error = future.exception()
+            if error is None:
+                result.succeeded.append(schema)
+            elif isinstance(error, Exception):
+                result.failed[schema] = error
+            else:
+                raise error
+    return result
+
+
+@contextmanager
+def deferred_search_vectors(
+    conn: Connection,
+    entity: Any,
+    manager: SearchManager = search_manager,
+) -> Iterator[None]:
+    """
+    Defer the computation of search vectors during bulk loads. Within the context,
+    the search triggers of given model or table are disabled, so that inserted and
+    updated rows do not pay for vectorizing their indexed columns one row at a time.
+    When the context exits, the search vectors of all the rows written within the
+    context are computed with a single set-based ``UPDATE`` and the triggers are
+    enabled again.
+
+    Example::
+
+        from sqlalchemy_searchable import deferred_search_vectors
+
+
+        with session.begin():
+            conn = session.connection()
+            with deferred_search_vectors(conn, Article):
+                conn.execute(sa.insert(Article), rows)
+
+    The triggers are disabled using ``ALTER TABLE ... DISABLE TRIGGER``, which locks
+    the table against concurrent writes until the end of the transaction, so rows
+    written by other transactions never miss their search vectors. The primary keys
+    of the rows written within the context, including the rows written within
+    savepoints, are recorded into a temporary table by statement level triggers,
+    and so the table must have a primary key.
+
+    The context is run within a savepoint. If an exception is raised within the
+    context, the savepoint is rolled back, which undoes the rows written within the
+    context and enables the triggers again.
+
+    :param conn: SQLAlchemy Connection object
+    :param entity: mapped class or SQLAlchemy Table whose search vectors to defer
+    :param manager:
+        :class:`SearchManager` the search vectors are registered in. This is used
+        for determining the search options of the search vectors.
+    """
+    if isinstance(entity, sa.Table):
+        table = entity
+        columns = manager.inspect_columns(entity)
+    else:
+        table = sa.inspect(entity).persist_selectable
+        columns = inspect_search_vectors(entity)
+    columns += manager.search_table_vectors(table)
+    constructs = [
+        SQLConstruct(column, options=manager.column_options(column))
+        for column in columns
+        if cast(TSVectorType, column.type).columns
+    ]
+    if not constructs:
+        yield
+        return
+
+    preparer = conn.dialect.identifier_preparer
+    primary_key = constructs[0].primary_key
+    # The temporary table is shared by all the schemas of the session, so its name
+    # includes the schema of the table to keep same-named tables apart.
+    prefix = f"{table.schema}_{table.name}" if table.schema else table.name
+    rows_table = sa.table(
+        f"{prefix}_deferred_rows",
+        *(sa.column(name) for name in primary_key),
+        schema="pg_temp",
+    )
+    trigger_names = [
+        preparer.quote(f"{prefix}_deferred_{operation}")
+        for operation in ("insert", "update")
+    ]
+    trigger_args = ", ".join(
+        "'" + name.replace("'", "''") + "'" for name in [rows_table.name, *primary_key]
+    )
+    table_name = preparer.format_table(table)
+
+    savepoint = conn.begin_nested()
+    try:
+        for construct in constructs:
+            conn.execute(
+                DisableSearchTriggerSQL(
+                    construct.tsvector_column, options=construct.search_options
+                )
+            )
+        conn.execute(
+            sa.text(
+                f"CREATE TEMP TABLE {preparer.format_table(rows_table)} AS SELECT "
+                + ", ".join(preparer.quote(name) for name in primary_key)
+                + f" FROM {table_name} WITH NO DATA"
+            )
+        )
+        for trigger_name, operation in zip(trigger_names, ("INSERT", "UPDATE")):
+            conn.execute(
+                sa.text(
+                    f"CREATE TRIGGER {trigger_name} AFTER {operation} ON {table_name}"
+                    " REFERENCING NEW TABLE AS new_table FOR EACH STATEMENT"
+                    f" EXECUTE PROCEDURE deferred_search_vectors_record({trigger_args})"
+                )
+            )
+
+        yield
+
+        for trigger_name in trigger_names:
+            conn.execute(sa.text(f"DROP TRIGGER {trigger_name} ON {table_name}"))
+        written = sa.tuple_(*(table.c[name] for name in primary_key)).in_(
+            sa.select(rows_table)
+        )
+        tables: dict[sa.Table, list[SQLConstruct]] = {}
+        for construct in constructs:
+            if construct.search_options.search_table:
+                conn.execute(_search_table_rows_sql(construct, written))
+                continue
+            tables.setdefault(construct.table, []).append(construct)
+        for searched_table, table_constructs in tables.items():
+            conn.execute(
+                searched_table.update()
+                .values(
+                    {
+                        construct.tsvector_column: construct.search_vector_expression(
+                            searched_table
+                        )
+                        for construct in table_constructs
+                    }
+                )
+                .where(written)
+            )
+        for construct in constructs:
+            conn.execute(
+                EnableSearchTriggerSQL(
+                    construct.tsvector_column, options=construct.search_options
+                )
+            )
+        conn.execute(sa.text(f"DROP TABLE {preparer.format_table(rows_table)}"))
+    except BaseException:
+        savepoint.rollback()
+        raise
+    savepoint.commit()
+
+
+def search_vector_truncation(
+    conn: Connection,
+    column: Column[TSVectorType],
+    manager: SearchManager = search_manager,
+) -> dict[str, int]:
+    """
+    Return the number of rows whose indexed column values are truncated by the
+    :attr:`~SearchOptions.max_characters` and :attr:`~SearchOptions.max_words`
+    options of given search vector. The rows are counted with a single query that
+    scans the whole table.
+
+    Example::
+
+        from sqlalchemy_searchable import search_vector_truncation
+
+
+        search_vector_truncation(conn, Article.__table__.c.search_vector)
+        # {'content': 12}
+
+    :param conn: SQLAlchemy Connection object
+    :param column: TSVectorType typed column
+    :param manager: :class:`SearchManager` the search vector is registered in
+    :return:
+        dictionary mapping the names of the indexed columns with size limits to the
+        number of rows whose values are truncated
+    """
+    construct = SQLConstruct(column, options=manager.column_options(column))
+    table = construct.table
+    counts = {}
+    for column_name in construct.indexed_columns:
+        value = construct.column_value(
+            table.c[column_name], cast(ColumnClause[Any], table.c[column_name])
+        )
+        conditions = construct.truncation_conditions(value, column_name)
+        if conditions:
+            counts[column_name] = sa.func.count().filter(sa.or_(*conditions))
+    if not counts:
+        return {}
+    row = conn.execute(sa.select(*counts.values()).select_from(table)).one()
+    return dict(zip(counts, row))
+
+
 path = os.path.dirname(os.path.abspath(__file__))
 
 
 with open(os.path.join(path, "expressions.sql")) as file:
     sql_expressions = DDL(file.read())  # type: ignore[no-untyped-call]
 
+# The immutable_unaccent function is created once the unaccent extension exists, as
+# it references the schema of the extension.
+create_unaccent_sql = (
+    "CREATE EXTENSION IF NOT EXISTS unaccent; SELECT create_immutable_unaccent()"
+)
+
 
 def make_searchable(
     metadata: sa.MetaData,
@@ -0,0 +1,253 @@
+"""
+Cache of search results, for search vectors that have the
+:attr:`~sqlalchemy_searchable.SearchOptions.track_versions` option enabled.
+
+The cache stores the primary keys of the rows found by a search. Each cached result
+is keyed by the version of the searched table, which is incremented by a trigger
+whenever the table is written to, so that a cache hit only costs reading the single
+row of the version table instead of running the search query::
+
+    from sqlalchemy_searchable.cache import LRUCache, SearchCache
+
+
+    class Article(Base):
+        __tablename__ = 'article'
+
+        id: Mapped[int] = mapped_column(primary_key=True)
+        name: Mapped[str]
+        search_vector: Mapped[TSVectorType] = mapped_column(
+            TSVectorType('name', track_versions=True)
+        )
+
+
+    cache = SearchCache(LRUCache(maxsize=10000, ttl=300))
+
+    article_ids = cache.search_ids(
+        session,
+        sa.select(Article).where(Article.is_published),
+        'first article',
+        limit=20,
+    )
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
+from typing import Any, Protocol
+
+import sqlalchemy as sa
+from sqlalchemy import Column, Connection, Select
+from sqlalchemy.orm import Session
+from sqlalchemy_utils import TSVectorType
+
+from . import (
+    _default_search_vector,
+    search,
+    search_manager,
+    SearchManager,
+    SQLConstruct,
+)
+
+
+class SearchCacheBackend(Protocol):
+    """
+    Storage of cached search results used by :class:`SearchCache`. Any object with
+    these methods can be used as a backend, such as a wrapper of a Redis client.
+    """
+
+    def get(self, key: str) -> list[Any] | None:
+        """Return the cached value of given key, or None if it is not cached."""
+
+    def set(self, key: str, value: list[Any]) -> None:
+        """Cache given value with given key."""
+
+
+class LRUCache:
+    """
+    Thread-safe in-process cache backend that evicts the least recently used values
+    when it is full.
+
+    :param maxsize: maximum number of cached values
+    :param ttl:
+        number of seconds after which cached values expire, or None if they do not
+        expire
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float | None = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._values: OrderedDict[str, tuple[float, list[Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> list[Any] | None:
+        with self._lock:
+            try:
+                cached_at, value = self._values[key]
+            except KeyError:
+                return None
+            if self.ttl is not None and time.monotonic() - cached_at > self.ttl:
+                del self._values[key]
+                return None
+            self._values.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: list[Any]) -> None:
+        with self._lock:
+            self._values[key] = (time.monotonic(), value)
+            self._values.move_to_end(key)
+            while len(self._values) > self.maxsize:
+                self._values.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached values."""
+        with self._lock:
+            self._values.clear()
+
+
+def _search_construct(
+    column: Column[TSVectorType], manager: SearchManager
+) -> SQLConstruct:
+    options = manager.column_options(column)
+    if not options.track_versions:
+        raise ValueError(
+            f"Search vector {column.table.name}.{column.name} does not have "
+            "version tracking enabled."
+        )
+    return SQLConstruct(column, options=options)
+
+
+def _version_table(construct: SQLConstruct) -> sa.TableClause:
+    return sa.table(
+        construct.search_version_table_name,
+        sa.column("version"),
+        schema=construct.table.schema,
+    )
+
+
+def search_version(
+    conn: Connection | Session,
+    column: Column[TSVectorType],
+    manager: SearchManager = search_manager,
+) -> int:
+    """
+    Return the current version of the table searched using given search vector.
+
+    :param conn: SQLAlchemy Connection or Session object
+    :param column: TSVectorType typed column with version tracking enabled
+    :param manager: :class:`~sqlalchemy_searchable.SearchManager` the search vector
+        is registered in
+    """
+    version_table = _version_table(_search_construct(column, manager))
+    return int(conn.execute(sa.select(version_table.c.version)).scalar_one())
+
+
+class SearchCache:
+    """
+    Cache of the primary keys of the rows found by
+    :func:`~sqlalchemy_searchable.search`.
+
+    :param backend:
+        :class:`SearchCacheBackend` to store the cached results in. Defaults to an
+        :class:`LRUCache`.
+    :param manager: :class:`~sqlalchemy_searchable.SearchManager` the search
+        vectors are registered in
+    """
+
+    def __init__(
+        self,
+        backend: SearchCacheBackend | None = None,
+        manager: SearchManager = search_manager,
+    ):
+        self.backend: SearchCacheBackend = (
+            backend if backend is not None else LRUCache()
+        )
+        self.manager = manager
+
+    def search_ids(
+        self,
+        conn: Connection | Session,
+        query: Select[Any],
+        search_query: str,
+        vector: Column[TSVectorType] | None = None,
+        regconfig: str | Sequence[str] | None = None,
+        sort: bool = False,
+        limit: int | None = None,
+    ) -> list[Any]:
+        """
+        Return the primary keys of the rows of given query that match given search
+        query, using the cached result if the searched table has not been written
+        to since it was cached.
+
+        The cache key is built from the whitespace normalized search query, the
+        search vector, the regconfig and the SQL and parameters of the searched
+        query, so that queries with different filters are cached separately.
+        Searches within transactions that have written to the database, including
+        writes within savepoints, bypass the cache.
+
+        :param conn: SQLAlchemy Connection or Session object
+        :param query: the query to search
+        :param search_query: the search query
+        :param vector: search vector to use, which has to have version tracking
+            enabled
+        :param regconfig: postgresql regconfig or list of regconfigs to be used
+        :param sort: Order the results by relevance.
+        :param limit: maximum number of primary keys to return
+        :return:
+            list of primary keys, which are scalars for tables with a single
+            primary key column and tuples otherwise
+        """
+        if vector is None:
+            vector = _default_search_vector(query, self.manager)
+        construct = _search_construct(vector, self.manager)
+        primary_key = list(construct.table.primary_key.columns)
+        statement = search(
+            query,
+            " ".join(search_query.split()),
+            vector=vector,
+            regconfig=regconfig,
+            sort=sort,
+            manager=self.manager,
+        ).with_only_columns(*primary_key, maintain_column_froms=True)
+        if limit is not None:
+            statement = statement.limit(limit)
+
+        version_table = _version_table(construct)
+        version, written = conn.execute(
+            sa.select(
+                version_table.c.version,
+                sa.func.pg_current_xact_id_if_assigned().is_not(None),
+            )
+        ).one()
+        bind = conn.get_bind() if isinstance(conn, Session) else conn
+        compiled = statement.compile(dialect=bind.dialect)
+        parameters = sorted(
+            (name, repr(value)) for name, value in compiled.params.items()
+        )
+        key = hashlib.sha256(
+            repr(
+                (
+                    construct.table.schema,
+                    construct.search_version_table_name,
+                    version,
+                    str(compiled),
+                    parameters,
+                )
+            ).encode()
+        ).hexdigest()
+
+        # The current transaction has written to the database, possibly to the
+        # searched table within a savepoint, and may still be rolled back. Its
+        # results are neither cached nor read from the cache, as the version may be
+        # reused by another transaction.
+        ids = None if written else self.backend.get(key)
+        if ids is None:
+            rows = conn.execute(statement).all()
+            if len(primary_key) == 1:
+                ids = [row[0] for row in rows]
+            else:
+                ids = [tuple(row) for row in rows]
+            if not written:
+                self.backend.set(key, ids)
+        return ids
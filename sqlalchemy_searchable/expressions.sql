@@ -25,3 +25,195 @@ CREATE OR REPLACE FUNCTION parse_websearch(search_query text)
 RETURNS tsquery AS $$
 SELECT parse_websearch('pg_catalog.simple', search_query);
 $$ LANGUAGE SQL IMMUTABLE;
+
+
+CREATE OR REPLACE FUNCTION remove_prefixes(search_tsquery tsquery, min_length integer)
+RETURNS tsquery AS $$
+-- Matches the lexemes shorter than min_length exactly instead of as prefixes, or
+-- all lexemes if min_length is null.
+SELECT
+    coalesce(
+        string_agg(
+            (
+                CASE
+                    WHEN right(words.word, 2) = ':*' AND (
+                        min_length IS NULL
+                        OR length(
+                            replace(substring(words.word FROM '''(.*)'''), '''''', '''')
+                        ) < min_length
+                    ) THEN left(words.word, -2)
+                    ELSE words.word
+                END
+            ),
+            ' '
+        ),
+        ''
+    )::tsquery
+FROM regexp_split_to_table(search_tsquery::text, ' ') AS words(word)
+$$ LANGUAGE SQL IMMUTABLE;
+
+
+CREATE OR REPLACE FUNCTION tsquery_terms(query tsquery)
+RETURNS text[] AS $$
+SELECT coalesce(array_agg(DISTINCT replace(match[1], '''''', '''')), '{}')
+FROM regexp_matches(
+    querytree(query),
+    '''((?:[^'']|'''')*)''',
+    'g'
+) AS match
+$$ LANGUAGE SQL IMMUTABLE;
+
+
+CREATE OR REPLACE FUNCTION tsvector_prefixes(vector tsvector)
+RETURNS text[] AS $$
+SELECT coalesce(array_agg(DISTINCT left(lexeme, length)), '{}')
+FROM unnest(tsvector_to_array(vector)) AS lexeme,
+    generate_series(1, length(lexeme)) AS length
+$$ LANGUAGE SQL IMMUTABLE;
+
+
+CREATE OR REPLACE FUNCTION search_version_update()
+RETURNS TRIGGER AS $$
+BEGIN
+    EXECUTE 'UPDATE ' || quote_ident(TG_TABLE_SCHEMA) || '.'
+        || quote_ident(TG_ARGV[0]) || ' SET version = version + 1';
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION deferred_search_vectors_record()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- The primary key of each written row is recorded into a temporary table,
+    -- which is rolled back along with the rows it records.
+    EXECUTE 'INSERT INTO pg_temp.' || quote_ident(TG_ARGV[0]) || ' SELECT '
+        || (SELECT string_agg(quote_ident(name), ', ') FROM unnest(TG_ARGV[1:]) AS name)
+        || ' FROM new_table';
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION lexeme_dictionary_update()
+RETURNS TRIGGER AS $$
+DECLARE
+    dictionary text := quote_ident(TG_TABLE_SCHEMA) || '.' || quote_ident(TG_ARGV[0]);
+    lexemes text := 'unnest(tsvector_to_array(' || quote_ident(TG_ARGV[1]) || '))';
+    changes text;
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        EXECUTE 'TRUNCATE ' || dictionary;
+        RETURN NULL;
+    ELSIF TG_OP = 'INSERT' THEN
+        changes := 'SELECT ' || lexemes || ' AS lexeme, 1 AS delta FROM new_table';
+    ELSIF TG_OP = 'DELETE' THEN
+        changes := 'SELECT ' || lexemes || ' AS lexeme, -1 AS delta FROM old_table';
+    ELSE
+        changes := 'SELECT ' || lexemes || ' AS lexeme, 1 AS delta FROM new_table'
+            || ' UNION ALL SELECT ' || lexemes || ', -1 FROM old_table';
+    END IF;
+    -- The lexemes are upserted in order, so that concurrent statements lock the
+    -- rows of the dictionary in the same order.
+    EXECUTE 'INSERT INTO ' || dictionary || ' AS d (lexeme, ndoc)'
+        || ' SELECT lexeme, sum(delta) FROM (' || changes || ') AS changes'
+        || ' GROUP BY lexeme HAVING sum(delta) <> 0 ORDER BY lexeme'
+        || ' ON CONFLICT (lexeme) DO UPDATE SET ndoc = d.ndoc + excluded.ndoc';
+    IF TG_OP <> 'INSERT' THEN
+        EXECUTE 'DELETE FROM ' || dictionary || ' WHERE ndoc <= 0'
+            || ' AND lexeme IN (SELECT ' || lexemes || ' FROM old_table)';
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION drop_lexemes(search_tsquery tsquery, lexemes text[])
+RETURNS tsquery AS $$
+DECLARE
+    result tsquery := search_tsquery;
+    lexeme text;
+    target tsquery;
+BEGIN
+    FOREACH lexeme IN ARRAY coalesce(lexemes, '{}') LOOP
+        target := (
+            '''' || replace(replace(lexeme, '\', '\\'), '''', '''''') || ''''
+        )::tsquery;
+        CONTINUE WHEN NOT result @> target;
+        -- Dropping a negated lexeme would broaden the search instead of narrowing
+        -- it, so lexemes that are also negated are kept.
+        CONTINUE WHEN numnode(ts_rewrite(result, !! target, '')) <> numnode(result);
+        result := ts_rewrite(result, target, '');
+    END LOOP;
+    -- A query without any lexemes left, or with only negated lexemes left, matches
+    -- nearly every row and cannot use the GIN index.
+    IF numnode(result) = 0 OR querytree(result) = 'T' THEN
+        RETURN search_tsquery;
+    END IF;
+    RETURN result;
+END
+$$ LANGUAGE plpgsql IMMUTABLE PARALLEL SAFE;
+
+
+CREATE OR REPLACE FUNCTION fuzzy_websearch(
+    config regconfig,
+    search_query text,
+    words regclass
+)
+RETURNS tsquery AS $$
+DECLARE
+    corrected_query tsquery := parse_websearch(config, search_query);
+    term text;
+    matched boolean;
+    correction text;
+BEGIN
+    FOREACH term IN ARRAY tsquery_terms(corrected_query) LOOP
+        EXECUTE 'SELECT EXISTS (SELECT FROM ' || words || ' WHERE lexeme LIKE $1)'
+            INTO matched
+            USING replace(
+                replace(replace(term, '\', '\\'), '_', '\_'), '%%', '\%%'
+            ) || '%%';
+        IF NOT matched THEN
+            EXECUTE 'SELECT lexeme FROM ' || words || ' WHERE lexeme %% $1'
+                || ' ORDER BY similarity(lexeme, $1) DESC, lexeme LIMIT 1'
+                INTO correction
+                USING term;
+            IF correction IS NOT NULL THEN
+                corrected_query := ts_rewrite(
+                    corrected_query,
+                    (quote_literal(term) || ':*')::tsquery,
+                    (quote_literal(correction) || ':*')::tsquery
+                );
+            END IF;
+        END IF;
+    END LOOP;
+    RETURN corrected_query;
+END
+$$ LANGUAGE plpgsql STABLE;
+
+
+CREATE OR REPLACE FUNCTION create_immutable_unaccent()
+RETURNS void AS $$
+DECLARE
+    extension_schema text;
+BEGIN
+    -- unaccent() is only STABLE, as it looks up its dictionary using the
+    -- search_path. The function and its dictionary are therefore referenced using
+    -- the schema of the extension, so that the wrapper is truly IMMUTABLE and also
+    -- works under the restricted search_path of index builds, REINDEX and
+    -- pg_restore.
+    SELECT quote_ident(nspname) INTO extension_schema
+    FROM pg_extension JOIN pg_namespace ON pg_namespace.oid = extnamespace
+    WHERE extname = 'unaccent';
+    IF NOT FOUND THEN
+        RETURN;
+    END IF;
+    EXECUTE 'CREATE OR REPLACE FUNCTION immutable_unaccent(value text)'
+        || ' RETURNS text AS $body$ SELECT ' || extension_schema || '.unaccent('
+        || quote_literal(extension_schema || '.unaccent') || '::regdictionary, value)'
+        || ' $body$ LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE';
+END
+$$ LANGUAGE plpgsql;
+
+
+SELECT create_immutable_unaccent();
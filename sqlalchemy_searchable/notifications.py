@@ -0,0 +1,153 @@
+"""
+Consumer of the notifications sent by the search triggers of search vectors that
+have the :attr:`~sqlalchemy_searchable.SearchOptions.notify_channel` option set.
+
+The notifications can be used for keeping caches and external indexes of searchable
+rows up to date without polling the tables for changes::
+
+    from sqlalchemy_searchable.notifications import listen_search_vector_changes
+
+
+    class Article(Base):
+        __tablename__ = 'article'
+
+        id: Mapped[int] = mapped_column(primary_key=True)
+        name: Mapped[str]
+        search_vector: Mapped[TSVectorType] = mapped_column(
+            TSVectorType('name', notify_channel='search_vector_changes')
+        )
+
+
+    def reindex(changes):
+        article_ids = [change.key['id'] for change in changes]
+        ...
+
+
+    listen_search_vector_changes(engine, 'search_vector_changes', reindex)
+
+The notifications are delivered when the writing transaction commits. As
+PostgreSQL does not store notifications, the changes made while no consumer is
+listening are not delivered. The consumer requires the psycopg2 driver.
+"""
+
+import dataclasses
+import json
+import select
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+import sqlalchemy as sa
+
+
+@dataclasses.dataclass(frozen=True)
+class SearchVectorChange:
+    """
+    A row whose search vector has been computed, passed to the callback of
+    :func:`listen_search_vector_changes`.
+    """
+
+    #: Schema of the searched table.
+    schema: str
+
+    #: Name of the searched table.
+    table: str
+
+    #: Primary key of the row, as a dictionary of column names and values.
+    key: dict[str, Any]
+
+
+def _parse_change(payload: str) -> SearchVectorChange:
+    data = json.loads(payload)
+    return SearchVectorChange(
+        schema=data["schema"], table=data["table"], key=data["key"]
+    )
+
+
+def listen_search_vector_changes(
+    engine: sa.Engine,
+    channel: str,
+    callback: Callable[[list[SearchVectorChange]], None],
+    max_batch_size: int = 1000,
+    debounce: float = 0.1,
+    max_delay: float = 1.0,
+    poll_interval: float = 1.0,
+    stop: threading.Event | None = None,
+) -> None:
+    """
+    Listen to the notifications of given channel until ``stop`` is set, and pass
+    the changed rows to given callback in batches.
+
+    A batch is passed to the callback once no notifications have been received for
+    ``debounce`` seconds, once ``max_delay`` seconds have passed since its first
+    notification was received or once it has ``max_batch_size`` changes, whichever
+    happens first. Each changed row occurs only once in a batch, even if it has been
+    changed many times. The pending changes are passed to the callback when the
+    listener is stopped.
+
+    The notifications are received using a dedicated connection in autocommit mode,
+    which is closed when the listener is stopped.
+
+    :param engine: SQLAlchemy Engine object
+    :param channel: the notification channel given as the ``notify_channel`` option
+    :param callback: function that is called with each batch of changes
+    :param max_batch_size: maximum number of changes in a batch
+    :param debounce:
+        number of seconds to wait for more notifications before passing a batch to
+        the callback
+    :param max_delay:
+        maximum number of seconds to delay the changes of a batch by
+    :param poll_interval:
+        maximum number of seconds to wait for notifications before checking whether
+        ``stop`` has been set
+    :param stop: event that stops the listener when set
+    """
+    if stop is None:
+        stop = threading.Event()
+    connection = engine.raw_connection()
+    dbapi_connection: Any = connection.driver_connection
+    channel = engine.dialect.identifier_preparer.quote(channel)
+    # Changes are deduplicated by their payloads, in the order they were received.
+    pending: dict[str, None] = {}
+    first_received_at = last_received_at = 0.0
+
+    def flush() -> None:
+        changes = [_parse_change(payload) for payload in pending]
+        pending.clear()
+        callback(changes)
+
+    try:
+        dbapi_connection.autocommit = True
+        with dbapi_connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {channel}")
+        while not stop.is_set():
+            timeout = poll_interval
+            if pending:
+                deadline = min(
+                    last_received_at + debounce, first_received_at + max_delay
+                )
+                timeout = max(0.0, min(timeout, deadline - time.monotonic()))
+            if select.select([dbapi_connection], [], [], timeout)[0]:
+                dbapi_connection.poll()
+                while dbapi_connection.notifies:
+                    notify = dbapi_connection.notifies.pop(0)
+                    last_received_at = time.monotonic()
+                    if not pending:
+                        first_received_at = last_received_at
+                    pending[notify.payload] = None
+                    if len(pending) >= max_batch_size:
+                        flush()
+            now = time.monotonic()
+            if pending and (
+                now >= last_received_at + debounce
+                or now >= first_received_at + max_delay
+            ):
+                flush()
+        if pending:
+            flush()
+    finally:
+        with dbapi_connection.cursor() as cursor:
+            cursor.execute(f"UNLISTEN {channel}")
+        dbapi_connection.autocommit = False
+        connection.close()
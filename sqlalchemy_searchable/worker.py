@@ -0,0 +1,356 @@
+"""
+Worker for processing the queued search vector updates of search vectors that have
+the :attr:`~sqlalchemy_searchable.SearchOptions.queue_updates` option enabled.
+
+The worker can be run as a command::
+
+    python -m sqlalchemy_searchable.worker postgresql://localhost/mydb myapp.models
+
+where ``myapp.models`` is the module that defines your searchable models. Any
+number of workers can be run at the same time.
+"""
+
+import argparse
+import dataclasses
+import importlib
+import logging
+import threading
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any, cast
+
+import sqlalchemy as sa
+from sqlalchemy import Column, Connection
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import configure_mappers
+from sqlalchemy_utils import TSVectorType
+
+from . import search_manager, SearchManager, SQLConstruct
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass(frozen=True)
+class SearchQueueStats:
+    """
+    Statistics of a search vector update queue, returned by
+    :func:`search_queue_stats`.
+    """
+
+    #: Number of queued search vector updates.
+    depth: int
+
+    #: Time when the oldest queued search vector update was queued, or None if the
+    #: queue is empty.
+    oldest_queued_at: datetime | None
+
+    #: Number of queued search vector updates that have failed, and which the
+    #: worker no longer processes.
+    failed: int
+
+
+def _search_construct(
+    column: Column[TSVectorType], manager: SearchManager
+) -> SQLConstruct:
+    options = manager.column_options(column)
+    if not options.queue_updates:
+        raise ValueError(
+            f"Search vector {column.table.name}.{column.name} does not have "
+            "queued updates enabled."
+        )
+    return SQLConstruct(column, options=options)
+
+
+def _queue_table(construct: SQLConstruct) -> sa.TableClause:
+    return sa.table(
+        construct.search_queue_table_name,
+        sa.column("id"),
+        sa.column("row_key", JSONB),
+        sa.column("created_at"),
+        sa.column("failed_at"),
+        sa.column("error"),
+        schema=construct.table.schema,
+    )
+
+
+def _update_search_vectors(
+    conn: Connection, construct: SQLConstruct, row_keys: Sequence[Any]
+) -> None:
+    table = construct.table
+    primary_key = construct.primary_key
+    keys = (
+        sa.func.jsonb_populate_recordset(
+            sa.literal_column(
+                f"NULL::{conn.dialect.identifier_preparer.format_table(table)}"
+            ),
+            sa.bindparam("row_keys", list(row_keys), type_=JSONB),
+        )
+        .table_valued(*primary_key)
+        .alias("keys")
+    )
+    conn.execute(
+        table.update()
+        .values(
+            {construct.tsvector_column.name: construct.search_vector_expression(table)}
+        )
+        .where(*(table.c[name] == keys.c[name] for name in primary_key))
+    )
+    channel = construct.search_options.notify_channel
+    if channel is not None:
+        # The search trigger only queues the rows, so the notifications are sent
+        # once their search vectors have been computed.
+        key = sa.func.json_build_object(
+            *(argument for name in primary_key for argument in (name, keys.c[name]))
+        )
+        payload = sa.func.json_build_object(
+            "schema",
+            table.schema if table.schema else sa.func.current_schema(),
+            "table",
+            table.name,
+            "key",
+            key,
+        )
+        conn.execute(
+            sa.select(
+                sa.func.pg_notify(channel, sa.cast(payload, sa.Text))
+            ).select_from(keys)
+        )
+
+
+def process_search_queue(
+    conn: Connection,
+    column: Column[TSVectorType],
+    manager: SearchManager = search_manager,
+    batch_size: int = 1000,
+) -> int:
+    """
+    Process one batch of queued search vector updates of given search vector. The
+    queued updates are removed from the queue and the search vectors of the queued
+    rows are computed with a single set-based ``UPDATE``. The queued updates are
+    locked using ``FOR UPDATE SKIP LOCKED``, so that concurrent workers process
+    different batches.
+
+    If computing the search vectors of the batch fails, the queued rows are retried
+    one at a time. The queued updates of the rows that still fail are kept in the
+    queue with their ``failed_at`` and ``error`` columns set, and are no longer
+    processed. They can be retried by setting their ``failed_at`` column to NULL.
+
+    The batch is processed within the transaction of the given connection, using
+    savepoints for the retries.
+
+    :param conn: SQLAlchemy Connection object
+    :param column: TSVectorType typed column whose queue to process
+    :param manager: :class:`~sqlalchemy_searchable.SearchManager` the search vector
+        is registered in
+    :param batch_size: maximum number of queued updates to process
+    :return: the number of processed queued updates, including the failed ones
+    """
+    construct = _search_construct(column, manager)
+    queue = _queue_table(construct)
+    row_keys = (
+        conn.execute(
+            sa.delete(queue)
+            .where(
+                queue.c.id.in_(
+                    sa.select(queue.c.id)
+                    .where(queue.c.failed_at.is_(None))
+                    .order_by(queue.c.id)
+                    .limit(batch_size)
+                    .with_for_update(skip_locked=True)
+                )
+            )
+            .returning(queue.c.row_key)
+        )
+        .scalars()
+        .all()
+    )
+    if not row_keys:
+        return 0
+
+    try:
+        with conn.begin_nested():
+            _update_search_vectors(conn, construct, row_keys)
+    except sa.exc.DBAPIError as error:
+        if error.connection_invalidated:
+            raise
+        # A single bad row fails the whole batch, so the rows are retried one at
+        # a time to find the rows that fail.
+        logger.warning(
+            "Failed to process a batch of %d queued updates of %s.%s, retrying "
+            "them one at a time: %s",
+            len(row_keys),
+            column.table.name,
+            column.name,
+            error.orig,
+        )
+        failed = []
+        for row_key in row_keys:
+            try:
+                with conn.begin_nested():
+                    _update_search_vectors(conn, construct, [row_key])
+            except sa.exc.DBAPIError as row_error:
+                if row_error.connection_invalidated:
+                    raise
+                failed.append({"row_key": row_key, "error": str(row_error.orig)})
+        if failed:
+            # The failed updates are queued again, marked as failed, so that they
+            # can be inspected and retried without blocking the queue.
+            conn.execute(sa.insert(queue).values(failed_at=sa.func.now()), failed)
+            logger.error(
+                "Failed to process %d queued updates of %s.%s",
+                len(failed),
+                column.table.name,
+                column.name,
+            )
+    return len(row_keys)
+
+
+def search_queue_stats(
+    conn: Connection,
+    column: Column[TSVectorType],
+    manager: SearchManager = search_manager,
+) -> SearchQueueStats:
+    """
+    Return statistics of the search vector update queue of given search vector,
+    which can be used for monitoring the workers.
+
+    :param conn: SQLAlchemy Connection object
+    :param column: TSVectorType typed column whose queue to inspect
+    :param manager: :class:`~sqlalchemy_searchable.SearchManager` the search vector
+        is registered in
+    """
+    queue = _queue_table(_search_construct(column, manager))
+    pending = queue.c.failed_at.is_(None)
+    depth, oldest_queued_at, failed = conn.execute(
+        sa.select(
+            sa.func.count().filter(pending),
+            sa.func.min(queue.c.created_at).filter(pending),
+            sa.func.count().filter(~pending),
+        )
+    ).one()
+    return SearchQueueStats(
+        depth=depth, oldest_queued_at=oldest_queued_at, failed=failed
+    )
+
+
+def queued_search_vectors(
+    manager: SearchManager = search_manager,
+) -> list[Column[TSVectorType]]:
+    """
+    Return the search vectors registered in given search manager that have queued
+    updates enabled.
+
+    :param manager: :class:`~sqlalchemy_searchable.SearchManager` instance
+    """
+    return [
+        column
+        for column in manager.processed_columns
+        if cast(TSVectorType, column.type).columns
+        and manager.column_options(column).queue_updates
+    ]
+
+
+def run_worker(
+    engine: sa.Engine,
+    columns: Sequence[Column[TSVectorType]] | None = None,
+    manager: SearchManager = search_manager,
+    batch_size: int = 1000,
+    poll_interval: float = 1.0,
+    stop: threading.Event | None = None,
+    max_backoff: float = 60.0,
+) -> None:
+    """
+    Process queued search vector updates until ``stop`` is set. Each batch is
+    processed in its own transaction. When all the queues are empty, the worker
+    waits for ``poll_interval`` seconds before checking them again.
+
+    Errors raised while processing a batch, such as lost database connections, are
+    logged and do not stop the worker. After an error, the worker backs off by
+    waiting for ``poll_interval`` seconds, doubled after every consecutive error up
+    to ``max_backoff`` seconds, before processing the queues again.
+
+    :param engine: SQLAlchemy Engine object
+    :param columns:
+        TSVectorType typed columns whose queues to process. Defaults to all search
+        vectors with queued updates enabled.
+    :param manager: :class:`~sqlalchemy_searchable.SearchManager` the search
+        vectors are registered in
+    :param batch_size: maximum number of queued updates to process in one batch
+    :param poll_interval: number of seconds to wait when all the queues are empty
+    :param stop: event that stops the worker when set
+    :param max_backoff: maximum number of seconds to wait after consecutive errors
+    """
+    if columns is None:
+        columns = queued_search_vectors(manager)
+    if stop is None:
+        stop = threading.Event()
+    errors = 0
+    while not stop.is_set():
+        processed = 0
+        failed = False
+        for column in columns:
+            try:
+                with engine.begin() as conn:
+                    count = process_search_queue(conn, column, manager, batch_size)
+            except Exception:
+                logger.exception(
+                    "Failed to process queued updates of %s.%s",
+                    column.table.name,
+                    column.name,
+                )
+                failed = True
+                break
+            if count:
+                logger.debug(
+                    "Processed %d queued updates of %s.%s",
+                    count,
+                    column.table.name,
+                    column.name,
+                )
+            processed += count
+        if failed:
+            errors += 1
+            stop.wait(min(poll_interval * 2 ** (errors - 1), max_backoff))
+            continue
+        errors = 0
+        if not processed:
+            stop.wait(poll_interval)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m sqlalchemy_searchable.worker",
+        description="Process queued search vector updates.",
+    )
+    parser.add_argument("url", help="database URL")
+    parser.add_argument(
+        "modules",
+        nargs="+",
+        help="modules to import for defining the searchable models",
+    )
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    parser.add_argument("--max-backoff", type=float, default=60.0)
+    args: Any = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    for module in args.modules:
+        importlib.import_module(module)
+    configure_mappers()
+
+    engine = sa.create_engine(args.url)
+    try:
+        run_worker(
+            engine,
+            batch_size=args.batch_size,
+            poll_interval=args.poll_interval,
+            max_backoff=args.max_backoff,
+        )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -90,6 +90,7 @@ def Base(
 
     yield Base
 
+    search_manager.options = SearchOptions()
     search_manager.processed_columns = []
     vectorizer.clear()
     remove_listeners(Base.metadata)
@@ -0,0 +1,212 @@
+from collections.abc import Generator
+from typing import Any
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, Session
+from sqlalchemy_utils import TSVectorType
+
+from sqlalchemy_searchable import (
+    batch_search,
+    QueryLimit,
+    search,
+    SearchQueryRejected,
+)
+
+
+@pytest.fixture
+def models(TextItem: type[Any]) -> None:
+    pass
+
+
+@pytest.fixture
+def TextItem(Base: type[DeclarativeBase]) -> type[Any]:
+    class TextItem(Base):  # type: ignore[valid-type, misc]
+        __tablename__ = "textitem"
+
+        id: Mapped[int] = mapped_column(primary_key=True)
+        name: Mapped[str]
+        content: Mapped[str]
+        search_vector: Mapped[TSVectorType] = mapped_column(
+            TSVectorType("name", "content")
+        )
+
+    return TextItem
+
+
+@pytest.fixture
+def items(session: Session, TextItem: type[Any]) -> list[Any]:
+    items = [
+        TextItem(id=1, name="index", content="python"),
+        TextItem(id=2, name="admin", content="python python"),
+        TextItem(id=3, name="index", content="postgres"),
+    ]
+    session.add_all(items)
+    session.commit()
+    return items
+
+
+@pytest.fixture
+def statements(engine: Engine) -> Generator[list[str], None, None]:
+    statements: list[str] = []
+
+    def before_cursor_execute(*args: Any) -> None:
+        statements.append(args[2])
+
+    sa.event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    sa.event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+class TestBatchSearch:
+    def test_groups_results_by_search_query(
+        self,
+        session: Session,
+        TextItem: type[Any],
+        items: list[Any],
+        statements: list[str],
+    ) -> None:
+        results = batch_search(
+            session,
+            sa.select(TextItem.id).order_by(TextItem.id),
+            ["index", "missing", "python", "index"],
+            limit=10,
+        )
+        assert results == [[(1,), (3,)], [], [(1,), (2,)], [(1,), (3,)]]
+        assert len(statements) == 1
+
+    def test_limits_results_of_each_search_query(
+        self, session: Session, TextItem: type[Any], items: list[Any]
+    ) -> None:
+        results = batch_search(
+            session,
+            sa.select(TextItem.id).order_by(TextItem.id),
+            ["index", "python"],
+            limit=1,
+        )
+        assert results == [[(1,)], [(1,)]]
+
+    def test_returns_entities(
+        self, session: Session, TextItem: type[Any], items: list[Any]
+    ) -> None:
+        results = batch_search(
+            session, sa.select(TextItem), ["admin", "postgres"], limit=10
+        )
+        assert results == [[(items[1],)], [(items[2],)]]
+
+    def test_sort(
+        self, session: Session, TextItem: type[Any], items: list[Any]
+    ) -> None:
+        results = batch_search(
+            session, sa.select(TextItem.id), ["python"], limit=10, sort=True
+        )
+        assert results == [[(2,), (1,)]]
+
+    def test_orders_results_of_each_search_query(
+        self,
+        session: Session,
+        TextItem: type[Any],
+        items: list[Any],
+        statements: list[str],
+    ) -> None:
+        results = batch_search(
+            session,
+            sa.select(TextItem.id).order_by(TextItem.id.desc()),
+            ["python", "index"],
+            limit=10,
+        )
+        assert results == [[(2,), (1,)], [(3,), (1,)]]
+        assert statements[0].endswith(
+            "ORDER BY search_queries.ordinal, results.position"
+        )
+
+    def test_searches_unmapped_tables(
+        self, session: Session, TextItem: type[Any], items: list[Any]
+    ) -> None:
+        table = sa.Table("textitem", sa.MetaData(), autoload_with=session.connection())
+        results = batch_search(
+            session,
+            sa.select(table.c.id).order_by(table.c.id),
+            ["admin", "index"],
+            limit=10,
+            vector=table.c.search_vector,
+        )
+        assert results == [[(2,)], [(1,), (3,)]]
+
+    def test_matches_search(
+        self, session: Session, TextItem: type[Any], items: list[Any]
+    ) -> None:
+        search_queries = ["index or admin", "-python", "pyth"]
+        results = batch_search(
+            session,
+            sa.select(TextItem.id).order_by(TextItem.id),
+            search_queries,
+            limit=10,
+        )
+        assert results == [
+            session.execute(
+                search(sa.select(TextItem.id).order_by(TextItem.id), search_query)
+            )
+            .tuples()
+            .all()
+            for search_query in search_queries
+        ]
+
+    def test_empty_search_queries(self, session: Session, TextItem: type[Any]) -> None:
+        assert batch_search(session, sa.select(TextItem), [], limit=10) == []
+
+
+class TestBatchSearchWithQueryLimits:
+    @pytest.fixture
+    def TextItem(
+        self, Base: type[DeclarativeBase], vector_options: dict[str, Any]
+    ) -> type[Any]:
+        class TextItem(Base):  # type: ignore[valid-type, misc]
+            __tablename__ = "textitem"
+
+            id: Mapped[int] = mapped_column(primary_key=True)
+            name: Mapped[str]
+            content: Mapped[str]
+            search_vector: Mapped[TSVectorType] = mapped_column(
+                TSVectorType("name", "content", **vector_options)
+            )
+
+        return TextItem
+
+    def batch_search(self, session: Session, TextItem: type[Any], *args: Any) -> Any:
+        query = sa.select(TextItem.id).order_by(TextItem.id)
+        return batch_search(session, query, list(args), limit=10)
+
+    @pytest.mark.parametrize(
+        "vector_options", [{"max_query_length": QueryLimit(5, "reject")}]
+    )
+    def test_rejects_long_search_query(
+        self, session: Session, TextItem: type[Any], items: list[Any]
+    ) -> None:
+        with pytest.raises(SearchQueryRejected, match="max_query_length"):
+            self.batch_search(session, TextItem, "index", "python index")
+
+    @pytest.mark.parametrize(
+        "vector_options",
+        [
+            {
+                "max_query_terms": QueryLimit(1, "truncate"),
+                "min_prefix_length": QueryLimit(3, "degrade"),
+            }
+        ],
+    )
+    def test_applies_limits_to_each_search_query(
+        self, session: Session, TextItem: type[Any], items: list[Any]
+    ) -> None:
+        search_queries = ["inde pyth", "py", "pyt", "ad"]
+        results = self.batch_search(session, TextItem, *search_queries)
+        assert results == [[(1,), (3,)], [], [(1,), (2,)], []]
+        assert results == [
+            session.execute(
+                search(sa.select(TextItem.id).order_by(TextItem.id), search_query)
+            )
+            .tuples()
+            .all()
+            for search_query in search_queries
+        ]
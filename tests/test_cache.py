@@ -0,0 +1,223 @@
+from typing import Any
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, Session
+from sqlalchemy_utils import TSVectorType
+
+from sqlalchemy_searchable import drop_trigger, SearchOptions, sync_trigger
+from sqlalchemy_searchable.cache import LRUCache, search_version, SearchCache
+from tests.schema_test_case import SchemaTestCase
+
+
+@pytest.fixture
+def models(TextItem: type[Any]) -> None:
+    pass
+
+
+@pytest.fixture
+def TextItem(Base: type[DeclarativeBase]) -> type[Any]:
+    class TextItem(Base):  # type: ignore[valid-type, misc]
+        __tablename__ = "textitem"
+
+        id: Mapped[int] = mapped_column(primary_key=True)
+        name: Mapped[str]
+        content: Mapped[str]
+        search_vector: Mapped[TSVectorType] = mapped_column(
+            TSVectorType("name", "content", track_versions=True)
+        )
+
+    return TextItem
+
+
+@pytest.fixture
+def items(session: Session, TextItem: type[Any]) -> None:
+    session.add_all(
+        [
+            TextItem(id=1, name="index", content="python"),
+            TextItem(id=2, name="admin", content="python"),
+        ]
+    )
+    session.commit()
+
+
+@pytest.fixture
+def statements(engine: Engine) -> Any:
+    statements: list[str] = []
+
+    def before_cursor_execute(*args: Any) -> None:
+        statements.append(args[2])
+
+    sa.event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    sa.event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+class TestCreateSearchVersion(SchemaTestCase):
+    @pytest.fixture
+    def should_create_indexes(self) -> list[str]:
+        return ["ix_textitem_search_vector"]
+
+    @pytest.fixture
+    def should_create_triggers(self) -> list[str]:
+        return [
+            "textitem_search_vector_trigger",
+            "textitem_search_vector_trigger_version",
+        ]
+
+    def test_creates_version_table(self, session: Session) -> None:
+        assert (
+            session.scalar(text("SELECT version FROM textitem_search_vector_version"))
+            == 0
+        )
+
+
+class TestSearchVersion:
+    def test_incremented_by_writing_statements(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        column = TextItem.__table__.c.search_vector
+        session.execute(
+            sa.insert(TextItem),
+            [{"id": 1, "name": "index", "content": "python"}],
+        )
+        assert search_version(session, column) == 1
+        session.execute(sa.update(TextItem).values(name="admin"))
+        assert search_version(session, column) == 2
+        session.execute(sa.delete(TextItem))
+        assert search_version(session, column) == 3
+        session.execute(text("TRUNCATE textitem"))
+        assert search_version(session, column) == 4
+
+    def test_requires_track_versions(self, Base: type[DeclarativeBase]) -> None:
+        column: sa.Column[Any] = sa.Column("search_vector", TSVectorType("name"))
+        sa.Table("other", Base.metadata, column)
+        with pytest.raises(ValueError, match="version tracking"):
+            search_version(None, column)  # type: ignore[arg-type]
+
+
+class TestSearchCache:
+    @pytest.fixture
+    def cache(self) -> SearchCache:
+        return SearchCache(LRUCache())
+
+    def test_caches_result_ids(
+        self,
+        engine: Engine,
+        TextItem: type[Any],
+        items: None,
+        cache: SearchCache,
+        statements: list[str],
+    ) -> None:
+        query = sa.select(TextItem).order_by(TextItem.id)
+        with engine.connect() as conn:
+            assert cache.search_ids(conn, query, "python") == [1, 2]
+            assert len(statements) == 2
+            statements.clear()
+            assert cache.search_ids(conn, query, "  python ") == [1, 2]
+            assert len(statements) == 1
+
+    def test_caches_queries_separately(
+        self, session: Session, TextItem: type[Any], items: None, cache: SearchCache
+    ) -> None:
+        query = sa.select(TextItem).order_by(TextItem.id)
+        assert cache.search_ids(session, query, "python") == [1, 2]
+        assert cache.search_ids(session, query, "index") == [1]
+        assert cache.search_ids(session, query.where(TextItem.id > 1), "python") == [2]
+        assert cache.search_ids(session, query, "python", limit=1) == [1]
+
+    def test_invalidated_by_writes(
+        self, session: Session, TextItem: type[Any], items: None, cache: SearchCache
+    ) -> None:
+        query = sa.select(TextItem.id).order_by(TextItem.id)
+        assert cache.search_ids(session, query, "python") == [1, 2]
+        session.commit()
+        session.execute(sa.delete(TextItem).where(TextItem.id == 1))
+        session.commit()
+        assert cache.search_ids(session, query, "python") == [2]
+
+    def test_does_not_cache_uncommitted_writes(
+        self, session: Session, TextItem: type[Any], items: None, cache: SearchCache
+    ) -> None:
+        query = sa.select(TextItem.id).order_by(TextItem.id)
+        session.execute(sa.delete(TextItem).where(TextItem.id == 1))
+        assert cache.search_ids(session, query, "python") == [2]
+        session.rollback()
+        session.execute(sa.delete(TextItem).where(TextItem.id == 2))
+        session.commit()
+        assert cache.search_ids(session, query, "python") == [1]
+
+    def test_does_not_cache_writes_of_rolled_back_savepoints(
+        self, session: Session, TextItem: type[Any], items: None, cache: SearchCache
+    ) -> None:
+        query = sa.select(TextItem.id).order_by(TextItem.id)
+        savepoint = session.begin_nested()
+        session.execute(sa.delete(TextItem).where(TextItem.id == 1))
+        assert cache.search_ids(session, query, "python") == [2]
+        savepoint.rollback()
+        session.commit()
+        session.execute(sa.delete(TextItem).where(TextItem.id == 2))
+        session.commit()
+        assert cache.search_ids(session, query, "python") == [1]
+
+    def test_requires_track_versions(
+        self, Base: type[DeclarativeBase], session: Session, cache: SearchCache
+    ) -> None:
+        table = sa.Table(
+            "other",
+            Base.metadata,
+            sa.Column("id", sa.Integer, primary_key=True),
+            sa.Column("search_vector", TSVectorType("id")),
+        )
+        with pytest.raises(ValueError, match="version tracking"):
+            cache.search_ids(
+                session, sa.select(table), "python", vector=table.c.search_vector
+            )
+
+
+class TestLRUCache:
+    def test_evicts_least_recently_used_values(self) -> None:
+        cache = LRUCache(maxsize=2)
+        cache.set("a", [1])
+        cache.set("b", [2])
+        assert cache.get("a") == [1]
+        cache.set("c", [3])
+        assert cache.get("b") is None
+        assert cache.get("a") == [1]
+        assert cache.get("c") == [3]
+
+    def test_expires_values(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        now = 100.0
+        monkeypatch.setattr("time.monotonic", lambda: now)
+        cache = LRUCache(ttl=10)
+        cache.set("a", [1])
+        now = 110.0
+        assert cache.get("a") == [1]
+        now = 110.5
+        assert cache.get("a") is None
+
+
+class TestSyncTriggerWithVersions:
+    def test_creates_and_drops_version_table(
+        self, engine: Engine, TextItem: type[Any]
+    ) -> None:
+        options = SearchOptions(track_versions=True)
+        with engine.begin() as conn:
+            conn.execute(text("DROP TABLE textitem_search_vector_version"))
+            sync_trigger(
+                conn, "textitem", "search_vector", ["name", "content"], options=options
+            )
+            version = search_version(conn, TextItem.__table__.c.search_vector)
+            conn.execute(text("INSERT INTO textitem VALUES (1, 'a', 'b')"))
+            assert (
+                search_version(conn, TextItem.__table__.c.search_vector) == version + 1
+            )
+            drop_trigger(conn, "textitem", "search_vector", options=options)
+            assert (
+                conn.scalar(
+                    text("SELECT to_regclass('textitem_search_vector_version')")
+                )
+                is None
+            )
@@ -0,0 +1,140 @@
+from typing import Any
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import text
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, Session
+from sqlalchemy_utils import TSVectorType
+
+from sqlalchemy_searchable import (
+    CreateSearchFunctionSQL,
+    search,
+    SearchOptions,
+    sync_trigger,
+)
+
+
+@pytest.fixture
+def models(TextItem: type[Any]) -> None:
+    pass
+
+
+@pytest.fixture
+def TextItem(Base: type[DeclarativeBase]) -> type[Any]:
+    class TextItem(Base):  # type: ignore[valid-type, misc]
+        __tablename__ = "textitem"
+
+        id: Mapped[int] = mapped_column(primary_key=True)
+        name: Mapped[str]
+        content: Mapped[str]
+        search_vector: Mapped[TSVectorType | None] = mapped_column(
+            TSVectorType(
+                "name",
+                "content",
+                weights={"name": "A"},
+                cache_column_vectors=True,
+            )
+        )
+
+    return TextItem
+
+
+class TestColumnVectorCache:
+    def row(self, session: Session) -> Any:
+        return session.execute(
+            text(
+                "SELECT search_vector, search_vector_name_cache, "
+                "search_vector_content_cache FROM textitem"
+            )
+        ).one()
+
+    def test_creates_cache_columns(self, session: Session, TextItem: type[Any]) -> None:
+        columns = {
+            column["name"]
+            for column in sa.inspect(session.connection()).get_columns("textitem")
+        }
+        assert {
+            "search_vector_name_cache",
+            "search_vector_content_cache",
+        } <= columns
+
+    def test_computes_vector_from_caches(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        session.add(TextItem(id=1, name="some name", content="some content"))
+        session.flush()
+        assert tuple(self.row(session)) == (
+            "'content':4 'name':2A",
+            "'name':2A",
+            "'content':2",
+        )
+        assert session.scalars(search(sa.select(TextItem), "content")).all()
+
+    def test_recomputes_only_changed_columns(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        session.add(TextItem(id=1, name="some name", content="some content"))
+        session.flush()
+        session.execute(
+            text(
+                "UPDATE textitem SET content = 'new content', "
+                "search_vector_name_cache = 'cached'"
+            )
+        )
+        assert tuple(self.row(session)) == (
+            "'cached' 'content':2 'new':1",
+            "'cached'",
+            "'content':2 'new':1",
+        )
+
+    def test_recomputes_cleared_caches(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        session.add(TextItem(id=1, name="some name", content="some content"))
+        session.flush()
+        session.execute(
+            text(
+                "UPDATE textitem SET search_vector_name_cache = NULL, "
+                "search_vector_content_cache = NULL"
+            )
+        )
+        assert tuple(self.row(session)) == (
+            "'content':4 'name':2A",
+            "'name':2A",
+            "'content':2",
+        )
+
+    def test_sync_trigger_recomputes_vectors(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        session.add(TextItem(id=1, name="some name", content="some content"))
+        session.flush()
+        session.execute(
+            text(
+                "UPDATE textitem SET search_vector_name_cache = 'stale', "
+                "search_vector_content_cache = 'stale'"
+            )
+        )
+        sync_trigger(
+            session.connection(),
+            "textitem",
+            "search_vector",
+            ["name", "content"],
+            options=SearchOptions(weights={"name": "A"}, cache_column_vectors=True),
+        )
+        assert tuple(self.row(session)) == (
+            "'content':4 'name':2A",
+            "'name':2A",
+            "'content':2",
+        )
+
+    def test_not_supported_with_queued_updates(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        options = SearchOptions(cache_column_vectors=True, queue_updates=True)
+        with pytest.raises(sa.exc.CompileError):
+            session.execute(
+                CreateSearchFunctionSQL(
+                    TextItem.__table__.c.search_vector, options=options
+                )
+            )
@@ -0,0 +1,233 @@
+import time
+from typing import Any
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, Session
+from sqlalchemy_utils import TSVectorType
+
+from sqlalchemy_searchable import (
+    load_term_stats,
+    refresh_term_stats,
+    search,
+    search_manager,
+    SearchManager,
+    SearchOptions,
+    sync_trigger,
+)
+
+
+@pytest.fixture
+def models(TextItem: type[Any]) -> None:
+    pass
+
+
+@pytest.fixture
+def TextItem(Base: type[DeclarativeBase]) -> type[Any]:
+    class TextItem(Base):  # type: ignore[valid-type, misc]
+        __tablename__ = "textitem"
+
+        id: Mapped[int] = mapped_column(primary_key=True)
+        name: Mapped[str]
+        search_vector: Mapped[TSVectorType] = mapped_column(
+            TSVectorType("name", common_term_threshold=0.5)
+        )
+
+    return TextItem
+
+
+@pytest.fixture
+def items(session: Session, TextItem: type[Any]) -> None:
+    session.execute(
+        sa.insert(TextItem),
+        [{"id": id, "name": f"acme item{id}"} for id in range(1, 9)]
+        + [{"id": 9, "name": "python"}, {"id": 10, "name": "acme python"}],
+    )
+    session.commit()
+
+
+@pytest.fixture(autouse=True)
+def common_terms() -> Any:
+    yield
+    search_manager.common_terms.clear()
+
+
+@pytest.fixture
+def statements(engine: Engine) -> Any:
+    statements: list[str] = []
+
+    def before_cursor_execute(*args: Any) -> None:
+        statements.append(args[2])
+
+    sa.event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    sa.event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def search_ids(session: Session, TextItem: type[Any], *args: Any, **kwargs: Any) -> Any:
+    query = sa.select(TextItem.id)
+    if not kwargs.get("sort"):
+        query = query.order_by(TextItem.id)
+    return session.scalars(search(query, *args, **kwargs)).all()
+
+
+class TestRefreshTermStats:
+    @pytest.fixture(autouse=True)
+    def setup_items(self, items: None) -> None:
+        pass
+
+    def test_stores_common_terms(self, session: Session, TextItem: type[Any]) -> None:
+        lexemes = refresh_term_stats(session, TextItem.__table__.c.search_vector)
+        assert lexemes == {"acm"}
+        stats = session.execute(
+            text("SELECT lexeme, ndoc FROM textitem_search_vector_term_stats")
+        )
+        assert [(lexeme, ndoc) for lexeme, ndoc in stats] == [("acm", 9)]
+
+    def test_replaces_previous_terms(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        column = TextItem.__table__.c.search_vector
+        refresh_term_stats(session, column)
+        session.execute(sa.update(TextItem).values(name="python"))
+        assert refresh_term_stats(session, column) == {"python"}
+
+    def test_load_term_stats(self, session: Session, TextItem: type[Any]) -> None:
+        column = TextItem.__table__.c.search_vector
+        refresh_term_stats(session, column)
+        search_manager.common_terms.clear()
+        assert load_term_stats(session, column) == {"acm"}
+        assert search_manager.common_terms[column][1] == {"acm"}
+
+    def test_requires_common_term_threshold_option(
+        self, session: Session, Base: type[DeclarativeBase]
+    ) -> None:
+        class OtherItem(Base):  # type: ignore[valid-type, misc]
+            __tablename__ = "otheritem"
+
+            id: Mapped[int] = mapped_column(primary_key=True)
+            name: Mapped[str]
+            search_vector: Mapped[TSVectorType] = mapped_column(TSVectorType("name"))
+
+        with pytest.raises(ValueError, match="common_term_threshold"):
+            refresh_term_stats(session, OtherItem.__table__.c.search_vector)
+        with pytest.raises(ValueError, match="common_term_threshold"):
+            search(sa.select(OtherItem), "python", common_terms="drop")
+
+
+class TestCommonTerms:
+    @pytest.fixture(autouse=True)
+    def setup_items(self, items: None, session: Session, TextItem: type[Any]) -> None:
+        refresh_term_stats(session, TextItem.__table__.c.search_vector)
+
+    def test_keeps_common_terms_by_default(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        assert search_ids(session, TextItem, "acme python") == [10]
+
+    def test_drops_common_terms(self, session: Session, TextItem: type[Any]) -> None:
+        ids = search_ids(session, TextItem, "acme python", common_terms="drop")
+        assert ids == [9, 10]
+
+    def test_demotes_common_terms(self, session: Session, TextItem: type[Any]) -> None:
+        ids = search_ids(
+            session, TextItem, "python acme", common_terms="demote", sort=True
+        )
+        assert ids == [10, 9]
+
+    def test_keeps_query_of_only_common_terms(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        ids = search_ids(session, TextItem, "acme", common_terms="drop")
+        assert ids == [1, 2, 3, 4, 5, 6, 7, 8, 10]
+
+    def test_keeps_negated_common_terms(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        assert search_ids(session, TextItem, "python -acme", common_terms="drop") == [9]
+
+    def test_invalid_mode(self, TextItem: type[Any]) -> None:
+        with pytest.raises(ValueError, match="common_terms"):
+            search(sa.select(TextItem), "python", common_terms="remove")  # type: ignore[arg-type]
+
+
+class TestCommonTermsCache:
+    @pytest.fixture(autouse=True)
+    def setup_items(self, items: None) -> None:
+        pass
+
+    def test_uses_cached_common_terms(
+        self, session: Session, TextItem: type[Any], statements: list[str]
+    ) -> None:
+        refresh_term_stats(session, TextItem.__table__.c.search_vector)
+        statements.clear()
+        ids = search_ids(session, TextItem, "acme python", common_terms="drop")
+        assert ids == [9, 10]
+        assert "term_stats" not in statements[0]
+
+    def test_reads_term_stats_table_without_cache(
+        self, session: Session, TextItem: type[Any], statements: list[str]
+    ) -> None:
+        refresh_term_stats(session, TextItem.__table__.c.search_vector)
+        search_manager.common_terms.clear()
+        statements.clear()
+        ids = search_ids(session, TextItem, "acme python", common_terms="drop")
+        assert ids == [9, 10]
+        assert "textitem_search_vector_term_stats" in statements[0]
+
+    def test_reads_term_stats_table_when_cache_is_stale(
+        self, session: Session, TextItem: type[Any], statements: list[str]
+    ) -> None:
+        column = TextItem.__table__.c.search_vector
+        refresh_term_stats(session, column)
+        search_manager.common_terms[column] = (time.monotonic() - 301, frozenset())
+        statements.clear()
+        ids = search_ids(session, TextItem, "acme python", common_terms="drop")
+        assert ids == [9, 10]
+        assert "textitem_search_vector_term_stats" in statements[0]
+
+    def test_uses_common_terms_of_given_manager(
+        self, session: Session, TextItem: type[Any], statements: list[str]
+    ) -> None:
+        manager = SearchManager()
+        refresh_term_stats(session, TextItem.__table__.c.search_vector, manager)
+        statements.clear()
+        ids = search_ids(
+            session, TextItem, "acme python", common_terms="drop", manager=manager
+        )
+        assert ids == [9, 10]
+        assert "term_stats" not in statements[0]
+        assert not search_manager.common_terms
+
+    def test_uses_search_vector_index(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        refresh_term_stats(session, TextItem.__table__.c.search_vector)
+        session.execute(text("SET LOCAL enable_seqscan = off"))
+        compiled = search(
+            sa.select(TextItem.id), "acme python", common_terms="drop"
+        ).compile(
+            dialect=session.bind.dialect,  # type: ignore[union-attr]
+            compile_kwargs={"literal_binds": True},
+        )
+        plan = "\n".join(session.scalars(text(f"EXPLAIN {compiled}")))
+        assert "ix_textitem_search_vector" in plan
+
+
+class TestSyncTriggerWithCommonTerms:
+    def test_creates_term_stats_table(
+        self, engine: Engine, session: Session, TextItem: type[Any], items: None
+    ) -> None:
+        with engine.begin() as conn:
+            conn.execute(text("DROP TABLE textitem_search_vector_term_stats"))
+            sync_trigger(
+                conn,
+                "textitem",
+                "search_vector",
+                ["name"],
+                options=SearchOptions(common_term_threshold=0.5),
+            )
+        lexemes = refresh_term_stats(session, TextItem.__table__.c.search_vector)
+        assert lexemes == {"acm"}
@@ -0,0 +1,203 @@
+from collections.abc import Generator
+from typing import Any
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy_utils import TSVectorType
+
+from sqlalchemy_searchable import deferred_search_vectors, sync_trigger
+
+
+class TestDeferredSearchVectors:
+    @pytest.fixture
+    def TextItem(self, Base: type[DeclarativeBase]) -> type[Any]:
+        class TextItem(Base):  # type: ignore[valid-type, misc]
+            __tablename__ = "textitem"
+
+            id: Mapped[int] = mapped_column(primary_key=True)
+            name: Mapped[str]
+            content: Mapped[str]
+            search_vector: Mapped[TSVectorType | None] = mapped_column(
+                TSVectorType("name", "content", weights={"name": "A"})
+            )
+            content_search_vector: Mapped[TSVectorType | None] = mapped_column(
+                TSVectorType("content")
+            )
+
+        return TextItem
+
+    @pytest.fixture
+    def models(self, TextItem: type[Any]) -> None:
+        pass
+
+    def vectors(self, conn: Connection, id: int) -> Any:
+        return conn.execute(
+            text(
+                """SELECT search_vector, content_search_vector
+                FROM textitem WHERE id = :id"""
+            ),
+            {"id": id},
+        ).one()
+
+    @pytest.mark.parametrize("use_table", [False, True])
+    def test_computes_vectors_on_exit(
+        self, engine: Engine, TextItem: type[Any], use_table: bool
+    ) -> None:
+        entity = TextItem.__table__ if use_table else TextItem
+        with engine.begin() as conn:
+            with deferred_search_vectors(conn, entity):
+                conn.execute(
+                    sa.insert(TextItem),
+                    [
+                        {"id": 1, "name": "some name", "content": "some content"},
+                        {"id": 2, "name": "other name", "content": "new content"},
+                    ],
+                )
+                assert self.vectors(conn, 1) == (None, None)
+            assert self.vectors(conn, 1) == ("'content':4 'name':2A", "'content':2")
+            assert self.vectors(conn, 2) == (
+                "'content':4 'name':2A 'new':3",
+                "'content':2 'new':1",
+            )
+
+    def test_enables_triggers_on_exit(
+        self, engine: Engine, TextItem: type[Any]
+    ) -> None:
+        with engine.begin() as conn:
+            with deferred_search_vectors(conn, TextItem):
+                pass
+            conn.execute(
+                sa.insert(TextItem),
+                {"id": 1, "name": "some name", "content": "some content"},
+            )
+            assert self.vectors(conn, 1) == ("'content':4 'name':2A", "'content':2")
+
+    def test_does_not_update_rows_of_other_transactions(
+        self, engine: Engine, TextItem: type[Any]
+    ) -> None:
+        with engine.begin() as conn:
+            conn.execute(
+                sa.insert(TextItem),
+                {"id": 1, "name": "some name", "content": "some content"},
+            )
+            conn.execute(
+                text(
+                    """ALTER TABLE textitem DISABLE TRIGGER USER;
+                    UPDATE textitem SET search_vector = '';
+                    ALTER TABLE textitem ENABLE TRIGGER USER"""
+                )
+            )
+        with engine.begin() as conn:
+            with deferred_search_vectors(conn, TextItem):
+                conn.execute(
+                    sa.insert(TextItem),
+                    {"id": 2, "name": "some name", "content": "some content"},
+                )
+            assert self.vectors(conn, 1) == ("", "'content':2")
+            assert self.vectors(conn, 2) == ("'content':4 'name':2A", "'content':2")
+
+    def test_computes_vectors_of_rows_written_in_savepoints(
+        self, engine: Engine, TextItem: type[Any]
+    ) -> None:
+        with engine.begin() as conn:
+            with deferred_search_vectors(conn, TextItem):
+                with conn.begin_nested():
+                    conn.execute(
+                        sa.insert(TextItem),
+                        {"id": 1, "name": "some name", "content": "some content"},
+                    )
+                with conn.begin_nested() as savepoint:
+                    conn.execute(
+                        sa.insert(TextItem),
+                        {"id": 2, "name": "other name", "content": "new content"},
+                    )
+                    savepoint.rollback()
+                with conn.begin_nested():
+                    conn.execute(sa.update(TextItem).values(content="updated content"))
+            assert self.vectors(conn, 1) == (
+                "'content':4 'name':2A 'updat':3",
+                "'content':2 'updat':1",
+            )
+            assert conn.scalar(text("SELECT count(*) FROM textitem")) == 1
+
+    def test_rolls_back_to_savepoint_on_error(
+        self, engine: Engine, TextItem: type[Any]
+    ) -> None:
+        with engine.begin() as conn:
+            conn.execute(
+                sa.insert(TextItem),
+                {"id": 1, "name": "some name", "content": "some content"},
+            )
+            with pytest.raises(sa.exc.IntegrityError):
+                with deferred_search_vectors(conn, TextItem):
+                    conn.execute(
+                        sa.insert(TextItem),
+                        {"id": 2, "name": "other name", "content": "new content"},
+                    )
+                    conn.execute(
+                        sa.insert(TextItem),
+                        {"id": 1, "name": "some name", "content": "some content"},
+                    )
+            conn.execute(
+                sa.insert(TextItem),
+                {"id": 3, "name": "some name", "content": "some content"},
+            )
+            assert conn.scalars(text("SELECT id FROM textitem ORDER BY id")).all() == [
+                1,
+                3,
+            ]
+            assert self.vectors(conn, 3) == ("'content':4 'name':2A", "'content':2")
+
+
+class TestDeferredSearchVectorsInSchemas:
+    schemas = ("Tenant", "Client")
+
+    @pytest.fixture(autouse=True)
+    def create_tables(self, engine: Engine) -> Generator[None, None, None]:
+        with engine.begin() as conn:
+            for schema in self.schemas:
+                conn.execute(text(f'CREATE SCHEMA "{schema}"'))
+                conn.execute(
+                    text(
+                        f"""CREATE TABLE "{schema}".article (
+                            id INTEGER PRIMARY KEY,
+                            name TEXT,
+                            search_vector TSVECTOR
+                        )"""
+                    )
+                )
+                sync_trigger(conn, "article", "search_vector", ["name"], schema=schema)
+
+        yield
+
+        with engine.begin() as conn:
+            for schema in self.schemas:
+                conn.execute(text(f'DROP SCHEMA "{schema}" CASCADE'))
+
+    def test_defers_same_named_tables_in_one_block(self, engine: Engine) -> None:
+        metadata = sa.MetaData()
+        tables = [
+            sa.Table(
+                "article",
+                metadata,
+                sa.Column("id", sa.Integer, primary_key=True),
+                sa.Column("name", sa.Text),
+                sa.Column("search_vector", TSVectorType("name")),
+                schema=schema,
+            )
+            for schema in self.schemas
+        ]
+        with engine.begin() as conn:
+            with deferred_search_vectors(conn, tables[0]):
+                with deferred_search_vectors(conn, tables[1]):
+                    for id, table in enumerate(tables, 1):
+                        conn.execute(
+                            sa.insert(table), {"id": id, "name": f"name {table.schema}"}
+                        )
+            vectors = [
+                conn.scalar(sa.select(table.c.search_vector)) for table in tables
+            ]
+        assert vectors == ["'name':1 'tenant':2", "'client':2 'name':1"]
@@ -0,0 +1,198 @@
+from typing import Any
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, Session
+from sqlalchemy_utils import TSVectorType
+
+from sqlalchemy_searchable import drop_trigger, search, SearchOptions, sync_trigger
+
+
+@pytest.fixture
+def models(TextItem: type[Any]) -> None:
+    pass
+
+
+@pytest.fixture
+def vector_options() -> dict[str, Any]:
+    return {}
+
+
+@pytest.fixture
+def TextItem(Base: type[DeclarativeBase], vector_options: dict[str, Any]) -> type[Any]:
+    class TextItem(Base):  # type: ignore[valid-type, misc]
+        __tablename__ = "textitem"
+
+        id: Mapped[int] = mapped_column(primary_key=True)
+        name: Mapped[str]
+        content: Mapped[str]
+        search_vector: Mapped[TSVectorType | None] = mapped_column(
+            TSVectorType("name", "content", search_words=True, **vector_options)
+        )
+
+    return TextItem
+
+
+@pytest.fixture
+def items(session: Session, TextItem: type[Any]) -> None:
+    session.add_all(
+        [
+            TextItem(id=1, name="index", content="python"),
+            TextItem(id=2, name="admin", content="postgres"),
+        ]
+    )
+    session.commit()
+
+
+def words(conn: Session | sa.Connection) -> list[str]:
+    return list(
+        conn.scalars(
+            text("SELECT lexeme FROM textitem_search_vector_lexemes ORDER BY 1")
+        )
+    )
+
+
+def trigram_index(conn: Session | sa.Connection) -> Any:
+    return conn.scalar(
+        text(
+            "SELECT indexdef FROM pg_indexes"
+            " WHERE indexname = 'ix_textitem_search_vector_lexemes_trgm'"
+        )
+    )
+
+
+class TestSearchWords:
+    def test_creates_trigram_index(self, session: Session) -> None:
+        definition = trigram_index(session)
+        assert definition is not None
+        assert "gin (lexeme gin_trgm_ops)" in definition
+
+    def test_adds_lexemes_of_inserted_rows(self, session: Session, items: None) -> None:
+        assert words(session) == ["admin", "index", "postgr", "python"]
+
+    def test_replaces_lexemes_of_updated_rows(
+        self, session: Session, TextItem: type[Any], items: None
+    ) -> None:
+        session.execute(
+            sa.update(TextItem).values(name="search").where(TextItem.id == 1)
+        )
+        assert words(session) == ["admin", "postgr", "python", "search"]
+
+    def test_shares_lexeme_dictionary_triggers(self, session: Session) -> None:
+        sync_trigger(
+            session.connection(),
+            "textitem",
+            "search_vector",
+            ["name", "content"],
+            options=SearchOptions(search_words=True, lexeme_dictionary=True),
+        )
+        triggers = session.scalars(
+            text(
+                """SELECT tgname FROM pg_trigger
+                WHERE tgrelid = 'textitem'::regclass ORDER BY tgname"""
+            )
+        ).all()
+        assert triggers == [
+            "textitem_search_vector_trigger",
+            "textitem_search_vector_trigger_lexemes_delete",
+            "textitem_search_vector_trigger_lexemes_insert",
+            "textitem_search_vector_trigger_lexemes_truncate",
+            "textitem_search_vector_trigger_lexemes_update",
+        ]
+
+
+class TestFuzzySearch:
+    @pytest.fixture(autouse=True)
+    def setup_items(self, items: None) -> None:
+        pass
+
+    def ids(self, session: Session, TextItem: type[Any], search_query: str) -> Any:
+        return session.scalars(
+            search(
+                sa.select(TextItem.id).order_by(TextItem.id), search_query, fuzzy=True
+            )
+        ).all()
+
+    def test_corrects_misspelled_terms(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        query = sa.select(TextItem.id)
+        assert session.scalars(search(query, "pythn")).all() == []
+        assert self.ids(session, TextItem, "pythn") == [1]
+        assert self.ids(session, TextItem, "postgers or admn") == [2]
+
+    def test_keeps_matching_terms(self, session: Session, TextItem: type[Any]) -> None:
+        assert self.ids(session, TextItem, "pyth") == [1]
+        assert self.ids(session, TextItem, "index pythn") == [1]
+        assert self.ids(session, TextItem, "index postgres") == []
+
+    def test_keeps_terms_without_similar_words(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        assert self.ids(session, TextItem, "xyz") == []
+        assert (
+            session.scalar(
+                text(
+                    "SELECT fuzzy_websearch('pg_catalog.english', 'pythn xyz',"
+                    " 'textitem_search_vector_lexemes')::text"
+                )
+            )
+            == "'python':* & 'xyz':*"
+        )
+
+    def test_sort(self, session: Session, TextItem: type[Any]) -> None:
+        query = search(sa.select(TextItem.id), "pythn", fuzzy=True, sort=True)
+        assert session.scalars(query).all() == [1]
+
+    def test_requires_search_words(self, Base: type[DeclarativeBase]) -> None:
+        table = sa.Table(
+            "other",
+            Base.metadata,
+            sa.Column("id", sa.Integer, primary_key=True),
+            sa.Column("search_vector", TSVectorType("id")),
+        )
+        with pytest.raises(ValueError, match="search_words"):
+            search(sa.select(table), "python", vector=table.c.search_vector, fuzzy=True)
+
+
+class TestSyncTriggerWithSearchWords:
+    def test_seeds_and_drops_lexeme_dictionary(
+        self, engine: Engine, TextItem: type[Any], items: None
+    ) -> None:
+        options = SearchOptions(search_words=True)
+        with engine.begin() as conn:
+            drop_trigger(conn, "textitem", "search_vector", options=options)
+            assert (
+                conn.scalar(
+                    text("SELECT to_regclass('textitem_search_vector_lexemes')")
+                )
+                is None
+            )
+            sync_trigger(
+                conn, "textitem", "search_vector", ["name", "content"], options=options
+            )
+            assert words(conn) == ["admin", "index", "postgr", "python"]
+            conn.execute(text("INSERT INTO textitem VALUES (3, 'search', 'engine')"))
+            assert words(conn) == [
+                "admin",
+                "engin",
+                "index",
+                "postgr",
+                "python",
+                "search",
+            ]
+
+    def test_drops_trigram_index_without_search_words(
+        self, engine: Engine, TextItem: type[Any]
+    ) -> None:
+        with engine.begin() as conn:
+            sync_trigger(
+                conn,
+                "textitem",
+                "search_vector",
+                ["name", "content"],
+                options=SearchOptions(lexeme_dictionary=True),
+            )
+            assert trigram_index(conn) is None
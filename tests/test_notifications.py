@@ -0,0 +1,200 @@
+import threading
+import time
+from collections.abc import Generator
+from typing import Any
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy_utils import TSVectorType
+
+from sqlalchemy_searchable import search_table
+from sqlalchemy_searchable.notifications import (
+    listen_search_vector_changes,
+    SearchVectorChange,
+)
+from sqlalchemy_searchable.worker import process_search_queue
+
+
+@pytest.fixture
+def models(TextItem: type[Any]) -> None:
+    pass
+
+
+@pytest.fixture
+def vector_options() -> dict[str, Any]:
+    return {}
+
+
+@pytest.fixture
+def TextItem(Base: type[DeclarativeBase], vector_options: dict[str, Any]) -> type[Any]:
+    class TextItem(Base):  # type: ignore[valid-type, misc]
+        __tablename__ = "textitem"
+
+        id: Mapped[int] = mapped_column(primary_key=True)
+        name: Mapped[str]
+        content: Mapped[str]
+        search_vector: Mapped[TSVectorType | None] = mapped_column(
+            TSVectorType("name", "content", notify_channel="changes", **vector_options)
+        )
+
+    return TextItem
+
+
+class Listener:
+    def __init__(self, engine: Engine, **kwargs: Any):
+        self.batches: list[list[SearchVectorChange]] = []
+        self.stop = threading.Event()
+        self.thread = threading.Thread(
+            target=listen_search_vector_changes,
+            kwargs=dict(
+                engine=engine,
+                channel="changes",
+                callback=self.batches.append,
+                poll_interval=0.01,
+                stop=self.stop,
+                **kwargs,
+            ),
+        )
+
+    def changes(self) -> list[SearchVectorChange]:
+        return [change for batch in self.batches for change in batch]
+
+    def wait(self, count: int) -> None:
+        for _ in range(200):
+            if len(self.changes()) >= count:
+                break
+            time.sleep(0.01)
+
+
+@pytest.fixture
+def listener_options() -> dict[str, Any]:
+    return {"debounce": 0.05}
+
+
+@pytest.fixture
+def listener(
+    engine: Engine, listener_options: dict[str, Any]
+) -> Generator[Listener, None, None]:
+    listener = Listener(engine, **listener_options)
+    listener.thread.start()
+    with engine.connect() as conn:
+        for _ in range(200):
+            listening = conn.scalar(
+                sa.text(
+                    "SELECT count(*) FROM pg_stat_activity "
+                    "WHERE query = 'LISTEN changes'"
+                )
+            )
+            if listening:
+                break
+            time.sleep(0.01)
+    yield listener
+    listener.stop.set()
+    listener.thread.join()
+
+
+def change(id: int) -> SearchVectorChange:
+    return SearchVectorChange(schema="public", table="textitem", key={"id": id})
+
+
+def insert_items(engine: Engine, TextItem: type[Any]) -> None:
+    with engine.begin() as conn:
+        conn.execute(
+            sa.insert(TextItem),
+            [
+                {"id": 1, "name": "index", "content": "python"},
+                {"id": 2, "name": "admin", "content": "python"},
+            ],
+        )
+
+
+class TestNotifications:
+    def test_notifies_inserted_and_updated_rows(
+        self, engine: Engine, TextItem: type[Any], listener: Listener
+    ) -> None:
+        insert_items(engine, TextItem)
+        listener.wait(2)
+        with engine.begin() as conn:
+            conn.execute(sa.update(TextItem).values(name="new").where(TextItem.id == 2))
+        listener.wait(3)
+        assert listener.changes() == [change(1), change(2), change(2)]
+
+    def test_does_not_notify_rolled_back_changes(
+        self, engine: Engine, TextItem: type[Any], listener: Listener
+    ) -> None:
+        with engine.connect() as conn:
+            conn.execute(
+                sa.insert(TextItem).values(id=1, name="index", content="python")
+            )
+            conn.rollback()
+        insert_items(engine, TextItem)
+        listener.wait(2)
+        assert listener.changes() == [change(1), change(2)]
+
+
+class TestSearchTableNotifications:
+    @pytest.fixture
+    def TextItem(self, Base: type[DeclarativeBase]) -> type[Any]:
+        class TextItem(Base):  # type: ignore[valid-type, misc]
+            __tablename__ = "textitem"
+
+            id: Mapped[int] = mapped_column(primary_key=True)
+            name: Mapped[str]
+            content: Mapped[str]
+
+        search_table(TextItem, "name", "content", notify_channel="changes")
+        return TextItem
+
+    def test_notifies_inserted_rows(
+        self, engine: Engine, TextItem: type[Any], listener: Listener
+    ) -> None:
+        insert_items(engine, TextItem)
+        listener.wait(2)
+        assert listener.changes() == [change(1), change(2)]
+
+
+class TestQueuedNotifications:
+    @pytest.fixture
+    def vector_options(self) -> dict[str, Any]:
+        return {"queue_updates": True}
+
+    def test_notifies_processed_rows(
+        self, engine: Engine, TextItem: type[Any], listener: Listener
+    ) -> None:
+        insert_items(engine, TextItem)
+        with engine.begin() as conn:
+            process_search_queue(conn, TextItem.__table__.c.search_vector)
+        listener.wait(2)
+        assert listener.changes() == [change(1), change(2)]
+
+
+class TestBatching:
+    @pytest.fixture
+    def listener_options(self) -> dict[str, Any]:
+        return {"debounce": 0.2, "max_batch_size": 2}
+
+    def test_batches_and_deduplicates_changes(
+        self, engine: Engine, TextItem: type[Any], listener: Listener
+    ) -> None:
+        insert_items(engine, TextItem)
+        for name in ["new", "newer", "newest"]:
+            with engine.begin() as conn:
+                conn.execute(
+                    sa.update(TextItem).values(name=name).where(TextItem.id == 1)
+                )
+        listener.wait(3)
+        assert listener.batches == [[change(1), change(2)], [change(1)]]
+
+    def test_passes_pending_changes_when_stopped(
+        self, engine: Engine, TextItem: type[Any], listener: Listener
+    ) -> None:
+        with engine.begin() as conn:
+            conn.execute(
+                sa.insert(TextItem).values(id=1, name="index", content="python")
+            )
+        time.sleep(0.05)
+        listener.stop.set()
+        listener.thread.join()
+        assert listener.batches == [[change(1)]]
@@ -0,0 +1,181 @@
+from datetime import date
+from typing import Any
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, Session
+from sqlalchemy_utils import TSVectorType
+
+from sqlalchemy_searchable import (
+    search,
+    SearchOptions,
+    sync_trigger,
+    update_search_vectors,
+)
+
+
+@pytest.fixture
+def models(TextItem: type[Any]) -> None:
+    pass
+
+
+@pytest.fixture
+def TextItem(Base: type[DeclarativeBase]) -> type[Any]:
+    class TextItem(Base):  # type: ignore[valid-type, misc]
+        __tablename__ = "textitem"
+        __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
+
+        id: Mapped[int] = mapped_column(primary_key=True)
+        created_at: Mapped[date] = mapped_column(primary_key=True)
+        name: Mapped[str]
+        search_vector: Mapped[TSVectorType | None] = mapped_column(
+            TSVectorType("name", partition_key="created_at")
+        )
+
+    for year in [2024, 2025]:
+        sa.event.listen(
+            TextItem.__table__,
+            "after_create",
+            sa.DDL(  # type: ignore[no-untyped-call]
+                f"CREATE TABLE textitem_{year} PARTITION OF textitem"
+                f" FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+            ),
+        )
+    return TextItem
+
+
+@pytest.fixture
+def items(session: Session, TextItem: type[Any]) -> list[Any]:
+    items = [
+        TextItem(id=1, created_at=date(2024, 6, 1), name="first article"),
+        TextItem(id=2, created_at=date(2025, 6, 1), name="second article"),
+    ]
+    session.add_all(items)
+    session.commit()
+    return items
+
+
+class TestPartitionedTables:
+    def vectors(self, conn: sa.Connection) -> list[Any]:
+        return list(
+            conn.scalars(text("SELECT search_vector FROM textitem ORDER BY id"))
+        )
+
+    def test_computes_search_vectors(self, session: Session, items: list[Any]) -> None:
+        assert self.vectors(session.connection()) == [
+            "'articl':2 'first':1",
+            "'articl':2 'second':1",
+        ]
+
+    def test_creates_search_index_on_partitions(self, session: Session) -> None:
+        indexes = session.scalars(
+            text(
+                """SELECT indexname FROM pg_indexes
+                WHERE tablename LIKE 'textitem%' AND indexdef LIKE '%gin%'
+                ORDER BY indexname"""
+            )
+        ).all()
+        assert indexes == [
+            "ix_textitem_search_vector",
+            "textitem_2024_search_vector_idx",
+            "textitem_2025_search_vector_idx",
+        ]
+
+    def test_sync_trigger_updates_one_partition_at_a_time(
+        self, engine: Engine, items: list[Any]
+    ) -> None:
+        with engine.begin() as conn:
+            estimate = sync_trigger(
+                conn,
+                "textitem",
+                "search_vector",
+                ["name"],
+                options=SearchOptions(weights={"name": "A"}),
+                dry_run=True,
+            )
+            assert estimate is not None
+            updates = [
+                statement
+                for statement in estimate.statements
+                if statement.startswith("UPDATE")
+            ]
+            assert [update.split()[1] for update in updates] == [
+                "public.textitem_2024",
+                "public.textitem_2025",
+            ]
+            assert estimate.table_size > 0
+
+            sync_trigger(
+                conn,
+                "textitem",
+                "search_vector",
+                ["name"],
+                options=SearchOptions(weights={"name": "A"}),
+            )
+            assert self.vectors(conn) == [
+                "'articl':2A 'first':1A",
+                "'articl':2A 'second':1A",
+            ]
+
+    def test_update_search_vectors(
+        self, engine: Engine, items: list[Any], TextItem: type[Any]
+    ) -> None:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE textitem DISABLE TRIGGER USER"))
+            conn.execute(text("UPDATE textitem SET search_vector = NULL"))
+            conn.execute(text("ALTER TABLE textitem ENABLE TRIGGER USER"))
+        update_search_vectors(
+            engine, [TextItem.__table__.c.search_vector], max_workers=2
+        )
+        with engine.connect() as conn:
+            assert self.vectors(conn) == [
+                "'articl':2 'first':1",
+                "'articl':2 'second':1",
+            ]
+
+    def test_search_with_partition_range(
+        self, session: Session, items: list[Any], TextItem: type[Any]
+    ) -> None:
+        query = search(
+            sa.select(TextItem),
+            "article",
+            partition_range=(date(2025, 1, 1), None),
+        )
+        assert session.scalars(query).all() == [items[1]]
+        query = search(
+            sa.select(TextItem),
+            "article",
+            partition_range=(None, date(2025, 1, 1)),
+        )
+        assert session.scalars(query).all() == [items[0]]
+
+    def test_search_with_partition_range_prunes_partitions(
+        self, session: Session, items: list[Any], TextItem: type[Any]
+    ) -> None:
+        query = search(
+            sa.select(TextItem),
+            "article",
+            partition_range=(date(2025, 1, 1), date(2026, 1, 1)),
+        )
+        compiled = query.compile(
+            dialect=session.bind.dialect,  # type: ignore[union-attr]
+            compile_kwargs={"literal_binds": True},
+        )
+        plan = "\n".join(session.scalars(text(f"EXPLAIN {compiled}")))
+        assert "textitem_2025" in plan
+        assert "textitem_2024" not in plan
+
+    def test_partition_range_requires_partition_key(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        column: sa.Column[Any] = sa.Column("search_vector", TSVectorType("name"))
+        sa.Table("other", sa.MetaData(), sa.Column("name", sa.Text), column)
+        with pytest.raises(ValueError):
+            search(
+                sa.select(TextItem),
+                "article",
+                vector=column,
+                partition_range=(None, None),
+            )
@@ -0,0 +1,189 @@
+from typing import Any
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, Session
+from sqlalchemy_utils import TSVectorType
+
+from sqlalchemy_searchable import percolate, search, stored_queries_table
+
+
+@pytest.fixture
+def models(TextItem: type[Any], stored_queries: sa.Table) -> None:
+    pass
+
+
+@pytest.fixture
+def TextItem(Base: type[DeclarativeBase]) -> type[Any]:
+    class TextItem(Base):  # type: ignore[valid-type, misc]
+        __tablename__ = "textitem"
+
+        id: Mapped[int] = mapped_column(primary_key=True)
+        name: Mapped[str]
+        content: Mapped[str]
+        search_vector: Mapped[TSVectorType] = mapped_column(
+            TSVectorType("name", "content")
+        )
+
+    return TextItem
+
+
+@pytest.fixture
+def stored_queries(Base: type[DeclarativeBase]) -> sa.Table:
+    return stored_queries_table(
+        "stored_query", Base.metadata, sa.Column("owner", sa.Text)
+    )
+
+
+@pytest.fixture
+def items(session: Session, TextItem: type[Any]) -> list[Any]:
+    items = [
+        TextItem(id=1, name="index", content="python"),
+        TextItem(id=2, name="admin", content="postgres"),
+        TextItem(id=3, name="index", content="rust"),
+    ]
+    session.add_all(items)
+    session.commit()
+    return items
+
+
+SEARCH_QUERIES = [
+    "python",
+    "index or admin",
+    "pyth",
+    "index -rust",
+    "-python",
+    '"index python"',
+    "missing",
+]
+
+
+@pytest.fixture
+def stored_query_ids(session: Session, stored_queries: sa.Table) -> list[int]:
+    ids = list(
+        session.execute(
+            sa.insert(stored_queries).returning(stored_queries.c.id),
+            [
+                {"search_query": search_query, "owner": "owner"}
+                for search_query in SEARCH_QUERIES
+            ],
+        ).scalars()
+    )
+    session.commit()
+    return ids
+
+
+class TestStoredQueriesTable:
+    def test_parses_search_queries(
+        self,
+        session: Session,
+        stored_queries: sa.Table,
+        stored_query_ids: list[int],
+    ) -> None:
+        rows = session.execute(
+            sa.select(
+                stored_queries.c.search_query,
+                stored_queries.c.terms,
+                sa.cast(stored_queries.c.tsquery, sa.Text),
+            ).order_by(stored_queries.c.id)
+        ).all()
+        assert [tuple(row) for row in rows[:5]] == [
+            ("python", ["python"], "'python':*"),
+            ("index or admin", ["admin", "index"], "'index':* | 'admin':*"),
+            ("pyth", ["pyth"], "'pyth':*"),
+            ("index -rust", ["index"], "'index':* & !'rust':*"),
+            ("-python", [], "!'python':*"),
+        ]
+
+    def test_updates_parsed_search_query(
+        self,
+        session: Session,
+        stored_queries: sa.Table,
+        stored_query_ids: list[int],
+    ) -> None:
+        session.execute(
+            sa.update(stored_queries)
+            .values(search_query="admin")
+            .where(stored_queries.c.id == stored_query_ids[0])
+        )
+        assert session.execute(
+            sa.select(stored_queries.c.terms).where(
+                stored_queries.c.id == stored_query_ids[0]
+            )
+        ).scalar_one() == ["admin"]
+
+
+class TestPercolate:
+    def test_matches_stored_queries(
+        self,
+        session: Session,
+        TextItem: type[Any],
+        stored_queries: sa.Table,
+        items: list[Any],
+        stored_query_ids: list[int],
+    ) -> None:
+        matches = percolate(session, stored_queries, sa.select(TextItem.id))
+        expected = [
+            (stored_query_id, row)
+            for stored_query_id, search_query in zip(stored_query_ids, SEARCH_QUERIES)
+            for row in session.execute(search(sa.select(TextItem.id), search_query))
+            .tuples()
+            .all()
+        ]
+        assert sorted(matches) == sorted(expected)
+        assert len(matches) == 9
+
+    def test_filters_rows(
+        self,
+        session: Session,
+        TextItem: type[Any],
+        stored_queries: sa.Table,
+        items: list[Any],
+        stored_query_ids: list[int],
+    ) -> None:
+        matches = percolate(
+            session,
+            stored_queries,
+            sa.select(TextItem).where(TextItem.id == 3),
+        )
+        assert sorted(matches) == [
+            (stored_query_ids[1], (items[2],)),
+            (stored_query_ids[4], (items[2],)),
+        ]
+
+    def test_without_rows(
+        self,
+        session: Session,
+        TextItem: type[Any],
+        stored_queries: sa.Table,
+        stored_query_ids: list[int],
+    ) -> None:
+        assert percolate(session, stored_queries, sa.select(TextItem)) == []
+
+    def test_uses_terms_index(
+        self,
+        engine: Engine,
+        TextItem: type[Any],
+        stored_queries: sa.Table,
+        items: list[Any],
+    ) -> None:
+        with engine.begin() as conn:
+            conn.execute(
+                sa.insert(stored_queries),
+                [{"search_query": f"word{i}"} for i in range(5000)],
+            )
+            conn.execute(sa.text("ANALYZE stored_query"))
+            statements: list[tuple[str, Any]] = []
+
+            def before_cursor_execute(*args: Any) -> None:
+                statements.append((args[2], args[3]))
+
+            sa.event.listen(conn, "before_cursor_execute", before_cursor_execute)
+            percolate(
+                conn, stored_queries, sa.select(TextItem.id).where(TextItem.id == 1)
+            )
+            statement, parameters = statements[0]
+            plan = conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+            plan_lines = plan.scalars().all()
+        assert any("ix_stored_query_terms" in line for line in plan_lines)
@@ -0,0 +1,239 @@
+from typing import Any
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import text
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, Session
+from sqlalchemy_utils import TSVectorType
+
+from sqlalchemy_searchable import (
+    AppliedLimit,
+    limit_search_query,
+    LimitedSearchQuery,
+    QueryLimit,
+    search,
+    SearchQueryRejected,
+)
+
+
+@pytest.fixture
+def models(TextItem: type[Any]) -> None:
+    pass
+
+
+@pytest.fixture
+def vector_options() -> dict[str, Any]:
+    return {}
+
+
+@pytest.fixture
+def TextItem(Base: type[DeclarativeBase], vector_options: dict[str, Any]) -> type[Any]:
+    class TextItem(Base):  # type: ignore[valid-type, misc]
+        __tablename__ = "textitem"
+
+        id: Mapped[int] = mapped_column(primary_key=True)
+        name: Mapped[str]
+        search_vector: Mapped[TSVectorType] = mapped_column(
+            TSVectorType("name", **vector_options)
+        )
+
+    return TextItem
+
+
+@pytest.fixture
+def items(session: Session, TextItem: type[Any]) -> None:
+    session.add_all(
+        [
+            TextItem(id=1, name="python index"),
+            TextItem(id=2, name="pytest"),
+            TextItem(id=3, name="java"),
+            TextItem(id=4, name="x files"),
+        ]
+    )
+    session.commit()
+
+
+def limit(TextItem: type[Any], search_query: str) -> LimitedSearchQuery:
+    return limit_search_query(search_query, TextItem.__table__.c.search_vector)
+
+
+def search_ids(session: Session, TextItem: type[Any], search_query: Any) -> Any:
+    query = sa.select(TextItem.id).order_by(TextItem.id)
+    return session.scalars(search(query, search_query)).all()
+
+
+class TestWithoutLimits:
+    def test_keeps_search_query(self, TextItem: type[Any]) -> None:
+        assert limit(TextItem, "a or b or c") == LimitedSearchQuery("a or b or c")
+
+
+class TestMaxQueryLength:
+    @pytest.fixture
+    def vector_options(self, action: str) -> dict[str, Any]:
+        return {"max_query_length": QueryLimit(10, action)}  # type: ignore[arg-type]
+
+    @pytest.mark.parametrize("action", ["reject"])
+    def test_rejects_long_search_query(self, TextItem: type[Any]) -> None:
+        assert limit(TextItem, "python ind").search_query == "python ind"
+        with pytest.raises(SearchQueryRejected) as excinfo:
+            limit(TextItem, "python index")
+        assert excinfo.value.applied_limit == AppliedLimit(
+            "max_query_length", QueryLimit(10, "reject"), 12
+        )
+
+    @pytest.mark.parametrize("action", ["truncate"])
+    @pytest.mark.parametrize(
+        ("search_query", "expected"),
+        [
+            ("python index", "python"),
+            ("python ind x", "python ind"),
+            ("pythonindexes", "pythoninde"),
+        ],
+    )
+    def test_truncates_to_whole_words(
+        self, TextItem: type[Any], search_query: str, expected: str
+    ) -> None:
+        limited_query = limit(TextItem, search_query)
+        assert limited_query.search_query == expected
+        assert [limit.name for limit in limited_query.applied_limits] == [
+            "max_query_length"
+        ]
+
+    @pytest.mark.parametrize("action", ["degrade"])
+    def test_degrades_to_exact_matching(
+        self, session: Session, TextItem: type[Any], items: None
+    ) -> None:
+        limited_query = limit(TextItem, "pyt or python")
+        assert limited_query.search_query == "pyt or python"
+        assert not limited_query.prefix_matching
+        assert search_ids(session, TextItem, limited_query) == [1]
+        assert search_ids(session, TextItem, "pyt") == [1, 2]
+
+
+class TestMaxQueryTerms:
+    @pytest.fixture
+    def vector_options(self, action: str) -> dict[str, Any]:
+        return {"max_query_terms": QueryLimit(2, action)}  # type: ignore[arg-type]
+
+    @pytest.mark.parametrize("action", ["reject"])
+    def test_rejects_search_query_with_many_terms(self, TextItem: type[Any]) -> None:
+        limit(TextItem, "python or -java")
+        with pytest.raises(SearchQueryRejected, match="max_query_terms"):
+            limit(TextItem, '"python index" java')
+
+    @pytest.mark.parametrize("action", ["truncate"])
+    @pytest.mark.parametrize(
+        ("search_query", "expected"),
+        [
+            ("python or java index", "python or java"),
+            ("python -java index", "python -java"),
+            ('"python index files" java', '"python index"'),
+            ("python x-files", "python"),
+        ],
+    )
+    def test_keeps_first_terms(
+        self, TextItem: type[Any], search_query: str, expected: str
+    ) -> None:
+        assert limit(TextItem, search_query).search_query == expected
+
+    @pytest.mark.parametrize("action", ["degrade"])
+    def test_degrades_to_exact_matching(
+        self, session: Session, TextItem: type[Any], items: None
+    ) -> None:
+        assert search_ids(session, TextItem, "pyt or java or python") == [1, 3]
+        assert search_ids(session, TextItem, "pyt or java") == [1, 2, 3]
+
+
+class TestMaxQueryOrBranches:
+    @pytest.fixture
+    def vector_options(self, action: str) -> dict[str, Any]:
+        return {"max_query_or_branches": QueryLimit(2, action)}  # type: ignore[arg-type]
+
+    @pytest.mark.parametrize("action", ["reject"])
+    def test_rejects_search_query_with_many_branches(self, TextItem: type[Any]) -> None:
+        limit(TextItem, "python index or java")
+        with pytest.raises(SearchQueryRejected, match="max_query_or_branches"):
+            limit(TextItem, "python or java or index")
+
+    @pytest.mark.parametrize("action", ["truncate"])
+    def test_keeps_first_branches(
+        self, session: Session, TextItem: type[Any], items: None
+    ) -> None:
+        limited_query = limit(TextItem, "or python index or java or x OR")
+        assert limited_query.search_query == "python index or java"
+        assert limited_query.applied_limits[0].value == 3
+        assert search_ids(session, TextItem, limited_query) == [1, 3]
+
+    @pytest.mark.parametrize("action", ["degrade"])
+    def test_ignores_or_operators(
+        self, session: Session, TextItem: type[Any], items: None
+    ) -> None:
+        limited_query = limit(TextItem, "python or java or index")
+        assert limited_query.search_query == "python java index"
+        assert search_ids(session, TextItem, "python or index or py") == [1]
+
+
+class TestMinPrefixLength:
+    @pytest.fixture
+    def vector_options(self, action: str) -> dict[str, Any]:
+        return {"min_prefix_length": QueryLimit(3, action)}  # type: ignore[arg-type]
+
+    @pytest.mark.parametrize("action", ["reject"])
+    def test_rejects_short_terms(self, TextItem: type[Any]) -> None:
+        limit(TextItem, "pyt java")
+        with pytest.raises(SearchQueryRejected) as excinfo:
+            limit(TextItem, "java p")
+        assert excinfo.value.applied_limit.value == 1
+
+    @pytest.mark.parametrize("action", ["truncate"])
+    def test_removes_short_terms(
+        self, session: Session, TextItem: type[Any], items: None
+    ) -> None:
+        assert limit(TextItem, "py or java x-files").search_query == "java"
+        assert search_ids(session, TextItem, "py or java") == [3]
+        assert search_ids(session, TextItem, "py") == []
+
+    @pytest.mark.parametrize("action", ["degrade"])
+    def test_matches_short_terms_exactly(
+        self, session: Session, TextItem: type[Any], items: None
+    ) -> None:
+        limited_query = limit(TextItem, "py or x")
+        assert limited_query.min_prefix_length == 3
+        assert search_ids(session, TextItem, limited_query) == [4]
+        assert search_ids(session, TextItem, "pyt") == [1, 2]
+
+    @pytest.mark.parametrize("action", ["degrade"])
+    def test_uses_search_vector_index(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        session.execute(text("SET LOCAL enable_seqscan = off"))
+        compiled = search(sa.select(TextItem.id), "py index").compile(
+            dialect=session.bind.dialect,  # type: ignore[union-attr]
+            compile_kwargs={"literal_binds": True},
+        )
+        plan = "\n".join(session.scalars(text(f"EXPLAIN {compiled}")))
+        assert "ix_textitem_search_vector" in plan
+
+
+class TestManyLimits:
+    @pytest.fixture
+    def vector_options(self) -> dict[str, Any]:
+        return {
+            "max_query_or_branches": QueryLimit(1, "degrade"),
+            "max_query_terms": QueryLimit(2, "truncate"),
+            "min_prefix_length": QueryLimit(2, "degrade"),
+        }
+
+    def test_reports_applied_limits_in_order(self, TextItem: type[Any]) -> None:
+        limited_query = limit(TextItem, "x or python or java")
+        assert limited_query.search_query == "x python"
+        assert limited_query.applied_limits == (
+            AppliedLimit("max_query_or_branches", QueryLimit(1, "degrade"), 3),
+            AppliedLimit("max_query_terms", QueryLimit(2, "truncate"), 3),
+            AppliedLimit("min_prefix_length", QueryLimit(2, "degrade"), 1),
+        )
+
+    def test_search_applies_limits(
+        self, session: Session, TextItem: type[Any], items: None
+    ) -> None:
+        assert search_ids(session, TextItem, "x or files or java") == [4]
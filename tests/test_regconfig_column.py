@@ -0,0 +1,187 @@
+from typing import Any
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, Session
+from sqlalchemy_utils import TSVectorType
+
+from sqlalchemy_searchable import batch_search, search, SearchOptions, sync_trigger
+from sqlalchemy_searchable.worker import process_search_queue
+
+ENGLISH = "pg_catalog.english"
+FINNISH = "pg_catalog.finnish"
+
+
+@pytest.fixture
+def models(TextItem: type[Any]) -> None:
+    pass
+
+
+@pytest.fixture
+def vector_options() -> dict[str, Any]:
+    return {}
+
+
+@pytest.fixture
+def TextItem(Base: type[DeclarativeBase], vector_options: dict[str, Any]) -> type[Any]:
+    class TextItem(Base):  # type: ignore[valid-type, misc]
+        __tablename__ = "textitem"
+
+        id: Mapped[int] = mapped_column(primary_key=True)
+        name: Mapped[str]
+        content: Mapped[str]
+        lang: Mapped[str | None]
+        search_vector: Mapped[TSVectorType | None] = mapped_column(
+            TSVectorType("name", "content", regconfig_column="lang", **vector_options)
+        )
+
+    return TextItem
+
+
+@pytest.fixture
+def items(session: Session, TextItem: type[Any]) -> None:
+    session.add_all(
+        [
+            TextItem(id=1, name="kissat", content="juoksivat", lang=FINNISH),
+            TextItem(id=2, name="cats", content="running", lang=ENGLISH),
+            TextItem(id=3, name="cats", content="running", lang=None),
+        ]
+    )
+    session.commit()
+
+
+def vectors(session: Session, TextItem: type[Any]) -> list[str]:
+    return list(
+        session.scalars(sa.select(TextItem.search_vector).order_by(TextItem.id))
+    )
+
+
+def search_ids(
+    session: Session, TextItem: type[Any], search_query: str, regconfig: Any
+) -> Any:
+    query = sa.select(TextItem.id).order_by(TextItem.id)
+    return session.scalars(search(query, search_query, regconfig=regconfig)).all()
+
+
+class TestRegconfigColumn:
+    @pytest.fixture(autouse=True)
+    def setup_items(self, items: None) -> None:
+        pass
+
+    def test_vectorizes_rows_using_their_regconfig(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        assert vectors(session, TextItem) == [
+            "'juoksiv':2 'kis':1",
+            "'cat':1 'run':2",
+            "'cat':1 'run':2",
+        ]
+
+    def test_revectorizes_rows_whose_regconfig_changes(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        session.execute(sa.update(TextItem).values(lang=FINNISH).where(TextItem.id > 1))
+        session.execute(
+            sa.update(TextItem).values(lang=ENGLISH).where(TextItem.id == 1)
+        )
+        assert vectors(session, TextItem) == [
+            "'juoksivat':2 'kissat':1",
+            "'cats':1 'running':2",
+            "'cats':1 'running':2",
+        ]
+
+    def test_search_with_regconfig(self, session: Session, TextItem: type[Any]) -> None:
+        assert search_ids(session, TextItem, "kissat", FINNISH) == [1]
+        assert search_ids(session, TextItem, "kissat", ENGLISH) == []
+        assert search_ids(session, TextItem, "running cats", ENGLISH) == [2, 3]
+        assert search_ids(session, TextItem, "running cats", FINNISH) == []
+
+    def test_search_with_many_regconfigs(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        regconfigs = [ENGLISH, FINNISH]
+        assert search_ids(session, TextItem, "kissat", regconfigs) == [1]
+        assert search_ids(session, TextItem, "cats", regconfigs) == [2, 3]
+        assert search_ids(session, TextItem, "kissat or cats", regconfigs) == [1, 2, 3]
+
+    def test_search_requires_regconfigs(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        with pytest.raises(ValueError, match="regconfig"):
+            search(sa.select(TextItem.id), "cats", regconfig=[])
+
+    def test_batch_search_with_many_regconfigs(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        query = sa.select(TextItem.id).order_by(TextItem.id)
+        results = batch_search(
+            session, query, ["kissat", "running"], limit=5, regconfig=[ENGLISH, FINNISH]
+        )
+        assert results == [[(1,)], [(2,), (3,)]]
+
+    def test_search_with_many_regconfigs_uses_index(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        session.execute(text("SET LOCAL enable_seqscan = off"))
+        compiled = search(
+            sa.select(TextItem.id), "kissat", regconfig=[ENGLISH, FINNISH]
+        ).compile(
+            dialect=session.bind.dialect,  # type: ignore[union-attr]
+            compile_kwargs={"literal_binds": True},
+        )
+        plan = "\n".join(session.scalars(text(f"EXPLAIN {compiled}")))
+        assert "ix_textitem_search_vector" in plan
+
+
+class TestCachedRegconfigColumn:
+    @pytest.fixture
+    def vector_options(self) -> dict[str, Any]:
+        return {"cache_column_vectors": True}
+
+    def test_revectorizes_rows_whose_regconfig_changes(
+        self, session: Session, TextItem: type[Any], items: None
+    ) -> None:
+        session.execute(
+            sa.update(TextItem).values(lang=ENGLISH).where(TextItem.id == 1)
+        )
+        assert vectors(session, TextItem)[0] == "'juoksivat':2 'kissat':1"
+
+
+class TestQueuedRegconfigColumn:
+    @pytest.fixture
+    def vector_options(self) -> dict[str, Any]:
+        return {"queue_updates": True}
+
+    def test_queues_rows_whose_regconfig_changes(
+        self, engine: Engine, session: Session, TextItem: type[Any], items: None
+    ) -> None:
+        column = TextItem.__table__.c.search_vector
+        with engine.begin() as conn:
+            process_search_queue(conn, column)
+            conn.execute(
+                sa.update(TextItem).values(lang=ENGLISH).where(TextItem.id == 1)
+            )
+            process_search_queue(conn, column)
+        assert vectors(session, TextItem)[0] == "'juoksivat':2 'kissat':1"
+
+
+class TestSyncTriggerWithRegconfigColumn:
+    def test_revectorizes_existing_rows(
+        self, engine: Engine, session: Session, TextItem: type[Any], items: None
+    ) -> None:
+        with engine.begin() as conn:
+            conn.execute(text("UPDATE textitem SET lang = 'pg_catalog.simple'"))
+            sync_trigger(
+                conn,
+                "textitem",
+                "search_vector",
+                ["name", "content"],
+                options=SearchOptions(regconfig_column="lang"),
+            )
+        assert vectors(session, TextItem) == [
+            "'juoksivat':2 'kissat':1",
+            "'cats':1 'running':2",
+            "'cats':1 'running':2",
+        ]
@@ -0,0 +1,147 @@
+from typing import Any
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import text
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    mapped_column,
+    relationship,
+    Session,
+)
+from sqlalchemy_utils import TSVectorType
+
+from sqlalchemy_searchable import search, SearchOptions, sync_trigger
+
+
+@pytest.fixture
+def models(Article: type[Any]) -> None:
+    pass
+
+
+@pytest.fixture
+def Article(Base: type[DeclarativeBase]) -> type[Any]:
+    article_tag = sa.Table(
+        "article_tag",
+        Base.metadata,
+        sa.Column("article_id", sa.ForeignKey("article.id"), primary_key=True),
+        sa.Column("tag_id", sa.ForeignKey("tag.id"), primary_key=True),
+    )
+
+    class Author(Base):  # type: ignore[valid-type, misc]
+        __tablename__ = "author"
+
+        id: Mapped[int] = mapped_column(primary_key=True)
+        name: Mapped[str]
+
+    class Tag(Base):  # type: ignore[valid-type, misc]
+        __tablename__ = "tag"
+
+        id: Mapped[int] = mapped_column(primary_key=True)
+        name: Mapped[str]
+
+    class Article(Base):  # type: ignore[valid-type, misc]
+        __tablename__ = "article"
+
+        id: Mapped[int] = mapped_column(primary_key=True)
+        name: Mapped[str]
+        author_id: Mapped[int | None] = mapped_column(sa.ForeignKey(Author.id))
+        search_vector: Mapped[TSVectorType] = mapped_column(
+            TSVectorType(
+                "name",
+                related={
+                    "author": ["name"],
+                    "comment": ["content"],
+                    "tag": ["name"],
+                },
+                weights={"name": "A", "tag.name": "B"},
+            )
+        )
+
+        author: Mapped[Author | None] = relationship()
+        comments: Mapped[list["Comment"]] = relationship(cascade="all, delete-orphan")
+        tags: Mapped[list[Tag]] = relationship(secondary=article_tag)
+
+    class Comment(Base):  # type: ignore[valid-type, misc]
+        __tablename__ = "comment"
+
+        id: Mapped[int] = mapped_column(primary_key=True)
+        article_id: Mapped[int] = mapped_column(sa.ForeignKey(Article.id))
+        content: Mapped[str]
+
+    Article.Author = Author
+    Article.Comment = Comment
+    Article.Tag = Tag
+    return Article
+
+
+class TestRelatedColumns:
+    @pytest.fixture
+    def article(self, session: Session, Article: type[Any]) -> Any:
+        article = Article(
+            id=1,
+            name="first article",
+            author=Article.Author(id=1, name="alice"),
+            comments=[Article.Comment(id=1, content="great")],
+            tags=[Article.Tag(id=1, name="python")],
+        )
+        session.add(article)
+        session.flush()
+        return article
+
+    def vector(self, session: Session) -> Any:
+        return session.scalars(text("SELECT search_vector FROM article")).one()
+
+    def test_computes_vector_with_related_columns(
+        self, session: Session, article: Any
+    ) -> None:
+        assert self.vector(session) == (
+            "'alic':3 'articl':2A 'first':1A 'great':4 'python':5B"
+        )
+
+    def test_updates_vector_on_many_to_one_change(
+        self, session: Session, article: Any
+    ) -> None:
+        article.author.name = "bob"
+        session.flush()
+        assert "'bob':3" in self.vector(session)
+
+    def test_updates_vector_on_one_to_many_change(
+        self, session: Session, article: Any, Article: type[Any]
+    ) -> None:
+        article.comments.append(Article.Comment(id=2, content="nice"))
+        session.flush()
+        assert "'nice'" in self.vector(session)
+        article.comments = []
+        session.flush()
+        assert "'great'" not in self.vector(session)
+        assert "'nice'" not in self.vector(session)
+
+    def test_updates_vector_on_many_to_many_change(
+        self, session: Session, article: Any, Article: type[Any]
+    ) -> None:
+        article.tags[0].name = "postgres"
+        session.flush()
+        assert "'postgr':5B" in self.vector(session)
+        article.tags.append(Article.Tag(id=2, name="search"))
+        session.flush()
+        assert "'search':6B" in self.vector(session)
+        article.tags = []
+        session.flush()
+        assert self.vector(session) == "'alic':3 'articl':2A 'first':1A 'great':4"
+
+    def test_search_by_related_column(
+        self, session: Session, article: Any, Article: type[Any]
+    ) -> None:
+        query = search(sa.select(Article), "python")
+        assert session.scalars(query).all() == [article]
+
+    def test_sync_trigger(self, session: Session, article: Any) -> None:
+        options = SearchOptions(related={"tag": ["name"]})
+        sync_trigger(
+            session.connection(), "article", "search_vector", ["name"], options=options
+        )
+        assert self.vector(session) == "'articl':2 'first':1 'python':3"
+        session.execute(text("UPDATE tag SET name = 'search'"))
+        assert self.vector(session) == "'articl':2 'first':1 'search':3"
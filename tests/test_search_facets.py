@@ -0,0 +1,148 @@
+from typing import Any
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, Session
+from sqlalchemy_utils import TSVectorType
+
+from sqlalchemy_searchable import search_facets
+
+
+@pytest.fixture
+def models(TextItem: type[Any]) -> None:
+    pass
+
+
+@pytest.fixture
+def TextItem(Base: type[DeclarativeBase]) -> type[Any]:
+    class TextItem(Base):  # type: ignore[valid-type, misc]
+        __tablename__ = "textitem"
+
+        id: Mapped[int] = mapped_column(primary_key=True)
+        name: Mapped[str]
+        category: Mapped[str | None]
+        author: Mapped[str]
+        year: Mapped[int]
+        search_vector: Mapped[TSVectorType] = mapped_column(TSVectorType("name"))
+
+    return TextItem
+
+
+@pytest.fixture(autouse=True)
+def items(session: Session, TextItem: type[Any]) -> None:
+    session.add_all(
+        [
+            TextItem(id=1, name="python", category="a", author="x", year=2024),
+            TextItem(id=2, name="python", category="a", author="y", year=2025),
+            TextItem(id=3, name="python", category="b", author="x", year=2025),
+            TextItem(id=4, name="python", category=None, author="x", year=2025),
+            TextItem(id=5, name="index", category="b", author="y", year=2024),
+        ]
+    )
+    session.commit()
+
+
+@pytest.fixture
+def statements(engine: Engine) -> Any:
+    statements: list[str] = []
+
+    def before_cursor_execute(*args: Any) -> None:
+        statements.append(args[2])
+
+    sa.event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    sa.event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def facets(TextItem: type[Any]) -> dict[str, Any]:
+    return {
+        "category": TextItem.category,
+        "author": TextItem.author,
+        "year": TextItem.year,
+    }
+
+
+class TestSearchFacets:
+    def test_counts_facets_in_single_statement(
+        self, session: Session, TextItem: type[Any], statements: list[str]
+    ) -> None:
+        query = sa.select(TextItem).order_by(TextItem.id)
+        assert search_facets(session, query, "python", facets(TextItem)) == {
+            "category": [("a", 2), ("b", 1), (None, 1)],
+            "author": [("x", 3), ("y", 1)],
+            "year": [(2025, 3), (2024, 1)],
+        }
+        assert len(statements) == 1
+        assert "GROUPING SETS" in statements[0]
+
+    def test_limits_values_of_each_facet(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        query = sa.select(TextItem.id)
+        assert search_facets(session, query, "python", facets(TextItem), limit=1) == {
+            "category": [("a", 2)],
+            "author": [("x", 3)],
+            "year": [(2025, 3)],
+        }
+
+    def test_counts_expressions(self, session: Session, TextItem: type[Any]) -> None:
+        query = sa.select(TextItem.id).where(TextItem.year == 2025)
+        counts = search_facets(
+            session,
+            query,
+            "python",
+            {"author": sa.func.upper(TextItem.author)},
+        )
+        assert counts == {"author": [("X", 2), ("Y", 1)]}
+
+    def test_without_matches(self, session: Session, TextItem: type[Any]) -> None:
+        counts = search_facets(
+            session, sa.select(TextItem.id), "missing", facets(TextItem)
+        )
+        assert counts == {"category": [], "author": [], "year": []}
+
+    def test_without_facets(self, session: Session, TextItem: type[Any]) -> None:
+        assert search_facets(session, sa.select(TextItem.id), "python", {}) == {}
+
+
+class TestSampledSearchFacets:
+    def test_samples_searched_table(
+        self, session: Session, TextItem: type[Any], statements: list[str]
+    ) -> None:
+        counts = search_facets(
+            session,
+            sa.select(TextItem),
+            "python",
+            facets(TextItem),
+            sample_percent=100,
+        )
+        assert counts == {
+            "category": [("a", 2), ("b", 1), (None, 1)],
+            "author": [("x", 3), ("y", 1)],
+            "year": [(2025, 3), (2024, 1)],
+        }
+        assert "TABLESAMPLE system" in statements[0]
+
+    def test_scales_counts(self, session: Session, TextItem: type[Any]) -> None:
+        counts = search_facets(
+            session,
+            sa.select(TextItem),
+            "python",
+            {"author": TextItem.author},
+            sample_percent=50,
+        )
+        assert all(count % 2 == 0 for _, count in counts["author"])
+
+    def test_requires_search_vector_column(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        with pytest.raises(ValueError, match="Sampling"):
+            search_facets(
+                session,
+                sa.select(TextItem),
+                "python",
+                {"author": TextItem.author},
+                sample_percent=50,
+                vector=sa.func.to_tsvector(TextItem.name),  # type: ignore[arg-type]
+            )
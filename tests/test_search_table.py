@@ -0,0 +1,146 @@
+from typing import Any
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, Session
+
+from sqlalchemy_searchable import (
+    deferred_search_vectors,
+    search,
+    search_table,
+    SearchOptions,
+    sync_all_triggers,
+    sync_trigger,
+)
+from tests.schema_test_case import SchemaTestCase
+
+
+@pytest.fixture
+def models(TextItem: type[Any], textitem_search: sa.Table) -> None:
+    pass
+
+
+@pytest.fixture
+def TextItem(Base: type[DeclarativeBase]) -> type[Any]:
+    class TextItem(Base):  # type: ignore[valid-type, misc]
+        __tablename__ = "textitem"
+
+        id: Mapped[int] = mapped_column(primary_key=True)
+        name: Mapped[str]
+        content: Mapped[str]
+
+    return TextItem
+
+
+@pytest.fixture
+def textitem_search(TextItem: type[Any]) -> sa.Table:
+    return search_table(TextItem, "name", "content", weights={"name": "A"})
+
+
+class TestCreateSearchTable(SchemaTestCase):
+    @pytest.fixture
+    def should_create_triggers(self) -> list[str]:
+        return ["textitem_search_vector_trigger"]
+
+    def test_creates_search_table(self, session: Session) -> None:
+        inspector = sa.inspect(session.connection())
+        assert [column["name"] for column in inspector.get_columns("textitem")] == [
+            "id",
+            "name",
+            "content",
+        ]
+        assert [
+            column["name"] for column in inspector.get_columns("textitem_search")
+        ] == ["id", "search_vector"]
+        assert [
+            index["name"] for index in inspector.get_indexes("textitem_search")
+        ] == ["ix_textitem_search_search_vector"]
+
+
+class TestSearchTable:
+    def vectors(self, session: Session) -> list[Any]:
+        return list(
+            session.execute(
+                text("SELECT id, search_vector FROM textitem_search ORDER BY id")
+            ).tuples()
+        )
+
+    def test_inserts_search_vectors(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        session.add(TextItem(id=1, name="some name", content="some content"))
+        session.flush()
+        assert self.vectors(session) == [(1, "'content':4 'name':2A")]
+
+    def test_updates_search_vectors(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        item = TextItem(id=1, name="some name", content="some content")
+        session.add(item)
+        session.flush()
+        item.content = "new content"
+        session.flush()
+        assert self.vectors(session) == [(1, "'content':4 'name':2A 'new':3")]
+
+    def test_deletes_search_vectors(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        item = TextItem(id=1, name="some name", content="some content")
+        session.add(item)
+        session.flush()
+        session.delete(item)
+        session.flush()
+        assert self.vectors(session) == []
+
+    @pytest.mark.parametrize("sort", [False, True])
+    def test_search_joins_search_table(
+        self, session: Session, TextItem: type[Any], sort: bool
+    ) -> None:
+        session.add_all(
+            [
+                TextItem(id=1, name="some name", content="some content"),
+                TextItem(id=2, name="new name", content="new content"),
+            ]
+        )
+        session.flush()
+        query = search(sa.select(TextItem), "new", sort=sort)
+        assert session.scalars(query).all() == [session.get(TextItem, 2)]
+
+    def test_sync_trigger(self, session: Session, TextItem: type[Any]) -> None:
+        session.add(TextItem(id=1, name="some name", content="some content"))
+        session.flush()
+        session.execute(text("DELETE FROM textitem_search"))
+        sync_trigger(
+            session.connection(),
+            "textitem",
+            "search_vector",
+            ["content"],
+            options=SearchOptions(search_table=True),
+        )
+        assert self.vectors(session) == [(1, "'content':2")]
+        session.execute(text("UPDATE textitem SET content = 'new content'"))
+        assert self.vectors(session) == [(1, "'content':2 'new':1")]
+
+    def test_sync_all_triggers(
+        self, session: Session, Base: type[DeclarativeBase], TextItem: type[Any]
+    ) -> None:
+        session.add(TextItem(id=1, name="some name", content="some content"))
+        session.flush()
+        session.execute(text("DELETE FROM textitem_search"))
+        sync_all_triggers(session.connection(), Base.metadata)
+        assert self.vectors(session) == [(1, "'content':4 'name':2A")]
+
+    def test_deferred_search_vectors(self, engine: Engine, TextItem: type[Any]) -> None:
+        with engine.begin() as conn:
+            with deferred_search_vectors(conn, TextItem):
+                conn.execute(
+                    sa.insert(TextItem),
+                    [{"id": 1, "name": "some name", "content": "some content"}],
+                )
+                assert conn.scalar(text("SELECT count(*) FROM textitem_search")) == 0
+            assert list(
+                conn.execute(text("SELECT id, search_vector FROM textitem_search"))
+            ) == [(1, "'content':4 'name':2A")]
+            conn.execute(text("DELETE FROM textitem"))
@@ -0,0 +1,81 @@
+from typing import Any
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import text
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, Session
+from sqlalchemy_utils import TSVectorType
+
+from sqlalchemy_searchable import search_vector_truncation
+
+
+@pytest.fixture
+def models(TextItem: type[Any]) -> None:
+    pass
+
+
+@pytest.fixture
+def TextItem(Base: type[DeclarativeBase]) -> type[Any]:
+    class TextItem(Base):  # type: ignore[valid-type, misc]
+        __tablename__ = "textitem"
+
+        id: Mapped[int] = mapped_column(primary_key=True)
+        name: Mapped[str]
+        content: Mapped[str]
+        search_vector: Mapped[TSVectorType] = mapped_column(
+            TSVectorType(
+                "name",
+                "content",
+                max_characters={"name": 10},
+                max_words={"content": 3},
+            )
+        )
+
+    return TextItem
+
+
+class TestSizeLimits:
+    def vector(self, session: Session) -> Any:
+        return session.scalars(text("SELECT search_vector FROM textitem")).one()
+
+    def test_truncates_characters(self, session: Session, TextItem: type[Any]) -> None:
+        session.add(TextItem(id=1, name="abcdefghijklmno", content=""))
+        session.flush()
+        assert self.vector(session) == "'abcdefghij':1"
+
+    def test_truncates_words(self, session: Session, TextItem: type[Any]) -> None:
+        session.add(
+            TextItem(id=1, name="", content="  first second\nthird fourth fifth")
+        )
+        session.flush()
+        assert self.vector(session) == "'first':1 'second':2 'third':3"
+
+    def test_keeps_values_within_limits(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        session.add(TextItem(id=1, name="name", content="some content"))
+        session.flush()
+        assert self.vector(session) == "'content':3 'name':1"
+
+    def test_search_vector_truncation(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        session.add_all(
+            [
+                TextItem(id=1, name="name", content="some content"),
+                TextItem(id=2, name="abcdefghijklmno", content="one two"),
+                TextItem(id=3, name="name", content="one two three four"),
+                TextItem(id=4, name="abcdefghijklmno", content="one two three four"),
+            ]
+        )
+        session.flush()
+        assert search_vector_truncation(
+            session.connection(), TextItem.__table__.c.search_vector
+        ) == {"name": 2, "content": 2}
+
+    def test_search_vector_truncation_without_limits(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        column: sa.Column[Any] = sa.Column("search_vector", TSVectorType("name"))
+        sa.Table("other", sa.MetaData(), sa.Column("name", sa.Text), column)
+        assert search_vector_truncation(session.connection(), column) == {}
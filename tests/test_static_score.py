@@ -0,0 +1,137 @@
+from typing import Any
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import text
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, Session
+from sqlalchemy_utils import TSVectorType
+
+from sqlalchemy_searchable import search
+
+
+@pytest.fixture
+def models(TextItem: type[Any]) -> None:
+    pass
+
+
+@pytest.fixture
+def TextItem(Base: type[DeclarativeBase]) -> type[Any]:
+    class TextItem(Base):  # type: ignore[valid-type, misc]
+        __tablename__ = "textitem"
+
+        id: Mapped[int] = mapped_column(primary_key=True)
+        name: Mapped[str]
+        popularity: Mapped[int | None]
+        search_vector: Mapped[TSVectorType] = mapped_column(TSVectorType("name"))
+
+    sa.Index("ix_textitem_popularity", TextItem.popularity.desc().nulls_last())
+    return TextItem
+
+
+@pytest.fixture
+def items(session: Session, TextItem: type[Any]) -> None:
+    session.add_all(
+        [
+            TextItem(id=1, name="python python python", popularity=0),
+            TextItem(id=2, name="python", popularity=1000),
+            TextItem(id=3, name="python python", popularity=None),
+            TextItem(id=4, name="index", popularity=5000),
+        ]
+    )
+    session.commit()
+
+
+def search_ids(session: Session, TextItem: type[Any], **kwargs: Any) -> Any:
+    return session.scalars(search(sa.select(TextItem.id), "python", **kwargs)).all()
+
+
+class TestStaticScore:
+    @pytest.fixture(autouse=True)
+    def setup_items(self, items: None) -> None:
+        pass
+
+    def test_sort_by_relevance(self, session: Session, TextItem: type[Any]) -> None:
+        assert search_ids(session, TextItem, sort=True) == [1, 3, 2]
+
+    def test_sort_by_blended_score(self, session: Session, TextItem: type[Any]) -> None:
+        ids = search_ids(session, TextItem, sort=True, static_score=TextItem.popularity)
+        assert ids == [2, 1, 3]
+
+    def test_sort_by_custom_blend(self, session: Session, TextItem: type[Any]) -> None:
+        ids = search_ids(
+            session,
+            TextItem,
+            sort=True,
+            static_score=TextItem.popularity,
+            blend=lambda rank, score: rank + sa.func.coalesce(score, 2000),
+        )
+        assert ids == [3, 2, 1]
+
+    def test_static_order(self, session: Session, TextItem: type[Any]) -> None:
+        ids = search_ids(
+            session, TextItem, static_score=TextItem.popularity, static_order=True
+        )
+        assert ids == [2, 1, 3]
+
+    def test_static_order_with_limit(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        query = search(
+            sa.select(TextItem.id).limit(1),
+            "python",
+            static_score=TextItem.popularity,
+            static_order=True,
+        )
+        assert session.scalars(query).all() == [2]
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"blend": lambda rank, score: rank},
+            {"static_order": True},
+        ],
+    )
+    def test_requires_static_score(
+        self, TextItem: type[Any], kwargs: dict[str, Any]
+    ) -> None:
+        with pytest.raises(ValueError, match="static_score"):
+            search(sa.select(TextItem.id), "python", **kwargs)
+
+    def test_static_order_cannot_be_combined_with_sort(
+        self, TextItem: type[Any]
+    ) -> None:
+        with pytest.raises(ValueError, match="mutually exclusive"):
+            search(
+                sa.select(TextItem.id),
+                "python",
+                sort=True,
+                static_score=TextItem.popularity,
+                static_order=True,
+            )
+
+
+class TestStaticOrderIndexWalk:
+    def test_walks_static_score_index(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        session.execute(
+            sa.insert(TextItem),
+            [
+                {"id": id, "name": "python index", "popularity": id}
+                for id in range(1, 5001)
+            ],
+        )
+        session.execute(text("ANALYZE textitem"))
+        query = search(
+            sa.select(TextItem.id).limit(10),
+            "python",
+            static_score=TextItem.popularity,
+            static_order=True,
+        )
+        compiled = query.compile(
+            dialect=session.bind.dialect,  # type: ignore[union-attr]
+            compile_kwargs={"literal_binds": True},
+        )
+        plan = "\n".join(session.scalars(text(f"EXPLAIN {compiled}")))
+        assert "Index Scan using ix_textitem_popularity" in plan
+        assert session.scalars(query).all() == list(range(5000, 4990, -1))
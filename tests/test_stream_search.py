@@ -0,0 +1,160 @@
+import asyncio
+from typing import Any
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, Session
+from sqlalchemy_utils import TSVectorType
+
+from sqlalchemy_searchable import stream_search, stream_search_async
+
+
+@pytest.fixture
+def models(TextItem: type[Any]) -> None:
+    pass
+
+
+@pytest.fixture
+def TextItem(Base: type[DeclarativeBase]) -> type[Any]:
+    class TextItem(Base):  # type: ignore[valid-type, misc]
+        __tablename__ = "textitem"
+
+        id: Mapped[int] = mapped_column(primary_key=True)
+        name: Mapped[str]
+        search_vector: Mapped[TSVectorType] = mapped_column(TSVectorType("name"))
+
+    return TextItem
+
+
+@pytest.fixture
+def items(session: Session, TextItem: type[Any]) -> None:
+    session.execute(
+        sa.insert(TextItem),
+        [{"id": id, "name": "python" if id % 5 else "index"} for id in range(1, 31)],
+    )
+    session.commit()
+
+
+MATCHING_IDS = [id for id in range(1, 31) if id % 5]
+
+
+@pytest.fixture
+def statements(engine: Engine) -> Any:
+    statements: list[str] = []
+
+    def before_cursor_execute(*args: Any) -> None:
+        statements.append(args[2])
+
+    sa.event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    sa.event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def open_cursors(conn: sa.Connection) -> int:
+    return int(conn.scalar(text("SELECT count(*) FROM pg_cursors")))
+
+
+class TestStreamSearch:
+    @pytest.fixture(autouse=True)
+    def setup_items(self, items: None) -> None:
+        pass
+
+    def test_streams_results_from_server_side_cursor(
+        self, engine: Engine, TextItem: type[Any]
+    ) -> None:
+        query = sa.select(TextItem.id).order_by(TextItem.id)
+        with engine.connect() as conn:
+            results = stream_search(conn, query, "python", batch_size=5)
+            assert next(results) == (1,)
+            assert open_cursors(conn) == 1
+            assert [(1,), *results] == [(id,) for id in MATCHING_IDS]
+            assert open_cursors(conn) == 0
+
+    def test_closes_cursor_when_closed(
+        self, engine: Engine, TextItem: type[Any]
+    ) -> None:
+        with engine.connect() as conn:
+            results = stream_search(conn, sa.select(TextItem.id), "python")
+            next(results)
+            results.close()
+            assert open_cursors(conn) == 0
+
+    def test_streams_entities(self, session: Session, TextItem: type[Any]) -> None:
+        query = sa.select(TextItem).order_by(TextItem.id)
+        results = [
+            item.id for (item,) in stream_search(session, query, "python", batch_size=5)
+        ]
+        assert results == MATCHING_IDS
+
+    def test_sort(self, session: Session, TextItem: type[Any]) -> None:
+        results = stream_search(session, sa.select(TextItem.id), "python", sort=True)
+        assert sorted(results) == [(id,) for id in MATCHING_IDS]
+
+
+class TestKeysetStreamSearch:
+    @pytest.fixture(autouse=True)
+    def setup_items(self, items: None) -> None:
+        pass
+
+    def test_fetches_batches_with_separate_statements(
+        self, engine: Engine, TextItem: type[Any], statements: list[str]
+    ) -> None:
+        query = sa.select(TextItem.id, TextItem.name).order_by(TextItem.name)
+        with engine.connect() as conn:
+            results = list(
+                stream_search(conn, query, "python", batch_size=10, keyset=True)
+            )
+        assert results == [(id, "python") for id in MATCHING_IDS]
+        assert len(statements) == 3
+
+    def test_streams_entities(self, session: Session, TextItem: type[Any]) -> None:
+        results = [
+            item.id
+            for (item,) in stream_search(
+                session, sa.select(TextItem), "python", batch_size=7, keyset=True
+            )
+        ]
+        assert results == MATCHING_IDS
+
+    def test_cannot_be_combined_with_sort(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        with pytest.raises(ValueError, match="sort"):
+            list(
+                stream_search(
+                    session, sa.select(TextItem), "python", keyset=True, sort=True
+                )
+            )
+
+
+class TestStreamSearchAsync:
+    @pytest.fixture(autouse=True)
+    def setup_items(self, items: None) -> None:
+        pass
+
+    @pytest.mark.parametrize("keyset", [False, True])
+    def test_streams_results(
+        self, engine: Engine, TextItem: type[Any], keyset: bool
+    ) -> None:
+        pytest.importorskip("asyncpg")
+
+        async def stream() -> list[tuple[Any, ...]]:
+            async_engine = create_async_engine(
+                engine.url.set(drivername="postgresql+asyncpg")
+            )
+            query = sa.select(TextItem.id).order_by(TextItem.id)
+            try:
+                async with async_engine.connect() as conn:
+                    return [
+                        row
+                        async for row in stream_search_async(
+                            conn, query, "python", batch_size=5, keyset=keyset
+                        )
+                    ]
+            finally:
+                await async_engine.dispose()
+
+        assert asyncio.run(stream()) == [(id,) for id in MATCHING_IDS]
@@ -0,0 +1,184 @@
+from typing import Any
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, Session
+from sqlalchemy_utils import TSVectorType
+
+from sqlalchemy_searchable import search, SearchOptions, suggest, sync_trigger
+
+
+@pytest.fixture
+def models(TextItem: type[Any]) -> None:
+    pass
+
+
+@pytest.fixture
+def vector_options() -> dict[str, Any]:
+    return {"lexeme_dictionary": True}
+
+
+@pytest.fixture
+def TextItem(Base: type[DeclarativeBase], vector_options: dict[str, Any]) -> type[Any]:
+    class TextItem(Base):  # type: ignore[valid-type, misc]
+        __tablename__ = "textitem"
+
+        id: Mapped[int] = mapped_column(primary_key=True)
+        name: Mapped[str]
+        search_vector: Mapped[TSVectorType] = mapped_column(
+            TSVectorType("name", **vector_options)
+        )
+
+    return TextItem
+
+
+@pytest.fixture
+def items(session: Session, TextItem: type[Any]) -> None:
+    session.add_all(
+        [
+            TextItem(id=1, name="python programming"),
+            TextItem(id=2, name="python projects"),
+            TextItem(id=3, name="prolog programming"),
+            TextItem(id=4, name="index"),
+        ]
+    )
+    session.commit()
+
+
+def lexemes(session: Session) -> list[tuple[str, int]]:
+    rows = session.execute(
+        text("SELECT lexeme, ndoc FROM textitem_search_vector_lexemes ORDER BY 1")
+    )
+    return [(lexeme, ndoc) for lexeme, ndoc in rows]
+
+
+class TestLexemeDictionary:
+    @pytest.fixture(autouse=True)
+    def setup_items(self, items: None) -> None:
+        pass
+
+    def test_counts_inserted_rows(self, session: Session) -> None:
+        assert lexemes(session) == [
+            ("index", 1),
+            ("program", 2),
+            ("project", 1),
+            ("prolog", 1),
+            ("python", 2),
+        ]
+
+    def test_counts_updated_rows(self, session: Session, TextItem: type[Any]) -> None:
+        session.execute(
+            sa.update(TextItem).values(name="python index").where(TextItem.id > 2)
+        )
+        assert lexemes(session) == [
+            ("index", 2),
+            ("program", 1),
+            ("project", 1),
+            ("python", 4),
+        ]
+
+    def test_counts_deleted_rows(self, session: Session, TextItem: type[Any]) -> None:
+        session.execute(sa.delete(TextItem).where(TextItem.id < 3))
+        assert lexemes(session) == [("index", 1), ("program", 1), ("prolog", 1)]
+
+    def test_truncate(self, session: Session) -> None:
+        session.execute(text("TRUNCATE textitem"))
+        assert lexemes(session) == []
+
+
+class TestSuggest:
+    @pytest.fixture(autouse=True)
+    def setup_items(self, items: None) -> None:
+        pass
+
+    def test_suggests_most_common_lexemes_first(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        column = TextItem.__table__.c.search_vector
+        assert suggest(session, column, "Pro") == [
+            ("program", 2),
+            ("project", 1),
+            ("prolog", 1),
+        ]
+        assert suggest(session, column, "pro", limit=2) == [
+            ("program", 2),
+            ("project", 1),
+        ]
+        assert suggest(session, column, "java") == []
+
+    def test_suggestions_match_rows(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        column = TextItem.__table__.c.search_vector
+        [(lexeme, ndoc)] = suggest(session, column, "proj")
+        query = search(sa.select(TextItem.id), lexeme)
+        assert len(session.scalars(query).all()) == ndoc
+
+    def test_escapes_like_wildcards(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        column = TextItem.__table__.c.search_vector
+        assert suggest(session, column, "%") == []
+        assert suggest(session, column, "p_o") == []
+
+    def test_uses_primary_key_index(self, session: Session) -> None:
+        session.execute(text("SET LOCAL enable_seqscan = off"))
+        plan = "\n".join(
+            session.scalars(
+                text(
+                    "EXPLAIN SELECT * FROM textitem_search_vector_lexemes"
+                    " WHERE lexeme LIKE 'pro%'"
+                )
+            )
+        )
+        assert "textitem_search_vector_lexemes_pkey" in plan
+        assert "Index Cond" in plan
+
+    def test_requires_lexeme_dictionary_option(
+        self, session: Session, Base: type[DeclarativeBase]
+    ) -> None:
+        class OtherItem(Base):  # type: ignore[valid-type, misc]
+            __tablename__ = "otheritem"
+
+            id: Mapped[int] = mapped_column(primary_key=True)
+            name: Mapped[str]
+            search_vector: Mapped[TSVectorType] = mapped_column(TSVectorType("name"))
+
+        with pytest.raises(ValueError, match="lexeme_dictionary"):
+            suggest(session, OtherItem.__table__.c.search_vector, "pro")
+
+
+class TestUnaccentedSuggest:
+    @pytest.fixture
+    def vector_options(self) -> dict[str, Any]:
+        return {"lexeme_dictionary": True, "unaccent": True}
+
+    def test_removes_accents_from_prefix(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        session.add(TextItem(id=1, name="café"))
+        session.commit()
+        column = TextItem.__table__.c.search_vector
+        assert suggest(session, column, "Caf") == [("cafe", 1)]
+        assert suggest(session, column, "Café") == [("cafe", 1)]
+
+
+class TestSyncTriggerWithLexemeDictionary:
+    def test_seeds_dictionary_from_existing_rows(
+        self, engine: Engine, session: Session, TextItem: type[Any], items: None
+    ) -> None:
+        with engine.begin() as conn:
+            conn.execute(text("DROP TABLE textitem_search_vector_lexemes CASCADE"))
+            sync_trigger(
+                conn,
+                "textitem",
+                "search_vector",
+                ["name"],
+                options=SearchOptions(lexeme_dictionary=True),
+            )
+            conn.execute(text("INSERT INTO textitem VALUES (5, 'python')"))
+        assert suggest(session, TextItem.__table__.c.search_vector, "py") == [
+            ("python", 3)
+        ]
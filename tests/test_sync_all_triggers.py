@@ -0,0 +1,88 @@
+from typing import Any
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy_utils import TSVectorType
+
+from sqlalchemy_searchable import (
+    drop_trigger,
+    SearchOptions,
+    sync_all_triggers,
+    update_search_vectors,
+)
+
+
+class TestSyncAllTriggers:
+    @pytest.fixture
+    def models(self, Base: type[DeclarativeBase]) -> None:
+        class TextItem(Base):  # type: ignore[valid-type, misc]
+            __tablename__ = "textitem"
+
+            id: Mapped[int] = mapped_column(primary_key=True)
+            name: Mapped[str]
+            content: Mapped[str]
+            search_vector: Mapped[TSVectorType | None] = mapped_column(
+                TSVectorType("name", "content", weights={"name": "A"})
+            )
+            content_search_vector: Mapped[TSVectorType | None] = mapped_column(
+                TSVectorType("content")
+            )
+
+    @pytest.fixture(autouse=True)
+    def unsynced_rows(self, engine: Engine, models: None) -> None:
+        options = SearchOptions(weights={"name": "A"})
+        with engine.begin() as conn:
+            drop_trigger(conn, "textitem", "search_vector", options=options)
+            drop_trigger(conn, "textitem", "content_search_vector")
+            conn.execute(
+                text(
+                    """INSERT INTO textitem (id, name, content)
+                    VALUES (1, 'some name', 'some content')"""
+                )
+            )
+
+    def vectors(self, conn: Connection) -> Any:
+        return conn.execute(
+            text("SELECT search_vector, content_search_vector FROM textitem")
+        ).one()
+
+    def test_creates_triggers_and_updates_rows(
+        self, engine: Engine, Base: type[DeclarativeBase]
+    ) -> None:
+        with engine.begin() as conn:
+            assert self.vectors(conn) == (None, None)
+            columns = sync_all_triggers(conn, Base.metadata)
+            assert self.vectors(conn) == ("'content':4 'name':2A", "'content':2")
+            conn.execute(text("UPDATE textitem SET content = 'new content'"))
+            assert self.vectors(conn) == (
+                "'content':4 'name':2A 'new':3",
+                "'content':2 'new':1",
+            )
+        assert [column.name for column in columns] == [
+            "search_vector",
+            "content_search_vector",
+        ]
+
+    def test_does_not_update_rows_when_updating_rows_disabled(
+        self, engine: Engine, Base: type[DeclarativeBase]
+    ) -> None:
+        with engine.begin() as conn:
+            sync_all_triggers(conn, Base.metadata, update_rows=False)
+            assert self.vectors(conn) == (None, None)
+
+    def test_ignores_other_metadata(self, engine: Engine) -> None:
+        with engine.begin() as conn:
+            assert sync_all_triggers(conn, sa.MetaData()) == []
+
+    @pytest.mark.parametrize("max_workers", [1, 2])
+    def test_update_search_vectors(
+        self, engine: Engine, Base: type[DeclarativeBase], max_workers: int
+    ) -> None:
+        with engine.begin() as conn:
+            columns = sync_all_triggers(conn, Base.metadata, update_rows=False)
+        update_search_vectors(engine, columns, max_workers=max_workers)
+        with engine.begin() as conn:
+            assert self.vectors(conn) == ("'content':4 'name':2A", "'content':2")
@@ -227,3 +227,106 @@ class TestSyncTrigger:
             )
             # raises ProgrammingError without reserved_words:
             conn.execute(text("UPDATE article SET name=name"))
+
+    def test_dry_run_does_not_modify_anything(
+        self,
+        engine: Engine,
+        search_options: SearchOptions,
+    ) -> None:
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    """INSERT INTO article (name, content)
+                    VALUES ('some name', 'some content')"""
+                )
+            )
+            estimate = sync_trigger(
+                conn,
+                "article",
+                "search_vector",
+                ["name", "content"],
+                options=search_options,
+                dry_run=True,
+            )
+            triggers = conn.execute(
+                text(
+                    """SELECT COUNT(*)
+                    FROM pg_trigger
+                    WHERE tgrelid = 'article'::regclass AND NOT tgisinternal"""
+                )
+            ).scalar()
+            vector = conn.execute(text("SELECT search_vector FROM article")).scalar()
+        assert triggers == 0
+        assert vector is None
+        assert estimate is not None
+        assert len(estimate.statements) == 5
+        assert estimate.statements[-1].startswith("UPDATE article")
+
+    def test_dry_run_estimates_costs(
+        self,
+        engine: Engine,
+        search_options: SearchOptions,
+    ) -> None:
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    """INSERT INTO article (name, content)
+                    SELECT 'name ' || i, 'content ' || i
+                    FROM generate_series(1, 100) AS i"""
+                )
+            )
+            estimate = sync_trigger(
+                conn,
+                "article",
+                "search_vector",
+                ["name", "content"],
+                options=search_options,
+                dry_run=True,
+                sample_size=10,
+            )
+        assert estimate is not None
+        assert estimate.row_count == 100
+        assert estimate.sample_size == 10
+        assert estimate.table_size > 0
+        assert estimate.total_size >= estimate.table_size
+        assert estimate.estimated_wal_bytes > 0
+        assert estimate.estimated_duration >= estimate.sample_duration
+
+
+class TestSyncTriggerDryRunInQuotedSchema:
+    @pytest.fixture(autouse=True)
+    def create_tables(self, engine: Engine) -> Generator[None, None, None]:
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    """
+                    CREATE SCHEMA "Tenant";
+
+                    CREATE TABLE "Tenant".article (
+                        name TEXT,
+                        search_vector TSVECTOR
+                    );
+
+                    INSERT INTO "Tenant".article (name) VALUES ('some name');
+                    """
+                )
+            )
+
+        yield
+
+        with engine.begin() as conn:
+            conn.execute(text('DROP SCHEMA "Tenant" CASCADE'))
+
+    def test_dry_run_estimates_costs(self, engine: Engine) -> None:
+        with engine.begin() as conn:
+            estimate = sync_trigger(
+                conn,
+                "article",
+                "search_vector",
+                ["name"],
+                schema="Tenant",
+                dry_run=True,
+            )
+        assert estimate is not None
+        assert estimate.row_count == 1
+        assert estimate.table_size > 0
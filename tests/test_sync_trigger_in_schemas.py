@@ -0,0 +1,107 @@
+from collections.abc import Generator
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from sqlalchemy_searchable import SearchOptions, sync_trigger_in_schemas
+
+SCHEMAS = ["tenant_1", "tenant_2", "tenant_3"]
+
+
+class TestSyncTriggerInSchemas:
+    @pytest.fixture(autouse=True)
+    def create_tables(self, engine: Engine) -> Generator[None, None, None]:
+        with engine.begin() as conn:
+            for schema in SCHEMAS:
+                conn.execute(
+                    text(
+                        f"""
+                        CREATE SCHEMA {schema};
+
+                        CREATE TABLE {schema}.article (
+                            name TEXT,
+                            content TEXT,
+                            search_vector TSVECTOR
+                        );
+
+                        INSERT INTO {schema}.article (name, content)
+                        VALUES ('{schema} name', 'some content');
+                        """
+                    )
+                )
+            conn.execute(text("CREATE SCHEMA tenant_empty"))
+
+        yield
+
+        with engine.begin() as conn:
+            for schema in SCHEMAS + ["tenant_empty"]:
+                conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+
+    @pytest.mark.parametrize(
+        "options",
+        [SearchOptions(), SearchOptions(weights={"name": "A"})],
+    )
+    def test_syncs_trigger_in_all_schemas(
+        self, engine: Engine, options: SearchOptions
+    ) -> None:
+        result = sync_trigger_in_schemas(
+            engine,
+            SCHEMAS,
+            "article",
+            "search_vector",
+            ["name", "content"],
+            options=options,
+            max_workers=2,
+        )
+        assert result.succeeded == SCHEMAS
+        assert result.failed == {}
+        with engine.begin() as conn:
+            for schema in SCHEMAS:
+                vector = conn.execute(
+                    text(f"SELECT search_vector FROM {schema}.article")
+                ).scalar()
+                assert vector is not None
+                assert "'content'" in vector
+                conn.execute(
+                    text(
+                        f"""INSERT INTO {schema}.article (name, content)
+                        VALUES ('other name', 'new content')"""
+                    )
+                )
+                vector = conn.execute(
+                    text(
+                        f"""SELECT search_vector FROM {schema}.article
+                        WHERE name = 'other name'"""
+                    )
+                ).scalar()
+                assert vector is not None
+                assert "'new'" in vector
+
+    def test_reports_failed_schemas(self, engine: Engine) -> None:
+        result = sync_trigger_in_schemas(
+            engine,
+            SCHEMAS + ["tenant_empty"],
+            "article",
+            "search_vector",
+            ["name", "content"],
+        )
+        assert result.succeeded == SCHEMAS
+        assert list(result.failed) == ["tenant_empty"]
+
+    def test_does_not_update_rows_when_updating_rows_disabled(
+        self, engine: Engine
+    ) -> None:
+        sync_trigger_in_schemas(
+            engine,
+            SCHEMAS,
+            "article",
+            "search_vector",
+            ["name", "content"],
+            update_rows=False,
+        )
+        with engine.begin() as conn:
+            vectors = conn.execute(
+                text("SELECT search_vector FROM tenant_2.article")
+            ).scalars()
+            assert list(vectors) == [None]
@@ -0,0 +1,101 @@
+from collections.abc import Generator
+from datetime import datetime, timedelta
+from typing import Any
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, Session
+from sqlalchemy_utils import TSVectorType
+
+from sqlalchemy_searchable import tiered_search
+
+NOW = datetime(2026, 1, 1)
+
+
+@pytest.fixture
+def models(TextItem: type[Any]) -> None:
+    pass
+
+
+@pytest.fixture
+def TextItem(Base: type[DeclarativeBase]) -> type[Any]:
+    class TextItem(Base):  # type: ignore[valid-type, misc]
+        __tablename__ = "textitem"
+
+        id: Mapped[int] = mapped_column(primary_key=True)
+        name: Mapped[str]
+        created_at: Mapped[datetime | None]
+        search_vector: Mapped[TSVectorType] = mapped_column(
+            TSVectorType("name", recency_column="created_at")
+        )
+
+    return TextItem
+
+
+@pytest.fixture
+def items(session: Session, TextItem: type[Any]) -> None:
+    session.add_all(
+        [
+            TextItem(id=1, name="index", created_at=NOW - timedelta(days=2)),
+            TextItem(id=2, name="index", created_at=NOW - timedelta(days=200)),
+            TextItem(id=3, name="index", created_at=NOW - timedelta(days=30)),
+            TextItem(id=4, name="index", created_at=None),
+            TextItem(id=5, name="other", created_at=NOW - timedelta(days=1)),
+        ]
+    )
+    session.commit()
+
+
+@pytest.fixture
+def statements(engine: Engine) -> Generator[list[str], None, None]:
+    statements: list[str] = []
+
+    def before_cursor_execute(*args: Any) -> None:
+        statements.append(args[2])
+
+    sa.event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    sa.event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.mark.usefixtures("items")
+class TestTieredSearch:
+    def search(self, session: Session, TextItem: type[Any], **kwargs: Any) -> list[int]:
+        rows = tiered_search(
+            session,
+            sa.select(TextItem.id).order_by(TextItem.id),
+            "index",
+            now=NOW,
+            **kwargs,
+        )
+        return [row.id for row in rows]
+
+    def test_stops_when_limit_is_reached(
+        self, session: Session, TextItem: type[Any], statements: list[str]
+    ) -> None:
+        assert self.search(session, TextItem, limit=1) == [1]
+        assert len(statements) == 1
+
+    def test_expands_windows(
+        self, session: Session, TextItem: type[Any], statements: list[str]
+    ) -> None:
+        assert self.search(session, TextItem, limit=2) == [1, 3]
+        assert len(statements) == 2
+
+    def test_searches_all_rows_in_last_tier(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        assert self.search(session, TextItem, limit=10) == [1, 3, 2, 4]
+
+    def test_custom_tiers(self, session: Session, TextItem: type[Any]) -> None:
+        tiers = [timedelta(days=1), timedelta(days=100)]
+        assert self.search(session, TextItem, limit=10, tiers=tiers) == [1, 3]
+
+    def test_requires_recency_column(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        column: sa.Column[Any] = sa.Column("search_vector", TSVectorType("name"))
+        sa.Table("other", sa.MetaData(), sa.Column("name", sa.Text), column)
+        with pytest.raises(ValueError):
+            self.search(session, TextItem, limit=10, vector=column)
@@ -0,0 +1,191 @@
+from typing import Any
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, Session
+from sqlalchemy_utils import TSVectorType
+
+from sqlalchemy_searchable import (
+    batch_search,
+    percolate,
+    search,
+    SearchOptions,
+    stored_queries_table,
+    sync_trigger,
+)
+
+
+@pytest.fixture
+def models(TextItem: type[Any]) -> None:
+    pass
+
+
+@pytest.fixture
+def vector_options() -> dict[str, Any]:
+    return {}
+
+
+@pytest.fixture
+def TextItem(Base: type[DeclarativeBase], vector_options: dict[str, Any]) -> type[Any]:
+    class TextItem(Base):  # type: ignore[valid-type, misc]
+        __tablename__ = "textitem"
+
+        id: Mapped[int] = mapped_column(primary_key=True)
+        name: Mapped[str]
+        content: Mapped[str]
+        search_vector: Mapped[TSVectorType | None] = mapped_column(
+            TSVectorType("name", "content", unaccent=True, **vector_options)
+        )
+
+    return TextItem
+
+
+@pytest.fixture
+def items(session: Session, TextItem: type[Any]) -> None:
+    session.add_all(
+        [
+            TextItem(id=1, name="Café", content="crème brûlée"),
+            TextItem(id=2, name="cafe", content="creme"),
+            TextItem(id=3, name="index", content="python"),
+        ]
+    )
+    session.commit()
+
+
+def search_ids(session: Session, TextItem: type[Any], search_query: str) -> Any:
+    query = sa.select(TextItem.id).order_by(TextItem.id)
+    return session.scalars(search(query, search_query)).all()
+
+
+class TestUnaccent:
+    @pytest.fixture(autouse=True)
+    def setup_items(self, items: None) -> None:
+        pass
+
+    def test_removes_accents_from_search_vector(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        vector = session.scalar(
+            sa.select(TextItem.search_vector).where(TextItem.id == 1)
+        )
+        assert vector == "'brule':3 'cafe':1 'creme':2"
+
+    def test_finds_accented_and_unaccented_values(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        assert search_ids(session, TextItem, "cafe") == [1, 2]
+        assert search_ids(session, TextItem, "café") == [1, 2]
+        assert search_ids(session, TextItem, "CRÈME") == [1, 2]
+        assert search_ids(session, TextItem, "brûl") == [1]
+
+    def test_sort(self, session: Session, TextItem: type[Any]) -> None:
+        query = search(sa.select(TextItem.id), "brûlée crème", sort=True)
+        assert session.scalars(query).all() == [1]
+
+    def test_batch_search(self, session: Session, TextItem: type[Any]) -> None:
+        query = sa.select(TextItem.id).order_by(TextItem.id)
+        assert batch_search(session, query, ["café", "brulee"], limit=5) == [
+            [(1,), (2,)],
+            [(1,)],
+        ]
+
+    def test_uses_search_vector_index(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        session.execute(text("SET LOCAL enable_seqscan = off"))
+        compiled = search(sa.select(TextItem.id), "café").compile(
+            dialect=session.bind.dialect,  # type: ignore[union-attr]
+            compile_kwargs={"literal_binds": True},
+        )
+        plan = "\n".join(session.scalars(text(f"EXPLAIN {compiled}")))
+        assert "ix_textitem_search_vector" in plan
+
+    def test_immutable_unaccent_is_immutable(self, session: Session) -> None:
+        volatility, language = session.execute(
+            text(
+                """SELECT provolatile, lanname FROM pg_proc
+                JOIN pg_language ON pg_language.oid = prolang
+                WHERE proname = 'immutable_unaccent'"""
+            )
+        ).one()
+        assert (volatility, language) == ("i", "sql")
+
+    def test_expression_index_under_restricted_search_path(
+        self, session: Session
+    ) -> None:
+        session.execute(
+            text(
+                """CREATE INDEX ix_textitem_unaccented_name
+                ON textitem (immutable_unaccent(name))"""
+            )
+        )
+        session.execute(text("SET LOCAL search_path = pg_catalog, pg_temp"))
+        session.execute(text("REINDEX TABLE public.textitem"))
+        session.execute(text("SET LOCAL search_path = public"))
+        session.execute(text("SET LOCAL enable_seqscan = off"))
+        plan = "\n".join(
+            session.scalars(
+                text(
+                    """EXPLAIN SELECT id FROM textitem
+                    WHERE immutable_unaccent(name) = 'Cafe'"""
+                )
+            )
+        )
+        assert "ix_textitem_unaccented_name" in plan
+
+
+class TestUnaccentedStoredQueries:
+    @pytest.fixture
+    def stored_queries(self, Base: type[DeclarativeBase]) -> sa.Table:
+        return stored_queries_table("stored_query", Base.metadata, unaccent=True)
+
+    @pytest.fixture
+    def models(self, TextItem: type[Any], stored_queries: sa.Table) -> None:
+        pass
+
+    def test_percolate(
+        self,
+        session: Session,
+        TextItem: type[Any],
+        stored_queries: sa.Table,
+        items: None,
+    ) -> None:
+        session.execute(
+            sa.insert(stored_queries),
+            [{"id": 1, "search_query": "brûlée"}, {"id": 2, "search_query": "café"}],
+        )
+        matches = percolate(
+            session, stored_queries, sa.select(TextItem.id).where(TextItem.id == 1)
+        )
+        assert sorted(matches) == [(1, (1,)), (2, (1,))]
+
+    def test_insert_under_restricted_search_path(
+        self, session: Session, stored_queries: sa.Table
+    ) -> None:
+        # pg_restore inserts the rows with an empty search_path, which computes the
+        # generated columns.
+        session.execute(text("SET LOCAL search_path = pg_catalog, pg_temp"))
+        session.execute(text("INSERT INTO public.stored_query VALUES (1, 'brûlée')"))
+        terms = session.scalar(text("SELECT terms FROM public.stored_query"))
+        assert terms == ["brule"]
+
+
+class TestSyncTriggerWithUnaccent:
+    def test_removes_accents(
+        self, engine: Engine, TextItem: type[Any], items: None
+    ) -> None:
+        with engine.begin() as conn:
+            sync_trigger(
+                conn,
+                "textitem",
+                "search_vector",
+                ["name", "content"],
+                options=SearchOptions(unaccent=True),
+            )
+            conn.execute(text("INSERT INTO textitem VALUES (4, 'Señor', 'niño')"))
+            assert (
+                conn.scalar(text("SELECT search_vector FROM textitem WHERE id = 4"))
+                == "'nino':2 'senor':1"
+            )
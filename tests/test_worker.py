@@ -0,0 +1,235 @@
+import threading
+from collections.abc import Generator
+from typing import Any
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, Session
+from sqlalchemy_utils import TSVectorType
+
+from sqlalchemy_searchable.worker import (
+    process_search_queue,
+    queued_search_vectors,
+    run_worker,
+    search_queue_stats,
+)
+from tests.schema_test_case import SchemaTestCase
+
+
+@pytest.fixture
+def models(TextItem: type[Any]) -> None:
+    pass
+
+
+@pytest.fixture
+def TextItem(Base: type[DeclarativeBase]) -> type[Any]:
+    class TextItem(Base):  # type: ignore[valid-type, misc]
+        __tablename__ = "textitem"
+
+        id: Mapped[int] = mapped_column(primary_key=True)
+        name: Mapped[str]
+        content: Mapped[str]
+        rating: Mapped[int | None]
+        search_vector: Mapped[TSVectorType | None] = mapped_column(
+            TSVectorType("name", "content", weights={"name": "A"}, queue_updates=True)
+        )
+
+    return TextItem
+
+
+class TestCreateSearchQueue(SchemaTestCase):
+    @pytest.fixture
+    def should_create_indexes(self) -> list[str]:
+        return ["ix_textitem_search_vector"]
+
+    @pytest.fixture
+    def should_create_triggers(self) -> list[str]:
+        return ["textitem_search_vector_trigger"]
+
+    def test_creates_queue_table(self, session: Session) -> None:
+        queue = session.scalar(
+            text("SELECT to_regclass('textitem_search_vector_queue')")
+        )
+        assert queue is not None
+
+
+class TestSearchQueue:
+    @pytest.fixture(autouse=True)
+    def items(self, session: Session, TextItem: type[Any]) -> None:
+        session.add_all(
+            [
+                TextItem(id=1, name="some name", content="some content"),
+                TextItem(id=2, name="other name", content="new content"),
+            ]
+        )
+        session.commit()
+
+    def vectors(self, session: Session) -> list[Any]:
+        return list(
+            session.scalars(text("SELECT search_vector FROM textitem ORDER BY id"))
+        )
+
+    def test_queues_inserted_rows(self, session: Session) -> None:
+        assert self.vectors(session) == [None, None]
+        rows = session.scalars(
+            text("SELECT row_key FROM textitem_search_vector_queue ORDER BY id")
+        ).all()
+        assert rows == [{"id": 1}, {"id": 2}]
+
+    def test_queues_rows_with_updated_indexed_columns(
+        self, session: Session, TextItem: type[Any]
+    ) -> None:
+        session.execute(text("DELETE FROM textitem_search_vector_queue"))
+        session.execute(sa.update(TextItem).values(rating=5))
+        session.execute(
+            sa.update(TextItem).where(TextItem.id == 2).values(name="updated name")
+        )
+        rows = session.scalars(
+            text("SELECT row_key FROM textitem_search_vector_queue")
+        ).all()
+        assert rows == [{"id": 2}]
+
+    def test_process_search_queue(self, engine: Engine, TextItem: type[Any]) -> None:
+        column = TextItem.__table__.c.search_vector
+        with engine.begin() as conn:
+            assert process_search_queue(conn, column, batch_size=1) == 1
+            assert process_search_queue(conn, column, batch_size=10) == 1
+            assert process_search_queue(conn, column) == 0
+            vectors = conn.scalars(
+                text("SELECT search_vector FROM textitem ORDER BY id")
+            ).all()
+        assert vectors == [
+            "'content':4 'name':2A",
+            "'content':4 'name':2A 'new':3",
+        ]
+
+    def test_concurrent_workers_skip_locked_rows(
+        self, engine: Engine, TextItem: type[Any]
+    ) -> None:
+        column = TextItem.__table__.c.search_vector
+        with engine.begin() as conn1, engine.begin() as conn2:
+            assert process_search_queue(conn1, column, batch_size=1) == 1
+            assert process_search_queue(conn2, column, batch_size=10) == 1
+            assert process_search_queue(conn2, column) == 0
+
+    def test_search_queue_stats(self, engine: Engine, TextItem: type[Any]) -> None:
+        column = TextItem.__table__.c.search_vector
+        with engine.begin() as conn:
+            stats = search_queue_stats(conn, column)
+            assert stats.depth == 2
+            assert stats.oldest_queued_at is not None
+            process_search_queue(conn, column)
+            stats = search_queue_stats(conn, column)
+            assert stats.depth == 0
+            assert stats.oldest_queued_at is None
+            assert stats.failed == 0
+
+    def test_moves_failing_rows_aside(
+        self, engine: Engine, session: Session, TextItem: type[Any]
+    ) -> None:
+        column = TextItem.__table__.c.search_vector
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    """ALTER TABLE textitem ADD CONSTRAINT no_new
+                    CHECK (NOT coalesce(search_vector @@ 'new', false))"""
+                )
+            )
+            assert process_search_queue(conn, column) == 2
+            assert process_search_queue(conn, column) == 0
+            stats = search_queue_stats(conn, column)
+            assert (stats.depth, stats.failed) == (0, 1)
+            row_key, error = conn.execute(
+                text(
+                    """SELECT row_key, error FROM textitem_search_vector_queue
+                    WHERE failed_at IS NOT NULL"""
+                )
+            ).one()
+        assert row_key == {"id": 2}
+        assert "no_new" in error
+        assert self.vectors(session) == ["'content':4 'name':2A", None]
+
+    def test_run_worker_survives_errors(
+        self, engine: Engine, TextItem: type[Any], caplog: pytest.LogCaptureFixture
+    ) -> None:
+        with engine.begin() as conn:
+            conn.execute(text("DROP TABLE textitem_search_vector_queue CASCADE"))
+        stop = threading.Event()
+        worker = threading.Thread(
+            target=run_worker,
+            kwargs=dict(engine=engine, poll_interval=0.01, stop=stop),
+        )
+        worker.start()
+        try:
+            stop.wait(0.1)
+            assert worker.is_alive()
+        finally:
+            stop.set()
+            worker.join()
+        messages = [record.getMessage() for record in caplog.records]
+        assert "Failed to process queued updates of textitem.search_vector" in messages
+
+    def test_run_worker(self, engine: Engine, session: Session) -> None:
+        stop = threading.Event()
+        worker = threading.Thread(
+            target=run_worker,
+            kwargs=dict(engine=engine, poll_interval=0.01, stop=stop),
+        )
+        worker.start()
+        try:
+            for _ in range(100):
+                with engine.begin() as conn:
+                    column = queued_search_vectors()[0]
+                    if search_queue_stats(conn, column).depth == 0:
+                        break
+                stop.wait(0.05)
+        finally:
+            stop.set()
+            worker.join()
+        assert self.vectors(session) == [
+            "'content':4 'name':2A",
+            "'content':4 'name':2A 'new':3",
+        ]
+
+
+class TestSearchQueueInQuotedSchema:
+    @pytest.fixture
+    def schema(self, engine: Engine) -> Generator[None, None, None]:
+        with engine.begin() as conn:
+            conn.execute(text('CREATE SCHEMA "Tenant"'))
+
+        yield
+
+        with engine.begin() as conn:
+            conn.execute(text('DROP SCHEMA "Tenant" CASCADE'))
+
+    @pytest.fixture
+    def models(self, schema: None, TextItem: type[Any]) -> None:
+        pass
+
+    @pytest.fixture
+    def TextItem(self, Base: type[DeclarativeBase]) -> type[Any]:
+        class TextItem(Base):  # type: ignore[valid-type, misc]
+            __tablename__ = "TextItem"
+            __table_args__ = {"schema": "Tenant"}
+
+            id: Mapped[int] = mapped_column(primary_key=True)
+            name: Mapped[str]
+            search_vector: Mapped[TSVectorType | None] = mapped_column(
+                TSVectorType("name", queue_updates=True)
+            )
+
+        return TextItem
+
+    def test_process_search_queue(
+        self, engine: Engine, session: Session, TextItem: type[Any]
+    ) -> None:
+        session.add(TextItem(id=1, name="tenant name"))
+        session.commit()
+        column = TextItem.__table__.c.search_vector
+        with engine.begin() as conn:
+            assert process_search_queue(conn, column) == 1
+            vector = conn.scalar(sa.select(column))
+        assert vector == "'name':2 'tenant':1"